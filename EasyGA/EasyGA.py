@@ -4,6 +4,12 @@ import math
 # Import random for many methods
 import random
 
+# Import time for the time goal
+import time
+
+# Import futures for evaluation timeouts
+from concurrent.futures import FIRST_COMPLETED, wait
+
 # Import all decorators
 import decorators
 
@@ -24,6 +30,33 @@ from survivor import Survivor
 from crossover import Crossover
 from mutation  import Mutation
 
+# Alternative Evolution Engines
+from engine import Engine
+
+# Local Search Methods
+from local_search import Local_Search
+
+# Surrogate Fitness Models
+from surrogate import Surrogate
+
+# Novelty Search
+from novelty import Novelty
+
+# Niching Methods
+from niching import Niching
+
+# Duplicate Elimination Methods
+from duplicates import Duplicates
+
+# Seedable Random Number Streams
+from rng import Rng
+
+# Distributed Fitness Evaluation
+from distributed import Distributed
+
+# Racing Evaluation of Noisy Fitness
+from racing import Racing
+
 # Default Attributes for the GA
 from attributes import Attributes
 
@@ -35,6 +68,13 @@ from sqlite3  import Error
 from database import matplotlib_graph
 import matplotlib.pyplot as plt
 
+# Multi-objective sorting
+from pareto import nsga2
+
+# Stage profiler and population statistics
+from metrics import profiler
+from metrics import population_statistics
+
 
 class GA(Attributes):
     """GA is the main class in EasyGA. Everything is run through the ga
@@ -54,43 +94,89 @@ class GA(Attributes):
         if self.population is None:
             self.initialize_population()
 
+        # Start the clock for the time goal.
+        if self.start_time is None:
+            self.start_time = time.perf_counter()
+
         cond1 = lambda: number_of_generations > 0  # Evolve the specified number of generations.
         cond2 = lambda: not consider_termination   # If consider_termination flag is set:
         cond3 = lambda: cond2() or self.active()   #     check termination conditions.
 
         while cond1() and cond3():
 
-            # If its the first generation, setup the database.
-            if self.current_generation == 0:
+            # If its the first generation, setup the database if data is saved.
+            if self.current_generation == 0 and self.save_data:
 
                 # Create the database here to allow the user to change the
                 # database name and structure before running the function.
-                self.database.create_all_tables(self)
-
-                # Add the current configuration to the config table
-                self.database.insert_config(self)
+                with self.profiler.stage('database'):
+                    self.database.create_all_tables(self)
+
+                    # Add the current configuration to the config table
+                    self.database.insert_config(self)
+
+            # Otherwise evolve the population using the engine if there is one.
+            elif self.current_generation > 0 and self.engine_impl is not None:
+                with self.profiler.stage('engine'):
+                    self.engine_impl()
+
+            # Or using the genetic operators.
+            elif self.current_generation > 0:
+                with self.profiler.stage('parent_selection'):
+                    self.parent_selection_impl()
+                with self.profiler.stage('crossover'):
+                    self.crossover_population_impl()
+                with self.profiler.stage('survivor_selection'):
+                    self.survivor_selection_impl()
+                if self.duplicate_elimination_impl is not None:
+                    with self.profiler.stage('duplicate_elimination'):
+                        self.duplicate_elimination_impl()
+                with self.profiler.stage('update_population'):
+                    self.update_population()
+                with self.profiler.stage('sort'):
+                    self.sort_by_best_fitness()
+                with self.profiler.stage('mutation'):
+                    self.mutation_population_impl()
+                if self.local_search_population_impl is not None:
+                    with self.profiler.stage('local_search'):
+                        self.local_search_population_impl()
+
+            # Predict which chromosomes are worth evaluating
+            if self.surrogate is not None:
+                with self.profiler.stage('surrogate'):
+                    self.surrogate.screen(self)
 
-            # Otherwise evolve the population.
-            else:
-                self.parent_selection_impl()
-                self.crossover_population_impl()
-                self.survivor_selection_impl()
-                self.update_population()
+            # Update and sort fitnesses
+            with self.profiler.stage('fitness'):
+                self.set_all_fitness()
+            with self.profiler.stage('sort'):
                 self.sort_by_best_fitness()
-                self.mutation_population_impl()
 
-            # Update and sort fitnesses
-            self.set_all_fitness()
-            self.sort_by_best_fitness()
+            # Make sure the best fitness isn't a prediction
+            if self.surrogate is not None:
+                with self.profiler.stage('surrogate'):
+                    self.surrogate.verify(self)
+            with self.profiler.stage('statistics'):
+                self.statistics.update(self)
+
+            # Archive the most novel behaviors
+            if self.novelty is not None:
+                with self.profiler.stage('novelty'):
+                    self.novelty.update(self)
 
             # Save the population to the database
-            self.save_population()
+            with self.profiler.stage('save'):
+                self.save_population()
 
             # Adapt the ga if the generation times the adapt rate
-            # passes through an integer value.
+            # passes through an integer value. Engines adapt themselves.
             adapt_counter = self.adapt_rate*self.current_generation
-            if int(adapt_counter) < int(adapt_counter + self.adapt_rate):
-                self.adapt()
+            if self.engine_impl is None and int(adapt_counter) < int(adapt_counter + self.adapt_rate):
+                with self.profiler.stage('adapt'):
+                    self.adapt()
+
+            # Push this generation's stage timings into the histograms
+            self.profiler.end_generation()
 
             number_of_generations   -= 1
             self.current_generation += 1
@@ -100,7 +186,12 @@ class GA(Attributes):
         """Updates the population to the new population and resets
          the mating pool and new population."""
 
-        self.population.update()
+        self.population.update(self.double_buffered)
+
+        # Spare chromosomes will be reused as new chromosomes
+        if self.double_buffered:
+            for chromosome in self.population.spare_chromosomes:
+                self.statistics.changed(chromosome)
 
 
     def reset_run(self):
@@ -109,6 +200,14 @@ class GA(Attributes):
 
         self.initialize_population()
         self.current_generation = 0
+        self.evaluation_count = 0
+        self.start_time = None
+        self.engine_state = None
+        self.statistics.reset()
+        if self.racing is not None:
+            self.racing.reset()
+        if self.novelty is not None:
+            self.novelty.reset()
         self.run += 1
 
 
@@ -128,6 +227,7 @@ class GA(Attributes):
         # Update and sort fitnesses
         self.set_all_fitness()
         self.sort_by_best_fitness()
+        self.statistics.update(self)
 
 
     def adapt_probabilities(self):
@@ -145,14 +245,20 @@ class GA(Attributes):
             return
 
         # Amount of the population desired to converge (default 50%)
-        amount_converged = round(self.percent_converged * len(self.population))
+        amount_converged = min(len(self.population)-1, round(self.percent_converged * len(self.population)))
 
-        # Difference between best and i-th chromosomes
-        best_chromosome = self.population[0]
-        tol = lambda i: self.dist(best_chromosome, self.population[i])
+        # Difference between best and i-th chromosomes, cached by the population statistics
+        tol = lambda i: self.statistics.distance_to_best(self, i)
+
+        # Compare the population diversity to the target if possible,
+        # otherwise compare how far the converged chromosomes are.
+        if self.target_diversity is not None and self.statistics.pairwise_distance is not None:
+            too_few_converged = self.statistics.pairwise_distance > self.target_diversity
+        else:
+            too_few_converged = tol(amount_converged//2) > tol(amount_converged//4)*2
 
         # Too few converged: cross more and mutate less
-        if tol(amount_converged//2) > tol(amount_converged//4)*2:
+        if too_few_converged:
             bounds = (self.max_selection_probability,
                       self.min_chromosome_mutation_rate,
                       self.min_gene_mutation_rate)
@@ -214,6 +320,11 @@ class GA(Attributes):
 
         # Replace worst chromosomes with new chromosomes, except for the previous best chromosome
         min_len = min(len(self.population)-1, len(self.population.next_population))
+
+        # Avoid filling the population with clones of the kept chromosomes
+        if self.duplicate_elimination_impl is not None:
+            self.duplicate_elimination_impl(self.population[:len(self.population)-min_len])
+
         if min_len > 0:
             self.population[-min_len:] = self.population.next_population[:min_len]
         self.population.next_population = []
@@ -248,40 +359,192 @@ class GA(Attributes):
             raise ValueError("No chromosome or gene impl specified.")
 
 
-    def set_all_fitness(self):
-        """Will get and set the fitness of each chromosome in the population.
+    def set_all_fitness(self, chromosome_list = None):
+        """Will get and set the fitness of each chromosome in the population,
+        or in the chromosome list if one is given.
         If update_fitness is set then all fitness values are updated.
         Otherwise only fitness values set to None (i.e. uninitialized
         fitness values) are updated.
+        Chromosomes are evaluated using evaluate_all, or raced using
+        ga.racing for noisy fitness functions if it is set.
         """
 
-        # Check each chromosome
-        for chromosome in self.population:
+        # Evaluate the population if no chromosome list is given
+        if chromosome_list is None:
+            chromosome_list = self.population
+
+        # Race noisy fitness samples, which also samples evaluated chromosomes
+        if self.racing is not None:
+            chromosome_list = self.racing.race(self, chromosome_list)
+
+        else:
 
             # Update fitness if needed or asked by the user
-            if chromosome.fitness is None or self.update_fitness:
-                chromosome.fitness = self.fitness_function_impl(chromosome)
+            chromosome_list = [
+                chromosome
+                for chromosome
+                in chromosome_list
+                if chromosome.fitness is None or self.update_fitness
+            ]
+
+            for chromosome, fitness in zip(chromosome_list, self.evaluate_all(chromosome_list)):
+                chromosome.fitness = fitness
+                self.evaluation_count += 1
+                self.statistics.changed(chromosome)
+
+        # Train the surrogate model on the new fitness values
+        if self.surrogate is not None:
+            self.surrogate.record(chromosome_list)
+
+
+    def evaluate_all(self, chromosome_list):
+        """Returns an iterable of the fitness of each chromosome without
+        setting it. Chromosomes are evaluated by the workers of
+        ga.coordinator if it is set, or in parallel if ga.executor is set.
+        Failed evaluations are handled as described in evaluate_safely if
+        ga.evaluation_timeout, ga.evaluation_retries or ga.penalty_fitness
+        is set."""
+
+        # Evaluate on other machines, which handle their own failures
+        if self.coordinator is not None:
+            return self.coordinator.evaluate(chromosome_list)
+
+        # Isolate failed evaluations if asked by the user
+        elif self.evaluation_timeout is not None or self.evaluation_retries > 0 or self.penalty_fitness is not None:
+            return self.evaluate_safely(chromosome_list)
+
+        # Evaluate in parallel if there is a worker pool
+        elif self.executor is None:
+            return map(self.fitness_function_impl, chromosome_list)
+        else:
+            return self.executor.map(self.fitness_function_impl, chromosome_list)
+
+
+    def evaluate_safely(self, chromosome_list):
+        """Returns the fitness of each chromosome, isolating failures. An evaluation
+        which raises an error, or runs for more than ga.evaluation_timeout seconds,
+        is retried up to ga.evaluation_retries times, and then given
+        ga.penalty_fitness, or the error is raised if it is None. Failures are
+        counted in ga.statistics. Timeouts require an executor with a submit
+        method, e.g. a concurrent.futures.ThreadPoolExecutor, since evaluations
+        can't be interrupted. Every attempt must finish within the timeout of
+        being submitted, including time spent waiting for a free worker, so
+        a call takes at most about (ga.evaluation_retries + 1) timeouts even
+        if the workers are all stuck. Timed out evaluations are abandoned,
+        but keep occupying their worker until they return."""
+
+        fitness_list = [None] * len(chromosome_list)
+        attempts = [0] * len(chromosome_list)
+
+        def failed(index, error, timed_out = False):
+            """Returns True if the evaluation should be retried."""
 
+            retry = attempts[index] < self.evaluation_retries
+            self.statistics.evaluation_failed(timed_out, retry)
+            attempts[index] += 1
 
-    def sort_by_best_fitness(self, chromosome_list = None, in_place = True):
+            if not retry:
+                if self.penalty_fitness is None:
+                    raise error
+                fitness_list[index] = self.penalty_fitness
+
+            return retry
+
+        # Evaluate one at a time
+        if getattr(self.executor, 'submit', None) is None:
+
+            if self.evaluation_timeout is not None:
+                raise ValueError("Evaluation timeouts require ga.executor, e.g. a concurrent.futures.ThreadPoolExecutor.")
+
+            for index, chromosome in enumerate(chromosome_list):
+                while True:
+                    try:
+                        fitness_list[index] = self.fitness_function_impl(chromosome)
+                        break
+                    except Exception as error:
+                        if not failed(index, error):
+                            break
+
+            return fitness_list
+
+        # Evaluate in parallel, timing every attempt from when it is submitted,
+        # so that attempts queued behind abandoned evaluations still time out
+        submitted = {}
+
+        def submit(index):
+            future = self.executor.submit(self.fitness_function_impl, chromosome_list[index])
+            futures[future] = index
+            submitted[future] = time.perf_counter()
+
+        futures = {}
+        for index in range(len(chromosome_list)):
+            submit(index)
+
+        poll_time = None if self.evaluation_timeout is None else min(0.1, self.evaluation_timeout/4)
+
+        while len(futures) > 0:
+            done, _ = wait(futures, timeout = poll_time, return_when = FIRST_COMPLETED)
+
+            for future in done:
+                index = futures.pop(future)
+                try:
+                    fitness_list[index] = future.result()
+                except Exception as error:
+                    if failed(index, error):
+                        submit(index)
+
+            if self.evaluation_timeout is None:
+                continue
+
+            now = time.perf_counter()
+
+            for future in [future for future in futures if now - submitted[future] > self.evaluation_timeout]:
+                index = futures.pop(future)
+                future.cancel()
+                error = TimeoutError(f"Fitness evaluation took more than {self.evaluation_timeout} seconds.")
+                if failed(index, error, timed_out = True):
+                    submit(index)
+
+        return fitness_list
+
+
+    def sort_by_best_fitness(self, chromosome_list = None, in_place = True, by_fitness = False):
         """Sorts the chromosome list by fitness based on fitness type.
         1st element has best fitness.
         2nd element has second best fitness.
         etc.
-        """
 
-        if self.target_fitness_type not in ('max', 'min'):
-            raise ValueError("Unknown target fitness type")
+        With multiple objectives, chromosomes are sorted by their
+        non-dominated front and then by decreasing crowding distance.
+        With novelty search, chromosomes are sorted by decreasing
+        novelty unless by_fitness is True.
+        """
 
         # Sort the population if no chromosome list is given
         if chromosome_list is None:
             chromosome_list = self.population
 
-        # Reversed sort if max fitness should be first
-        reverse = (self.target_fitness_type == 'max')
+        # Sort by novelty
+        if self.novelty is not None and not by_fitness:
+            self.novelty.score(self, chromosome_list)
+            reverse = True
+            key = lambda chromosome: chromosome.novelty
+
+        # Sort by front, then crowding distance
+        elif self.multi_objective:
+            nsga2.rank_chromosomes(chromosome_list, self.target_fitness_type)
+            reverse = False
+            key = lambda chromosome: (chromosome.rank, -chromosome.crowding_distance)
+
+        elif self.target_fitness_type not in ('max', 'min'):
+            raise ValueError("Unknown target fitness type")
+
+        else:
+            # Reversed sort if max fitness should be first
+            reverse = (self.target_fitness_type == 'max')
 
-        # Sort by fitness, assuming None should be moved to the end of the list
-        key = lambda chromosome: (chromosome.fitness if (chromosome.fitness is not None) else (float('inf') * (+1, -1)[int(reverse)]))
+            # Sort by fitness, assuming None should be moved to the end of the list
+            key = lambda chromosome: (chromosome.fitness if (chromosome.fitness is not None) else (float('inf') * (+1, -1)[int(reverse)]))
 
         if in_place:
             chromosome_list.sort(key = key, reverse = reverse)
@@ -294,23 +557,47 @@ class GA(Attributes):
     def get_chromosome_fitness(self, index):
         """Returns the fitness value of the chromosome
         at the specified index after conversion based
-        on the target fitness type.
+        on the target fitness type, or the shared
+        fitness if fitness sharing is used.
         """
 
+        if self.fitness_sharing is not None:
+            return self.population[index].shared_fitness
+
         return self.convert_fitness(self.population[index].fitness)
 
 
+    def population_by_fitness(self):
+        """Returns the population sorted from best to worst fitness. This is
+        the population itself, unless novelty search sorted it by novelty."""
+
+        if self.novelty is None:
+            return self.population
+
+        return self.sort_by_best_fitness(self.population, in_place = False, by_fitness = True)
+
+
     def convert_fitness(self, fitness_value):
         """Returns the fitness value if the type of problem
         is a maximization problem. Otherwise the fitness is
         inverted using max - value + min.
         """
 
+        # Fitness vectors can't be converted to a single value
+        if self.multi_objective:
+            raise ValueError("Fitness based methods can't use multiple objectives."
+                             + " Consider using rank selection instead.")
+
         # No conversion needed
         if self.target_fitness_type == 'max': return fitness_value
 
-        max_fitness = self.population[-1].fitness
-        min_fitness = self.population[0].fitness
+        # The population is sorted by novelty, but the statistics are by fitness
+        if self.novelty is not None:
+            max_fitness = self.statistics.fitness_quantiles[1]
+            min_fitness = self.statistics.fitness_quantiles[0]
+        else:
+            max_fitness = self.population[-1].fitness
+            min_fitness = self.population[0].fitness
 
         return max_fitness - fitness_value + min_fitness
 
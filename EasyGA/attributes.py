@@ -1,10 +1,14 @@
 # Import signature tool to check if functions start with self or ga
 from inspect import signature
 
+# Import MethodType to bind functions to the ga and
+# a weak dictionary to cache their signatures
+from types import MethodType
+from weakref import WeakKeyDictionary
+
 # Import math for square root (ga.dist()) and ceil (crossover methods)
 import math
 
-import random
 import sqlite3
 from copy import deepcopy
 
@@ -12,6 +16,10 @@ from copy import deepcopy
 from structure import Population as make_population
 from structure import Chromosome as make_chromosome
 from structure import Gene       as make_gene
+from structure import Bit_Chromosome
+from structure import Permutation_Chromosome
+from structure import Array_Chromosome
+from structure.bit_chromosome import popcount
 
 # Misc. Methods
 from examples import Fitness
@@ -25,6 +33,15 @@ from survivor import Survivor
 from crossover import Crossover
 from mutation  import Mutation
 
+# Local Search Methods
+from local_search import Local_Search
+
+# Novelty Search
+from novelty import Novelty
+
+# Seedable random number stream
+from rng import Rng
+
 # Database class
 from database import sql_database
 from sqlite3  import Error
@@ -33,6 +50,39 @@ from sqlite3  import Error
 from database import matplotlib_graph
 import matplotlib.pyplot as plt
 
+# Stage profiler and population statistics
+from metrics import profiler
+from metrics import population_statistics
+
+
+# Cache of the first parameter name of each callable assigned to the ga
+_first_parameter_cache = WeakKeyDictionary()
+
+
+def first_parameter(method):
+    """Returns the name of the first parameter of the method, or None if it
+    has no parameters or no signature. Results are cached per method so
+    that assigning the same method repeatedly doesn't inspect it again."""
+
+    # Check the cache, which can't hold every callable
+    try:
+        return _first_parameter_cache[method]
+    except (KeyError, TypeError):
+        pass
+
+    try:
+        name = next(iter(signature(method).parameters), None)
+    except (TypeError, ValueError):
+        name = None
+
+    # Cache it if possible
+    try:
+        _first_parameter_cache[method] = name
+    except TypeError:
+        pass
+
+    return name
+
 
 class Attributes:
     """Default GA attributes can be found here. If any attributes have not
@@ -58,9 +108,35 @@ class Attributes:
     mutation_population_impl = Mutation.Population.random_avoid_best
     termination_impl = Termination.fitness_generation_tolerance
 
+    # Local search between mutation and fitness evaluation, e.g. Local_Search.Population.best
+    local_search_population_impl = None
+    local_search_individual_impl = Local_Search.Individual.hill_climbing
+
+    # Removes duplicates from the next population, e.g. Duplicates.mutate
+    duplicate_elimination_impl = None
+
+    # Behavior used for novelty search instead of the gene values, called as ga.behavior_impl(chromosome)
+    behavior_impl = None
+
+    # Incremental fitness update after mutations and local search moves,
+    # called as ga.delta_fitness_impl(chromosome, changed_indexes, old_values)
+    delta_fitness_impl = None
+
+    # Alternative to the genetic operators, e.g. Engine.Differential.rand_1_bin
+    engine_impl = None
+
 
     def dist(self, chromosome_1, chromosome_2):
-        """Default distance lambda. Returns the square root of the difference in fitnesses."""
+        """Default distance lambda. Returns the square root of the difference in fitnesses,
+        using the euclidean distance between fitnesses for multiple objectives."""
+
+        if self.multi_objective:
+            return math.sqrt(math.sqrt(sum(
+                (fitness_1 - fitness_2) ** 2
+                for fitness_1, fitness_2
+                in zip(chromosome_1.fitness, chromosome_2.fitness)
+            )))
+
         return math.sqrt(abs(chromosome_1.fitness - chromosome_2.fitness))
 
 
@@ -68,7 +144,7 @@ class Attributes:
         """Returns a random value between 0 and 1. Returns values between the weight and the
         nearest of 0 and 1 less frequently than between weight and the farthest of 0 and 1."""
 
-        rand_num = random.random()
+        rand_num = self.rng.random()
         if rand_num < weight:
             return (1-weight) * rand_num / weight
         else:
@@ -77,7 +153,7 @@ class Attributes:
 
     def gene_impl(self, *args, **kwargs):
         """Default gene implementation. Returns a random integer from 1 to 10."""
-        return random.randint(1, 10)
+        return self.rng.randint(1, 10)
 
 
     chromosome_impl = None
@@ -93,10 +169,12 @@ class Attributes:
             # Attributes must be passed in using kwargs
 
             run  = 0,
+            seed = None,
 
             chromosome_length = 10,
             population_size = 10,
             population = None,
+            double_buffered = False,
             target_fitness_type = 'max',
             update_fitness = False,
 
@@ -106,18 +184,30 @@ class Attributes:
 
             current_generation = 0,
             current_fitness = 0,
+            evaluation_count = 0,
+            start_time = None,
 
             generation_goal   = 100,
             fitness_goal      = None,
             tolerance_goal    = None,
+            time_goal         = None,
+            evaluation_goal   = None,
+            stagnation_goal   = None,
             percent_converged = 0.50,
+            diversity_goal    = None,
+
+            diversity_metric    = None,
+            diversity_max_rows  = 1000,
+            diversity_max_error = 0.05,
 
             chromosome_mutation_rate = 0.15,
             gene_mutation_rate = 0.05,
+            duplicate_attempts = 10,
 
             adapt_rate = 0.05,
             adapt_probability_rate = 0.05,
             adapt_population_flag  = True,
+            target_diversity       = None,
 
             max_selection_probability = 0.75,
             min_selection_probability = 0.25,
@@ -126,8 +216,27 @@ class Attributes:
             max_gene_mutation_rate = 0.15,
             min_gene_mutation_rate = 0.01,
 
+            local_search_rate   = 0.10,
+            local_search_budget = 20,
+            executor = None,
+            coordinator = None,
+            evaluation_timeout = None,
+            evaluation_retries = 0,
+            penalty_fitness = None,
+            surrogate = None,
+            racing = None,
+            novelty = None,
+            fitness_sharing = None,
+
+            differential_weight = 0.8,
+            differential_crossover_rate = 0.9,
+            cma_sigma = None,
+            engine_processes = None,
+            engine_state = None,
+
             Database = sql_database.SQL_Database,
             database_name = 'database.db',
+            save_data = True,
             sql_create_data_structure = f"""
             CREATE TABLE IF NOT EXISTS data (
             id INTEGER PRIMARY KEY,
@@ -139,17 +248,27 @@ class Attributes:
 
             Graph = matplotlib_graph.Matplotlib_Graph,
 
+            Profiler = profiler.Stage_Profiler,
+            Statistics = population_statistics.Population_Statistics,
+
             **kwargs
         ):
 
         # Keep track of the current run
         self.run = run
 
+        # Random number stream used by every method, see ga.rng
+        self.seed = seed
+
         # Initilization variables
         self.chromosome_length = chromosome_length
         self.population_size = population_size
         self.population = population
         self.target_fitness_type = target_fitness_type
+
+        # Reuse the chromosomes which leave the population for new children, so references
+        # to chromosomes made by the population don't survive a generation, see Population.update
+        self.double_buffered = double_buffered
         self.update_fitness = update_fitness
 
         # Selection variables
@@ -160,19 +279,32 @@ class Attributes:
         # Termination variables
         self.current_generation = current_generation
         self.current_fitness = current_fitness
+        self.evaluation_count = evaluation_count
+        self.start_time = start_time
         self.generation_goal = generation_goal
         self.fitness_goal = fitness_goal
         self.tolerance_goal = tolerance_goal
+        self.time_goal = time_goal
+        self.evaluation_goal = evaluation_goal
+        self.stagnation_goal = stagnation_goal
         self.percent_converged = percent_converged
+        self.diversity_goal = diversity_goal
+
+        # Diversity variables
+        self.diversity_metric = diversity_metric
+        self.diversity_max_rows = diversity_max_rows
+        self.diversity_max_error = diversity_max_error
 
         # Mutation variables
         self.chromosome_mutation_rate = chromosome_mutation_rate
         self.gene_mutation_rate = gene_mutation_rate
+        self.duplicate_attempts = duplicate_attempts
 
         # Adapt variables
         self.adapt_rate = adapt_rate
         self.adapt_probability_rate = adapt_probability_rate
         self.adapt_population_flag  = adapt_population_flag
+        self.target_diversity       = target_diversity
 
         # Bounds on probabilities when adapting
         self.max_selection_probability = max_selection_probability
@@ -182,14 +314,53 @@ class Attributes:
         self.max_gene_mutation_rate = max_gene_mutation_rate
         self.min_gene_mutation_rate = min_gene_mutation_rate
 
+        # Local search variables
+        self.local_search_rate   = local_search_rate
+        self.local_search_budget = local_search_budget
+
+        # Worker pool used for evaluating chromosomes, e.g. a concurrent.futures.ThreadPoolExecutor
+        self.executor = executor
+
+        # Coordinator used for evaluating chromosomes on other machines, see Distributed.Coordinator
+        self.coordinator = coordinator
+
+        # Handling of failed fitness evaluations, see ga.evaluate_safely()
+        self.evaluation_timeout = evaluation_timeout
+        self.evaluation_retries = evaluation_retries
+        self.penalty_fitness = penalty_fitness
+
+        # Surrogate model used to skip evaluating unpromising chromosomes, e.g. Surrogate.Nearest_Neighbors()
+        self.surrogate = surrogate
+
+        # Racing used to sample noisy fitness functions, e.g. Racing.Race(max_samples = 30)
+        self.racing = racing
+
+        # Novelty search used to rank chromosomes instead of fitness, see ga.novelty_search()
+        self.novelty = novelty
+
+        # Fitness sharing used by parent selection, e.g. Niching.Fitness_Sharing(radius = 1.0)
+        self.fitness_sharing = fitness_sharing
+
+        # Engine variables
+        self.differential_weight = differential_weight
+        self.differential_crossover_rate = differential_crossover_rate
+        self.cma_sigma = cma_sigma
+        self.engine_processes = engine_processes  # Workers used by Engine.Parallel, None for one per cpu
+        self.engine_state = engine_state
+
         # Database varibles
         self.database = Database()
         self.database_name = database_name
+        self.save_data = save_data
         self.sql_create_data_structure = sql_create_data_structure
 
         # Graphing variables
         self.graph = Graph(self.database)
 
+        # Profiling and statistics variables
+        self.profiler = Profiler()
+        self.statistics = Statistics()
+
         # Any other custom kwargs?
         for name, value in kwargs.items():
             self.__setattr__(name, value)
@@ -202,7 +373,7 @@ class Attributes:
 
         which follows the following guidelines:
         - if self.name is a property, the specific property setter is used
-        - else if value is callable and the first parameter is either 'self' or 'ga', self is passed in as the first parameter
+        - else if value is callable and the first parameter is either 'self' or 'ga', it is bound to self as a method
         - else if value is not None or self.name is not set, assign it like normal
         """
 
@@ -210,13 +381,10 @@ class Attributes:
         if hasattr(type(self), name) and isinstance(getattr(type(self), name), property):
             getattr(type(self), name).fset(self, value)
 
-        # Check for function
-        elif callable(value) and next(iter(signature(value).parameters), None) in ('self', 'ga'):
-            foo = lambda *args, **kwargs: value(self, *args, **kwargs)
-            # Reassign name and doc-string for documentation
-            foo.__name__ = value.__name__
-            foo.__doc__  = value.__doc__
-            self.__dict__[name] = foo
+        # Check for function, binding it to the ga as a method
+        # which keeps the original name and doc-string
+        elif callable(value) and first_parameter(value) in ('self', 'ga'):
+            self.__dict__[name] = MethodType(value, self)
 
         # Assign like normal unless None or undefined self.name
         elif value is not None or not hasattr(self, name):
@@ -229,8 +397,9 @@ class Attributes:
 
 
     def save_population(self):
-        """Saves the current population to the database."""
-        self.database.insert_current_population(self)
+        """Saves the current population to the database, unless save_data is False."""
+        if self.save_data:
+            self.database.insert_current_population(self)
 
 
     def save_chromosome(self, chromosome):
@@ -285,6 +454,90 @@ class Attributes:
         self.dist = dist
 
 
+    def array_chromosomes(self, dtype = None):
+        """Sets default methods for chromosomes whose gene values are stored
+        in a numpy array of the given dtype, where slicing is zero-copy and
+        crossover makes each child with a single allocation."""
+
+        self.make_chromosome = Array_Chromosome
+        self.chromosome_impl = lambda: Array_Chromosome(
+            [self.gene_impl() for _ in range(self.chromosome_length)],
+            dtype
+        )
+
+        # Concatenate slices of the parents
+        self.crossover_individual_impl = Crossover.Individual.single_point
+
+
+    def integer_permutation_chromosomes(self, cycle = True):
+        """Sets default methods for chromosomes which are permutations of
+        0, 1, ..., chromosome_length-1, stored as integer arrays. If cycle
+        is True, the genes are treated as a tour and the distance counts
+        the edges between neighboring genes which aren't shared, otherwise
+        it counts the positions with different genes."""
+
+        self.make_chromosome = Permutation_Chromosome
+        self.chromosome_impl = lambda: Permutation_Chromosome.random(self.chromosome_length, self.rng)
+
+        # Use order based operators
+        self.crossover_individual_impl = Crossover.Individual.Permutation.edge_recombination
+        self.mutation_individual_impl  = Mutation.Individual.Permutation.inversion
+
+        if cycle:
+            def dist(self, chromosome_1, chromosome_2):
+                """Count the number of edges they don't have in common."""
+                return chromosome_1.adjacency_distance(chromosome_2)
+
+        else:
+            def dist(self, chromosome_1, chromosome_2):
+                """Count the number of gene pairs they don't have in common."""
+                return chromosome_1.hamming_distance(chromosome_2)
+
+        self.dist = dist
+
+
+    def bit_chromosomes(self):
+        """Sets default methods for chromosomes of packed 0/1 genes"""
+
+        self.make_chromosome = Bit_Chromosome
+        self.chromosome_impl = lambda: Bit_Chromosome.random(self.chromosome_length, self.rng)
+
+        # Use bit mask based operators
+        self.crossover_individual_impl = Crossover.Individual.Bits.uniform
+        self.mutation_individual_impl  = Mutation.Individual.Bits.flip_bits
+
+        def dist(self, chromosome_1, chromosome_2):
+            """Count the number of differing bits."""
+            return popcount(chromosome_1.bits ^ chromosome_2.bits)
+
+        self.dist = dist
+
+
+    def multi_objective_fitness(self, target_fitness_type):
+        """Sets default multi-objective methods, where the fitness function
+        returns one value per objective and target_fitness_type contains
+        'max' or 'min' for each objective, e.g. ('min', 'min')."""
+
+        self.target_fitness_type = target_fitness_type
+
+        # Rank based selection uses the non-dominated sorting
+        self.parent_selection_impl = Parent.Rank.tournament
+
+        # Keep the best of the children and the last population
+        self.survivor_selection_impl = Survivor.fill_in_best_of_all
+
+
+    def novelty_search(self, k = 15, archive_amount = 2, max_archive = 5000):
+        """Sets default novelty search methods, ranking chromosomes by the
+        mean distance to the k nearest behaviors in the population and the
+        archive of past behaviors instead of by fitness."""
+
+        self.novelty = Novelty.Novelty_Search(k, archive_amount, max_archive)
+
+        # Rank based selection uses the novelty ordering
+        self.parent_selection_impl = Parent.Rank.tournament
+
+
     #===========================#
     # Getter/setter properties: #
     #===========================#
@@ -304,6 +557,20 @@ class Attributes:
         self._run = value
 
 
+    @property
+    def seed(self):
+        """Getter function for the seed of the random number stream."""
+        return self._seed
+
+
+    @seed.setter
+    def seed(self, seed):
+        """Setter function which restarts the random number stream
+        ga.rng from the seed, or from fresh entropy if it is None."""
+        self._seed = seed
+        self.rng = Rng.Random_Stream(seed)
+
+
     @property
     def current_generation(self):
         """Getter function for the current generation."""
@@ -362,11 +629,26 @@ class Attributes:
 
     @target_fitness_type.setter
     def target_fitness_type(self, target_fitness_type):
-        """Setter function for target fitness type."""
+        """Setter function for target fitness type. A list or tuple
+        of 'max' and 'min' is used for multiple objectives."""
+
+        # Multiple objectives
+        if isinstance(target_fitness_type, (list, tuple)):
+
+            target_fitness_type = tuple(target_fitness_type)
+
+            if not all(target in ('max', 'min') for target in target_fitness_type):
+                raise ValueError("Each objective's target fitness type must be 'max' or 'min'.")
 
         self._target_fitness_type = target_fitness_type
 
 
+    @property
+    def multi_objective(self):
+        """Returns True if there are multiple objectives."""
+        return isinstance(self.target_fitness_type, tuple)
+
+
     @property
     def max_chromosome_mutation_rate(self):
         """Getter function for max chromosome mutation rate"""
@@ -0,0 +1,62 @@
+"""Runs the EasyGA benchmark suite from the EasyGA directory using
+
+    python3 -m benchmarks --output results.json
+    python3 -m benchmarks --output results.json --baseline baseline.json
+
+The exit code is 1 if any benchmark is slower than the baseline by more
+than the tolerance.
+"""
+
+import argparse
+import sys
+
+from tabulate import tabulate
+
+from benchmarks import benchmark
+
+
+parser = argparse.ArgumentParser(prog = 'python3 -m benchmarks', description = 'EasyGA benchmark suite.')
+parser.add_argument('--output', default = 'benchmark.json', help = 'json file the results are saved to')
+parser.add_argument('--baseline', default = None, help = 'json file of previous results to compare against')
+parser.add_argument('--tolerance', type = float, default = 0.25, help = 'allowed relative slowdown before failing')
+parser.add_argument('--population-sizes', type = int, nargs = '+', default = [10, 100, 1000])
+parser.add_argument('--chromosome-lengths', type = int, nargs = '+', default = [10, 100])
+parser.add_argument('--generations', type = int, default = 50)
+parser.add_argument('--repeats', type = int, default = 5)
+parser.add_argument('--quick', action = 'store_true', help = 'small sizes for a fast sanity check')
+arguments = parser.parse_args()
+
+if arguments.quick:
+    arguments.population_sizes = [10, 100]
+    arguments.chromosome_lengths = [10]
+    arguments.generations = 10
+    arguments.repeats = 3
+
+report = benchmark.run_all(
+    population_sizes = arguments.population_sizes,
+    chromosome_lengths = arguments.chromosome_lengths,
+    generations = arguments.generations,
+    repeats = arguments.repeats,
+)
+benchmark.save(report, arguments.output)
+
+print(
+    tabulate(
+        [
+            (name, result.get('median'), result.get('min'), result.get('error', ''))
+            for name, result
+            in sorted(report['results'].items())
+        ],
+        headers = ['benchmark', 'median (s)', 'min (s)', 'error']
+    )
+)
+
+if arguments.baseline is None:
+    sys.exit(0)
+
+rows = benchmark.compare(report, benchmark.load(arguments.baseline), arguments.tolerance)
+
+print()
+print(tabulate(rows, headers = ['benchmark', 'baseline (s)', 'current (s)', 'ratio', 'status']))
+
+sys.exit(int(any(row[-1] == 'slower' for row in rows)))
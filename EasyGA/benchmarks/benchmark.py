@@ -0,0 +1,465 @@
+import gc
+import json
+import math
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+import types
+
+from EasyGA import GA, Parent, Crossover, Mutation, Survivor
+from examples import Fitness
+
+
+#====================#
+# Benchmark helpers: #
+#====================#
+
+
+def time_method(setup, method, repeats = 5):
+    """Times method(state) for a fresh state = setup() on every repeat.
+    Returns the min and median of the times in seconds. If the method
+    raises an exception, the error is returned instead."""
+
+    times = []
+
+    for _ in range(repeats):
+        state = setup()
+        start = time.perf_counter()
+        try:
+            method(state)
+        except Exception as e:
+            return {'error': f"{type(e).__name__}: {e}"}
+        times.append(time.perf_counter() - start)
+
+    times.sort()
+    return {
+        'min'     : times[0],
+        'median'  : times[len(times)//2],
+        'repeats' : repeats,
+    }
+
+
+def make_ga(population_size, chromosome_length, kind = 'integer'):
+    """Creates a ga with an evaluated and sorted population of the given kind,
+    which may be 'integer', 'float' or 'permutation'."""
+
+    ga = GA(
+        population_size = population_size,
+        chromosome_length = chromosome_length,
+        save_data = False,
+    )
+
+    if kind == 'float':
+        ga.numeric_chromosomes()
+        ga.gene_impl = lambda: random.uniform(0, 10)
+        ga.fitness_function_impl = Fitness.near_5
+        ga.target_fitness_type = 'min'
+
+    elif kind == 'permutation':
+        ga.permutation_chromosomes()
+        ga.chromosome_impl = lambda: random.sample(range(chromosome_length), chromosome_length)
+        ga.fitness_function_impl = Fitness.index_dependent_values
+
+    ga.initialize_population()
+    ga.set_all_fitness()
+    ga.sort_by_best_fitness()
+
+    return ga
+
+
+def make_ga_with_parents(population_size, chromosome_length, kind = 'integer'):
+    """Creates a ga with a mating pool already selected."""
+
+    ga = make_ga(population_size, chromosome_length, kind)
+    ga.parent_selection_impl()
+    return ga
+
+
+def make_ga_with_children(population_size, chromosome_length, kind = 'integer'):
+    """Creates a ga with the mating pool and half of the next population filled in."""
+
+    ga = make_ga_with_parents(population_size, chromosome_length, kind)
+    ga.population.append_children(
+        ga.make_chromosome(chromosome)
+        for chromosome
+        in ga.population[:len(ga.population)//2]
+    )
+    return ga
+
+
+def cross_population(ga):
+    """Crosses random pairs until the next population is full."""
+
+    for _ in range(len(ga.population)):
+        ga.crossover_individual_impl(
+            random.choice(ga.population),
+            random.choice(ga.population),
+        )
+
+
+def mutate_population(ga):
+    """Mutates every chromosome once."""
+
+    for chromosome in ga.population:
+        ga.mutation_individual_impl(chromosome)
+
+
+#====================#
+# Operator registry: #
+#====================#
+
+# (group, name, chromosome kind, ga attribute, method, setup, benchmarked call)
+operators = [
+    ('parent', 'Rank.tournament',             'integer', 'parent_selection_impl', Parent.Rank.tournament,             make_ga, lambda ga: ga.parent_selection_impl()),
+    ('parent', 'Rank.stochastic_geometric',   'integer', 'parent_selection_impl', Parent.Rank.stochastic_geometric,   make_ga, lambda ga: ga.parent_selection_impl()),
+    ('parent', 'Rank.stochastic_arithmetic',  'integer', 'parent_selection_impl', Parent.Rank.stochastic_arithmetic,  make_ga, lambda ga: ga.parent_selection_impl()),
+    ('parent', 'Fitness.roulette',            'integer', 'parent_selection_impl', Parent.Fitness.roulette,            make_ga, lambda ga: ga.parent_selection_impl()),
+    ('parent', 'Fitness.stochastic',          'integer', 'parent_selection_impl', Parent.Fitness.stochastic,          make_ga, lambda ga: ga.parent_selection_impl()),
+
+    ('crossover', 'Population.sequential',             'integer',     'crossover_population_impl', Crossover.Population.sequential,            make_ga_with_parents, lambda ga: ga.crossover_population_impl()),
+    ('crossover', 'Population.random',                 'integer',     'crossover_population_impl', Crossover.Population.random,                make_ga_with_parents, lambda ga: ga.crossover_population_impl()),
+    ('crossover', 'Individual.single_point',           'integer',     'crossover_individual_impl', Crossover.Individual.single_point,          make_ga, cross_population),
+    ('crossover', 'Individual.uniform',                'integer',     'crossover_individual_impl', Crossover.Individual.uniform,               make_ga, cross_population),
+    ('crossover', 'Individual.Arithmetic.average',     'float',       'crossover_individual_impl', Crossover.Individual.Arithmetic.average,     make_ga, cross_population),
+    ('crossover', 'Individual.Arithmetic.extrapolate', 'float',       'crossover_individual_impl', Crossover.Individual.Arithmetic.extrapolate, make_ga, cross_population),
+    ('crossover', 'Individual.Arithmetic.random',      'float',       'crossover_individual_impl', Crossover.Individual.Arithmetic.random,      make_ga, cross_population),
+    ('crossover', 'Individual.Permutation.ox1',        'permutation', 'crossover_individual_impl', Crossover.Individual.Permutation.ox1,        make_ga, cross_population),
+
+    ('mutation', 'Population.random_selection',          'integer',     'mutation_population_impl', Mutation.Population.random_selection,            make_ga, lambda ga: ga.mutation_population_impl()),
+    ('mutation', 'Population.random_avoid_best',         'integer',     'mutation_population_impl', Mutation.Population.random_avoid_best,           make_ga, lambda ga: ga.mutation_population_impl()),
+    ('mutation', 'Population.best_replace_worst',        'integer',     'mutation_population_impl', Mutation.Population.best_replace_worst,          make_ga, lambda ga: ga.mutation_population_impl()),
+    ('mutation', 'Individual.individual_genes',          'integer',     'mutation_individual_impl', Mutation.Individual.individual_genes,            make_ga, mutate_population),
+    ('mutation', 'Individual.Arithmetic.average',        'float',       'mutation_individual_impl', Mutation.Individual.Arithmetic.average,          make_ga, mutate_population),
+    ('mutation', 'Individual.Arithmetic.reflect_genes',  'float',       'mutation_individual_impl', Mutation.Individual.Arithmetic.reflect_genes,    make_ga, mutate_population),
+    ('mutation', 'Individual.Permutation.swap_genes',    'permutation', 'mutation_individual_impl', Mutation.Individual.Permutation.swap_genes,      make_ga, mutate_population),
+    ('mutation', 'Individual.Permutation.swap_segments', 'permutation', 'mutation_individual_impl', Mutation.Individual.Permutation.swap_segments,   make_ga, mutate_population),
+
+    ('survivor', 'fill_in_best',                'integer', 'survivor_selection_impl', Survivor.fill_in_best,                make_ga_with_children, lambda ga: ga.survivor_selection_impl()),
+    ('survivor', 'fill_in_random',              'integer', 'survivor_selection_impl', Survivor.fill_in_random,              make_ga_with_children, lambda ga: ga.survivor_selection_impl()),
+    ('survivor', 'fill_in_parents_then_random', 'integer', 'survivor_selection_impl', Survivor.fill_in_parents_then_random, make_ga_with_children, lambda ga: ga.survivor_selection_impl()),
+]
+
+
+#============================#
+# End-to-end fitness setups: #
+#============================#
+
+
+def tsp_cities(amount, seed = 0):
+    """Returns a reproducible list of random city coordinates."""
+
+    generator = random.Random(seed)
+    return [(generator.random(), generator.random()) for _ in range(amount)]
+
+
+def tsp_setup(ga):
+    """Sets up a travelling salesman problem on random cities."""
+
+    cities = tsp_cities(ga.chromosome_length)
+
+    def tour_length(ga, chromosome):
+        """Total length of the closed tour through the cities."""
+
+        return sum(
+            math.hypot(
+                cities[chromosome[i-1].value][0] - cities[chromosome[i].value][0],
+                cities[chromosome[i-1].value][1] - cities[chromosome[i].value][1],
+            )
+            for i
+            in range(len(chromosome))
+        )
+
+    ga.permutation_chromosomes()
+    ga.chromosome_impl = lambda: random.sample(range(ga.chromosome_length), ga.chromosome_length)
+    ga.fitness_function_impl = tour_length
+    ga.target_fitness_type = 'min'
+
+
+def near_5_setup(ga):
+    """Sets up the float based near_5 problem."""
+
+    ga.numeric_chromosomes()
+    ga.gene_impl = lambda: random.uniform(0, 10)
+    ga.fitness_function_impl = Fitness.near_5
+    ga.target_fitness_type = 'min'
+
+
+def is_it_5_setup(ga):
+    """The default ga already uses is_it_5."""
+    ga.fitness_function_impl = Fitness.is_it_5
+
+
+scenarios = [
+    ('is_it_5', is_it_5_setup),
+    ('near_5',  near_5_setup),
+    ('tsp',     tsp_setup),
+]
+
+
+#=================#
+# Benchmark runs: #
+#=================#
+
+
+def benchmark_operators(population_sizes, chromosome_lengths, repeats = 5, groups = None):
+    """Times every operator for every population size and chromosome length."""
+
+    results = {}
+
+    for group, name, kind, attribute, method, setup, call in operators:
+
+        if groups is not None and group not in groups:
+            continue
+
+        for population_size in population_sizes:
+            for chromosome_length in chromosome_lengths:
+
+                def prepared_setup():
+                    ga = setup(population_size, chromosome_length, kind)
+                    setattr(ga, attribute, method)
+                    return ga
+
+                key = f"{group}/{name}/p{population_size}/c{chromosome_length}"
+                results[key] = time_method(prepared_setup, call, repeats)
+
+    return results
+
+
+def benchmark_database(population_sizes, chromosome_lengths, repeats = 5):
+    """Times inserting a whole population into the SQL database."""
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for population_size in population_sizes:
+            for chromosome_length in chromosome_lengths:
+
+                def setup():
+                    ga = make_ga(population_size, chromosome_length)
+                    ga.save_data = True
+                    ga.database_name = os.path.join(directory, 'benchmark.db')
+                    ga.database.create_all_tables(ga)
+                    return ga
+
+                key = f"database/insert_current_population/p{population_size}/c{chromosome_length}"
+                results[key] = time_method(setup, lambda ga: ga.save_population(), repeats)
+
+    return results
+
+
+def benchmark_scenarios(population_size, chromosome_length, generations, repeats = 3):
+    """Times complete runs of each scenario with and without the database."""
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, scenario_setup in scenarios:
+            for save_data in (False, True):
+
+                def setup():
+                    ga = GA(
+                        population_size = population_size,
+                        chromosome_length = chromosome_length,
+                        generation_goal = generations,
+                        save_data = save_data,
+                    )
+                    ga.database_name = os.path.join(directory, 'benchmark.db')
+                    scenario_setup(ga)
+                    return ga
+
+                key = f"evolve/{name}/{'database' if save_data else 'no_database'}/p{population_size}/c{chromosome_length}/g{generations}"
+                results[key] = time_method(setup, lambda ga: ga.evolve(), repeats)
+
+    return results
+
+
+def gc_collections():
+    """Returns the number of garbage collections of every generation so far."""
+    return [stats['collections'] for stats in gc.get_stats()]
+
+
+def benchmark_memory(population_size, chromosome_length, generations, repeats = 3):
+    """Times complete runs with and without ga.double_buffered, and measures
+    the garbage collector pressure of one more run of each: the number of
+    collections of each generation and the peak traced memory."""
+
+    results = {}
+
+    for double_buffered in (False, True):
+
+        def setup():
+            return GA(
+                population_size = population_size,
+                chromosome_length = chromosome_length,
+                generation_goal = generations,
+                save_data = False,
+                double_buffered = double_buffered,
+            )
+
+        key = f"memory/{'double_buffered' if double_buffered else 'generational'}/p{population_size}/c{chromosome_length}/g{generations}"
+        results[key] = time_method(setup, lambda ga: ga.evolve(), repeats)
+
+        # Count the collections of a single run
+        ga = setup()
+        gc.collect()
+        start = gc_collections()
+        ga.evolve()
+        results[key]['gc_collections'] = [end - start for start, end in zip(start, gc_collections())]
+
+        # Trace the memory of a single run
+        ga = setup()
+        tracemalloc.start()
+        ga.evolve()
+        results[key]['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return results
+
+
+def closure_binding(ga, method):
+    """Binds the method to the ga the way Attributes.__setattr__
+    used to, for comparison against types.MethodType."""
+
+    bound = lambda *args, **kwargs: method(ga, *args, **kwargs)
+    bound.__name__ = method.__name__
+    bound.__doc__  = method.__doc__
+    return bound
+
+
+def noop(ga, *args):
+    """Does nothing, to isolate the cost of calling a bound method."""
+    pass
+
+
+def benchmark_binding(calls = 10000, repeats = 5):
+    """Times calling each impl bound with a closure and with types.MethodType.
+    The per-call overhead saved by binding real methods is reported as
+    saved_per_call in the method timing, so it isn't compared as a time."""
+
+    results = {}
+
+    # (name, method, arguments passed given the ga)
+    impls = [
+        ('noop',                      noop,                                   lambda ga: ()),
+        ('fitness_function_impl',     Fitness.is_it_5,                        lambda ga: (ga.population[0],)),
+        ('mutation_individual_impl',  Mutation.Individual.individual_genes,   lambda ga: (ga.population[-1],)),
+        ('crossover_individual_impl', Crossover.Individual.single_point,      lambda ga: (ga.population[0], ga.population[1])),
+    ]
+
+    for name, method, make_arguments in impls:
+
+        per_call = {}
+
+        for binding in ('closure', 'method'):
+
+            def setup():
+                ga = make_ga(10, 10)
+                bound = closure_binding(ga, method) if binding == 'closure' else types.MethodType(method, ga)
+                return bound, make_arguments(ga)
+
+            def call_repeatedly(state):
+                bound, arguments = state
+                for _ in range(calls):
+                    bound(*arguments)
+
+            result = time_method(setup, call_repeatedly, repeats)
+            results[f"binding/{name}/{binding}"] = result
+
+            if 'error' not in result:
+                result['calls'] = calls
+                per_call[binding] = result['min'] / calls
+
+        # Only compare bindings which both ran
+        if len(per_call) == 2:
+            results[f"binding/{name}/method"]['saved_per_call'] = per_call['closure'] - per_call['method']
+
+    return results
+
+
+def run_all(
+        population_sizes = (10, 100, 1000),
+        chromosome_lengths = (10, 100),
+        generations = 50,
+        repeats = 5,
+        seed = 0,
+    ):
+    """Runs the entire benchmark suite and returns the results."""
+
+    random.seed(seed)
+
+    results = {}
+    results.update(benchmark_operators(population_sizes, chromosome_lengths, repeats))
+    results.update(benchmark_database(population_sizes, chromosome_lengths, repeats))
+    results.update(benchmark_binding(repeats = repeats))
+    results.update(benchmark_scenarios(max(population_sizes[0], 10), chromosome_lengths[0], generations, max(1, repeats//2)))
+    results.update(benchmark_memory(population_sizes[-1], chromosome_lengths[-1], generations, max(1, repeats//2)))
+
+    return {
+        'environment' : environment(),
+        'results'     : results,
+    }
+
+
+def environment():
+    """Returns information on the machine running the benchmarks."""
+
+    return {
+        'python'    : platform.python_version(),
+        'platform'  : platform.platform(),
+        'processor' : platform.processor(),
+        'time'      : time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+#========================#
+# Saving and comparison: #
+#========================#
+
+
+def save(report, file_name):
+    """Saves the benchmark report as json."""
+
+    with open(file_name, 'w') as f:
+        json.dump(report, f, indent = 2, sort_keys = True)
+
+
+def load(file_name):
+    """Loads a benchmark report saved as json."""
+
+    with open(file_name) as f:
+        return json.load(f)
+
+
+def compare(report, baseline, tolerance = 0.25):
+    """Compares the median times in the report against the baseline.
+    Returns a list of rows (name, baseline, current, ratio, status) where
+    the status is 'slower' if the ratio is above 1 + tolerance, 'faster'
+    if it is below 1 / (1 + tolerance), 'error' if either run failed,
+    and 'ok' otherwise."""
+
+    rows = []
+
+    for name in sorted(set(report['results']) & set(baseline['results'])):
+
+        current  = report['results'][name]
+        previous = baseline['results'][name]
+
+        if 'error' in current or 'error' in previous:
+            rows.append((name, previous.get('median'), current.get('median'), None, 'error'))
+            continue
+
+        ratio = current['median'] / previous['median'] if previous['median'] > 0 else float('inf')
+
+        if ratio > 1 + tolerance:
+            status = 'slower'
+        elif ratio < 1 / (1 + tolerance):
+            status = 'faster'
+        else:
+            status = 'ok'
+
+        rows.append((name, previous['median'], current['median'], ratio, status))
+
+    return rows
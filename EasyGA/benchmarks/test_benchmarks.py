@@ -0,0 +1,54 @@
+from benchmarks import benchmark
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_benchmark_report():
+    """A tiny benchmark run should produce timings for operators, the database and scenarios."""
+
+    report = benchmark.run_all(
+        population_sizes = (10,),
+        chromosome_lengths = (5,),
+        generations = 2,
+        repeats = 1,
+    )
+    results = report['results']
+
+    assert 'median' in results['parent/Rank.tournament/p10/c5']
+    assert 'median' in results['database/insert_current_population/p10/c5']
+    assert 'median' in results['evolve/tsp/no_database/p10/c5/g2']
+    assert 'median' in results['evolve/tsp/database/p10/c5/g2']
+    assert len(results['memory/double_buffered/p10/c5/g2']['gc_collections']) == 3
+
+    # Savings are reported with the timing instead of as a timing
+    assert 'saved_per_call' in results['binding/noop/method']
+    assert not any(name.endswith('saved_per_call') for name in results)
+
+
+def test_benchmark_binding_error():
+    """A failing binding benchmark should be reported as an error without stopping the others."""
+
+    def fail(ga):
+        raise ValueError("failed")
+
+    noop = benchmark.noop
+    benchmark.noop = fail
+    try:
+        results = benchmark.benchmark_binding(calls = 10, repeats = 1)
+    finally:
+        benchmark.noop = noop
+
+    assert 'error' in results['binding/noop/method']
+    assert 'saved_per_call' not in results['binding/noop/method']
+    assert 'saved_per_call' in results['binding/fitness_function_impl/method']
+
+
+def test_benchmark_compare():
+    """Runs much slower than the baseline should be flagged."""
+
+    baseline = {'results': {'a': {'median': 1.0}, 'b': {'median': 1.0}, 'c': {'error': 'ValueError'}}}
+    report   = {'results': {'a': {'median': 1.1}, 'b': {'median': 2.0}, 'c': {'median': 1.0}}}
+
+    status = {row[0]: row[-1] for row in benchmark.compare(report, baseline, tolerance = 0.25)}
+
+    assert status == {'a': 'ok', 'b': 'slower', 'c': 'error'}
@@ -1,11 +1,13 @@
-import random
-
 # Import all crossover decorators
 from decorators import _check_weight, _gene_by_gene
 
+# Packed bit chromosomes
+from structure import Bit_Chromosome
+from structure.bit_chromosome import random_mask
+
 # Round to an integer near x with higher probability
 # the closer it is to that integer.
-randround = lambda x: int(x + random.random())
+randround = lambda rng, x: int(x + rng.random())
 
 
 class Population:
@@ -37,7 +39,7 @@ class Population:
         for parent in mating_pool:          # for each parent in the mating pool
             ga.crossover_individual_impl(   #     apply crossover to
                 parent,                     #         the parent and
-                random.choice(mating_pool)  #         a random parent
+                ga.rng.choice(mating_pool)  #         a random parent
             )
 
 
@@ -68,7 +70,7 @@ class Individual:
     @_gene_by_gene
     def uniform(ga, value_1, value_2, *, weight = 0.5):
         """Cross two parents by swapping all genes randomly."""
-        return random.choices(gene_pair, cum_weights = [weight, 1])[0]
+        return value_1 if ga.rng.random() < weight else value_2
 
 
     class Arithmetic:
@@ -81,7 +83,7 @@ class Individual:
             average_value = weight*value_1 + (1-weight)*value_2
 
             if type(value_1) == type(value_2) == int:
-                average_value = randround(value)
+                average_value = randround(ga.rng, average_value)
 
             return average_value
 
@@ -95,7 +97,7 @@ class Individual:
             extrapolated_value = weight*value_1 + (1-weight)*value_2
 
             if type(value_1) == type(value_2) == int:
-                extrapolated_value = randround(value)
+                extrapolated_value = randround(ga.rng, extrapolated_value)
 
             return extrapolated_value
 
@@ -108,7 +110,7 @@ class Individual:
             value = value_1 + ga.weighted_random(weight) * (value_2-value_1)
 
             if type(value_1) == type(value_2) == int:
-                value = randround(value)
+                value = randround(ga.rng, value)
 
             return value
 
@@ -132,12 +134,12 @@ class Individual:
 
             # Swap with weighted probability so that most of the genes
             # are taken directly from parent 1.
-            if random.choices([0, 1], cum_weights = [weight, 1]) == 1:
+            if ga.rng.random() >= weight:
                 parent_1, parent_2 = parent_2, parent_1
 
             # Extract genes from parent 1 between two random indexes
-            index_2 = random.randrange(1, len(parent_1))
-            index_1 = random.randrange(index_2)
+            index_2 = ga.rng.randrange(1, len(parent_1))
+            index_1 = ga.rng.randrange(index_2)
 
             # Create copies of the gene lists
             gene_list_1 = [None]*index_1 + parent_1[index_1:index_2] + [None]*(len(parent_1)-index_2)
@@ -159,5 +161,96 @@ class Individual:
                     gene_list_1[input_index] = gene_list_2.pop(-1)
                     input_index += 1
 
-            ga.population.add_child(gene_list_1)
+            ga.population.add_child(ga.make_chromosome(gene_list_1))
+
+
+        @_check_weight
+        def edge_recombination(ga, parent_1, parent_2, *, weight = 0.5):
+            """Cross two parents by building a child which keeps as many of
+            the edges between neighboring genes in the parents as possible.
+            The child starts at the first gene of parent 1 with probability
+            weight, and continues with the unused neighbor of the last gene
+            which has the fewest unused neighbors left, or a random unused
+            gene if there are none. Genes must be hashable.
+            """
+
+            # Unequal parent lengths
+            if len(parent_1) != len(parent_2):
+                raise ValueError("Parents do not have the same lengths.")
+
+            value_list_1 = parent_1.gene_value_list
+            value_list_2 = parent_2.gene_value_list
+
+            # Too small to cross
+            if len(value_list_1) < 2:
+                ga.population.add_child(ga.make_chromosome(value_list_1))
+                return
+
+            # Neighbors of every gene in either parent, counting the last and first genes as neighbors
+            neighbors = {value: set() for value in value_list_1}
+            for value_list in (value_list_1, value_list_2):
+                for previous, value, following in zip(value_list[-1:] + value_list[:-1], value_list, value_list[1:] + value_list[:1]):
+                    neighbors[value].update((previous, following))
+
+            value = value_list_1[0] if ga.rng.random() < weight else value_list_2[0]
+            child = [value]
+
+            while True:
+
+                # Remove the used gene from the neighbors of the unused genes
+                candidates = neighbors.pop(value)
+                for neighbor in candidates:
+                    neighbors[neighbor].discard(value)
+
+                if len(neighbors) == 0:
+                    break
+
+                # Prefer the neighbor with the fewest unused neighbors
+                if len(candidates) > 0:
+                    value = min(candidates, key = lambda neighbor: (len(neighbors[neighbor]), ga.rng.random()))
+                else:
+                    value = ga.rng.choice(list(neighbors))
+
+                child.append(value)
+
+            ga.population.add_child(ga.make_chromosome(child))
+
+
+    class Bits:
+        """Crossover methods for bit chromosomes, see ga.bit_chromosomes(),
+        which combine the packed bits of the parents using bit masks."""
+
+        @_check_weight
+        def single_point(ga, parent_1, parent_2, *, weight = 0.5):
+            """Cross two parents by swapping bits at one random point."""
+
+            minimum_parent_length = min(len(parent_1), len(parent_2))
+
+            # Weighted random integer from 0 to minimum parent length - 1
+            swap_index = int(ga.weighted_random(weight) * minimum_parent_length)
+            low_mask = (1 << swap_index) - 1
+
+            ga.population.add_child(Bit_Chromosome.from_bits(
+                (parent_1.bits & low_mask) | (parent_2.bits & ~low_mask),
+                len(parent_2)
+            ))
+            ga.population.add_child(Bit_Chromosome.from_bits(
+                (parent_2.bits & low_mask) | (parent_1.bits & ~low_mask),
+                len(parent_1)
+            ))
+
+
+        @_check_weight
+        def uniform(ga, parent_1, parent_2, *, weight = 0.5):
+            """Cross two parents by taking each bit from
+            the first parent with probability weight."""
+
+            if len(parent_1) != len(parent_2):
+                raise ValueError("Parents do not have the same lengths.")
+
+            mask = random_mask(len(parent_1), weight, ga.rng)
 
+            ga.population.add_child(Bit_Chromosome.from_bits(
+                (parent_1.bits & mask) | (parent_2.bits & ~mask),
+                len(parent_1)
+            ))
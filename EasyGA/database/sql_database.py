@@ -1,5 +1,6 @@
 import sqlite3
 import os
+import json
 
 from tabulate import tabulate
 
@@ -17,6 +18,15 @@ class SQL_Database:
         config_id INTEGER,
         attribute_name TEXT,
         attribute_value TEXT)"""
+        self.pareto_structure = f"""
+        CREATE TABLE IF NOT EXISTS pareto (
+        id INTEGER PRIMARY KEY,
+        config_id INTEGER DEFAULT NULL,
+        generation INTEGER NOT NULL,
+        front INTEGER,
+        crowding_distance REAL,
+        fitness TEXT,
+        chromosome TEXT)"""
 
 
     #=====================================#
@@ -35,6 +45,8 @@ class SQL_Database:
             self.create_table(ga.sql_create_data_structure)
             # Creare config table
             self.create_table(self.config_structure)
+            # Create pareto front table
+            self.create_table(self.pareto_structure)
             # Set the config id
             self.config_id = self.get_current_config()
 
@@ -81,10 +93,10 @@ class SQL_Database:
 
                     value = str(value)
 
-                # Insert into database
-                self.conn.execute(f"""
+                # Insert into database, letting sqlite quote the value
+                self.conn.execute("""
                 INSERT INTO config(config_id,attribute_name, attribute_value)
-                VALUES ('{self.config_id}', '{name}','{value}');""")
+                VALUES (?,?,?);""", (self.config_id, name, value))
 
 
         self.config_id = self.get_current_config()
@@ -195,6 +207,26 @@ class SQL_Database:
         GROUP by generation;""")
 
 
+    def get_pareto_front(self, generation = None, front = 0, config_id = None):
+        """Get the fitness vectors of the given front of a generation,
+        defaulting to the first front of the last generation"""
+
+        config_id = self.config_id if config_id is None else config_id
+
+        if generation is None:
+            generation = self.query_one_item(f"""
+            SELECT MAX(generation)
+            FROM pareto
+            WHERE config_id={config_id};""")
+
+        rows = self.conn.execute(f"""
+        SELECT fitness
+        FROM pareto
+        WHERE config_id={config_id} AND generation={generation} AND front={front};""").fetchall()
+
+        return [tuple(json.loads(row[0])) for row in rows]
+
+
     def get_all_config_id(self):
         """Get an array of all the DISTINCT config_id in the database"""
 
@@ -246,7 +278,7 @@ class SQL_Database:
             (
                 self.config_id,
                 ga.current_generation,
-                chromosome.fitness,
+                None if ga.multi_objective else chromosome.fitness,
                 repr(chromosome)
             )
             for chromosome
@@ -259,9 +291,38 @@ class SQL_Database:
 
         cur = self.conn.cursor()
         cur.executemany(sql, db_chromosome_list)
+
+        # Fitness vectors are stored with their fronts instead
+        if ga.multi_objective:
+            self.insert_current_pareto_fronts(ga, cur)
+
         self.conn.commit()
 
 
+    def insert_current_pareto_fronts(self, ga, cur):
+        """ Insert the non-dominated front of every chromosome in the current generation """
+
+        # Structure the insert data
+        db_front_list = [
+            (
+                self.config_id,
+                ga.current_generation,
+                chromosome.rank,
+                chromosome.crowding_distance,
+                json.dumps([float(value) for value in chromosome.fitness]),
+                repr(chromosome)
+            )
+            for chromosome
+            in ga.population
+        ]
+
+        # Create sql query structure
+        sql = """INSERT INTO pareto(config_id, generation, front, crowding_distance, fitness, chromosome)
+                 VALUES(?,?,?,?,?,?)"""
+
+        cur.executemany(sql, db_front_list)
+
+
 
     #=====================================#
     # Functions:                          #
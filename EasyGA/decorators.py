@@ -1,6 +1,11 @@
-import random
+import time
 from math import ceil
 
+import numpy as np
+
+# Array based chromosomes keep their values in a single array
+from structure import Array_Chromosome
+
 def function_info(decorator):
     """Recovers the name and doc-string for decorators throughout EasyGA for documentation purposes.""" 
 
@@ -47,7 +52,7 @@ def _gene_by_gene(individual_method):
 
     def new_method(ga, parent_1, parent_2, *, weight = individual_method.__kwdefaults__.get('weight', 'None')):
 
-        ga.population.add_child(
+        child = (
             individual_method(ga, value_1, value_2)
             if weight == 'None' else
             individual_method(ga, value_1, value_2, weight = weight)
@@ -55,6 +60,12 @@ def _gene_by_gene(individual_method):
             in zip(parent_1.gene_value_iter, parent_2.gene_value_iter)
         )
 
+        # Keep the values of array chromosomes in a single array
+        if isinstance(parent_1, Array_Chromosome):
+            child = Array_Chromosome(list(child))
+
+        ga.population.add_child(child)
+
     return new_method
 
 
@@ -92,11 +103,22 @@ def _check_positive_fitness(selection_method):
 
 @function_info
 def _ensure_sorted(selection_method):
-    """Sorts the population by fitness and then runs the selection method."""
+    """Sorts the population by fitness and then runs the selection method.
+    With fitness sharing, the population is sorted by the shared fitness
+    while selecting, and then sorted by fitness again."""
 
     def new_method(ga):
         ga.sort_by_best_fitness()
-        selection_method(ga)
+
+        if ga.fitness_sharing is None:
+            selection_method(ga)
+            return
+
+        ga.fitness_sharing.share(ga)
+        try:
+            selection_method(ga)
+        finally:
+            ga.sort_by_best_fitness()
 
     return new_method
 
@@ -155,11 +177,39 @@ def _check_gene_mutation_rate(individual_method):
 
 @function_info
 def _reset_fitness(individual_method):
-    """Resets the fitness value of the chromosome."""
+    """Resets the fitness value of the chromosome. If ga.delta_fitness_impl
+    is set and the chromosome has a fitness, the changed genes are tracked
+    instead and the fitness is updated incrementally using
+
+        ga.delta_fitness_impl(chromosome, changed_indexes, old_values)
+
+    unless the gene list was replaced or resized by the mutation."""
 
     def new_method(ga, chromosome):
-        chromosome.fitness = None
-        individual_method(ga, chromosome)
+
+        # Full re-evaluation
+        if ga.delta_fitness_impl is None or chromosome.fitness is None:
+            chromosome.fitness = None
+            individual_method(ga, chromosome)
+            return
+
+        chromosome.track_changes()
+
+        try:
+            individual_method(ga, chromosome)
+            changes = chromosome.changes
+        finally:
+            chromosome.changes = None
+
+        # Changes which couldn't be tracked
+        if changes is None:
+            chromosome.fitness = None
+
+        # Incremental update
+        elif len(changes) > 0:
+            chromosome.fitness = ga.delta_fitness_impl(chromosome, list(changes), list(changes.values()))
+
+        ga.statistics.changed(chromosome)
 
     return new_method
 
@@ -176,17 +226,227 @@ def _loop_random_mutations(individual_method):
         sample_size  = ceil(len(chromosome)*ga.gene_mutation_rate)
 
         # Loop the individual method until enough genes are mutated.
-        for index in random.sample(sample_space, sample_size):
+        for index in ga.rng.sample(sample_space, sample_size):
             individual_method(ga, chromosome, index)
 
     return new_method
 
 
+#==========================#
+# Local search decorators: #
+#==========================#
+
+
+def _is_improvement(ga, new_fitness, old_fitness):
+    """Returns True if the new fitness is better than the old fitness,
+    or dominates it if there are multiple objectives."""
+
+    if old_fitness is None:
+        return True
+
+    if ga.multi_objective:
+        signs = [1 if target == 'max' else -1 for target in ga.target_fitness_type]
+        differences = [sign*(new - old) for sign, new, old in zip(signs, new_fitness, old_fitness)]
+        return min(differences) >= 0 and max(differences) > 0
+
+    if ga.target_fitness_type == 'max':
+        return new_fitness > old_fitness
+    else:
+        return new_fitness < old_fitness
+
+
+@function_info
+def _check_local_search_rate(population_method):
+    """Checks if the local search rate is between 0 and 1 before running."""
+
+    def new_method(ga):
+
+        if 0 <= ga.local_search_rate <= 1:
+            population_method(ga)
+        else:
+            raise ValueError("Local search rate must be between 0 and 1.")
+
+    return new_method
+
+
+@function_info
+def _search_chromosomes(population_method):
+    """Runs ga.local_search_individual_impl on every chromosome selected
+    by the population method, using ga.executor if it is set. Selected
+    chromosomes are evaluated first so that moves can be compared. With
+    an executor, every chromosome gets its own stream spawned from ga.rng
+    for its moves, since the stream can't be shared between threads, and
+    the results don't depend on the order the tasks run in. Individual
+    methods marked as serial, which draw from ga.rng themselves, are
+    never run by the executor."""
+
+    def new_method(ga):
+
+        chromosome_list = population_method(ga)
+
+        # Moves are compared against the current fitness
+        ga.set_all_fitness(chromosome_list)
+
+        if ga.executor is None or getattr(ga.local_search_individual_impl, 'serial', False):
+            evaluations = map(ga.local_search_individual_impl, chromosome_list)
+        else:
+            evaluations = ga.executor.map(ga.local_search_individual_impl, chromosome_list, ga.rng.spawn(len(chromosome_list)))
+
+        ga.evaluation_count += sum(evaluations)
+
+        for chromosome in chromosome_list:
+            ga.statistics.changed(chromosome)
+
+    return new_method
+
+
+@function_info
+def _accept_improving_moves(move_method):
+    """Makes ga.local_search_budget moves on the chromosome, keeping
+    the moves which improve its fitness and undoing the rest. Moves
+    return the changed indexes and the old values at those indexes,
+    which are passed to ga.delta_fitness_impl if it is set. Moves draw
+    from rng, or ga.rng if it isn't given. Returns the number of full
+    fitness evaluations used."""
+
+    def new_method(ga, chromosome, rng = None):
+
+        if rng is None:
+            rng = ga.rng
+
+        evaluations = 0
+
+        for _ in range(ga.local_search_budget):
+
+            changed_indexes, old_values = move_method(ga, chromosome, rng)
+
+            # Nothing to evaluate
+            if len(changed_indexes) == 0:
+                continue
+
+            # Update the fitness incrementally if possible
+            if ga.delta_fitness_impl is not None:
+                fitness = ga.delta_fitness_impl(chromosome, changed_indexes, old_values)
+            else:
+                fitness = ga.fitness_function_impl(chromosome)
+                evaluations += 1
+
+            # Keep the move
+            if _is_improvement(ga, fitness, chromosome.fitness):
+                chromosome.fitness = fitness
+
+            # Undo the move
+            else:
+                for index, value in zip(changed_indexes, old_values):
+                    chromosome[index] = ga.make_gene(value)
+
+        return evaluations
+
+    return new_method
+
+
+#=======================#
+# Duplicate decorators: #
+#=======================#
+
+@function_info
+def _replace_duplicates(make_replacement):
+    """Replaces every chromosome in the next population with the same genes
+    as an earlier one by make_replacement(ga, chromosome), retrying up to
+    ga.duplicate_attempts times until the replacement is unique. Chromosomes
+    duplicating any of the kept chromosomes are also replaced. Duplicates are
+    found using a set of chromosome keys instead of comparing chromosomes."""
+
+    def new_method(ga, kept_chromosomes = ()):
+
+        next_population = ga.population.next_population
+        seen = {chromosome.key for chromosome in kept_chromosomes}
+
+        for index, chromosome in enumerate(next_population):
+
+            for _ in range(ga.duplicate_attempts):
+                if chromosome.key not in seen:
+                    break
+                chromosome = make_replacement(ga, chromosome)
+
+            next_population[index] = chromosome
+            seen.add(chromosome.key)
+
+    return new_method
+
+
 #======================#
 # Survivor decorators: #
 #======================#
 
 
+#====================#
+# Engine decorators: #
+#====================#
+
+
+def _distinct_indexes(size, amount, rng):
+    """Returns amount index arrays of the given size, where for every i
+    the values of i and each array at i are all distinct."""
+
+    chosen = [np.arange(size)]
+
+    for _ in range(amount):
+
+        index = rng.integers(size, size = size)
+        clash = np.any([index == previous for previous in chosen], axis = 0)
+
+        # Redraw clashing indexes until all are distinct
+        while clash.any():
+            index[clash] = rng.integers(size, size = clash.sum())
+            clash = np.any([index == previous for previous in chosen], axis = 0)
+
+        chosen.append(index)
+
+    return chosen[1:]
+
+
+@function_info
+def _differential_evolution(base_method):
+    """Performs a generation of differential evolution. The decorated method
+    returns the base vectors given the gene matrix and random indexes.
+    Each chromosome is replaced by its trial vector if it is as good or better."""
+
+    def new_method(ga):
+
+        if ga.multi_objective:
+            raise ValueError("Differential evolution requires a single objective.")
+
+        if len(ga.population) < 4:
+            raise ValueError("Differential evolution requires a population of at least 4 chromosomes.")
+
+        rng = ga.rng.generator
+        matrix = np.array([chromosome.gene_value_list for chromosome in ga.population], dtype = float)
+        size, length = matrix.shape
+
+        # Mutate: base + F * (difference of two random vectors)
+        index_1, index_2, index_3 = _distinct_indexes(size, 3, rng)
+        mutant = base_method(ga, matrix, index_1) + ga.differential_weight * (matrix[index_2] - matrix[index_3])
+
+        # Binomial crossover, guaranteeing at least one gene from the mutant
+        cross = rng.random((size, length)) < ga.differential_crossover_rate
+        cross[np.arange(size), rng.integers(length, size = size)] = True
+        trial_matrix = np.where(cross, mutant, matrix)
+
+        # Evaluate the trials
+        trials = [ga.make_chromosome(row) for row in trial_matrix.tolist()]
+        ga.set_all_fitness(trials)
+
+        # Greedy selection
+        for i, trial in enumerate(trials):
+            target = ga.population[i]
+            if (ga.target_fitness_type == 'max' and trial.fitness >= target.fitness) \
+                    or (ga.target_fitness_type == 'min' and trial.fitness <= target.fitness):
+                ga.population[i] = trial
+
+    return new_method
+
+
 #=========================#
 # Termination decorators: #
 #=========================#
@@ -200,12 +460,18 @@ def _add_by_fitness_goal(termination_impl):
         # Try to check the fitness goal
         try:
 
+            # Novelty search sorts by novelty but keeps the best chromosome by fitness
+            if ga.novelty is not None:
+                best_fitness = ga.novelty.best_chromosome.fitness
+            else:
+                best_fitness = ga.population[0].fitness
+
             # If minimum fitness goal reached, stop ga.
-            if ga.target_fitness_type == 'min' and ga.population[0].fitness <= ga.fitness_goal:
+            if ga.target_fitness_type == 'min' and best_fitness <= ga.fitness_goal:
                 return False
 
             # If maximum fitness goal reached, stop ga.
-            elif ga.target_fitness_type == 'max' and ga.population[0].fitness >= ga.fitness_goal:
+            elif ga.target_fitness_type == 'max' and best_fitness >= ga.fitness_goal:
                 return False
 
         # Fitness or fitness goals are None, or Population not initialized
@@ -240,10 +506,11 @@ def _add_by_tolerance_goal(termination_impl):
 
     def new_method(ga):
 
-        # If tolerance is set, check it, if possible.
+        # If tolerance is set, check it, if possible,
+        # using the statistics of the last evaluated population.
         try:
-            best_fitness = ga.population[0].fitness
-            threshhold_fitness = ga.population[round(ga.percent_converged*len(ga.population))].fitness
+            best_fitness = ga.statistics.best_fitness
+            threshhold_fitness = ga.statistics.threshold_fitness
             tol = ga.tolerance_goal * (1 + abs(best_fitness))
 
             # Terminate if the specified amount of the population has converged to the specified tolerance
@@ -259,3 +526,73 @@ def _add_by_tolerance_goal(termination_impl):
 
     return new_method
 
+
+
+@function_info
+def _add_by_diversity_goal(termination_impl):
+    """Adds termination by diversity goal to the method."""
+
+    def new_method(ga):
+
+        # If the population diversity fell to the diversity goal, stop ga.
+        try:
+            if ga.statistics.pairwise_distance <= ga.diversity_goal:
+                return False
+
+        # Diversity or diversity goal are None
+        except TypeError:
+            pass
+
+        # Check other termination methods
+        return termination_impl(ga)
+
+    return new_method
+
+
+@function_info
+def _add_by_time_goal(termination_impl):
+    """Adds termination by time goal, in seconds since the ga started evolving, to the method."""
+
+    def new_method(ga):
+
+        # If the time goal is set and the ga has started, check it.
+        if ga.time_goal is not None and ga.start_time is not None:
+            if time.perf_counter() - ga.start_time >= ga.time_goal:
+                return False
+
+        # Check other termination methods
+        return termination_impl(ga)
+
+    return new_method
+
+
+@function_info
+def _add_by_evaluation_goal(termination_impl):
+    """Adds termination by the number of fitness evaluations to the method."""
+
+    def new_method(ga):
+
+        # If evaluation goal is set, check it.
+        if ga.evaluation_goal is not None and ga.evaluation_count >= ga.evaluation_goal:
+            return False
+
+        # Check other termination methods
+        return termination_impl(ga)
+
+    return new_method
+
+
+@function_info
+def _add_by_stagnation_goal(termination_impl):
+    """Adds termination by the number of generations without improvement to the method."""
+
+    def new_method(ga):
+
+        # If stagnation goal is set, check it.
+        if ga.stagnation_goal is not None and ga.statistics.stagnant_generations >= ga.stagnation_goal:
+            return False
+
+        # Check other termination methods
+        return termination_impl(ga)
+
+    return new_method
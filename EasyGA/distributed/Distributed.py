@@ -0,0 +1,325 @@
+import itertools
+import queue
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, wait
+
+from structure import Chromosome as make_chromosome
+
+
+class Coordinator:
+    """Evaluates chromosomes on worker processes, which may be on other
+    machines, connected over TCP or Unix sockets. Used by setting
+
+        ga.coordinator = Distributed.Coordinator(('10.0.0.1', 6000), authkey = secret)
+
+    and on every worker machine
+
+        Distributed.run_worker(('10.0.0.1', 6000), fitness_function, authkey = secret)
+
+    Messages are pickled, so anyone who can connect with the authkey can
+    run code on the coordinator and the workers. The authkey must be a
+    secret, e.g. os.urandom(32), and the address should only be reachable
+    from the cluster.
+
+    Functions can't be sent between machines, so every worker is given
+    the fitness function when it starts, and set_all_fitness only sends
+    batches of gene values. Workers can connect and leave at any time.
+
+    Every worker runs one batch at a time. Workers send heartbeats while
+    they evaluate, and a worker which is silent for heartbeat_timeout
+    seconds or disconnects is dropped, and its batch is retried by another
+    worker, at most max_retries times. Once every batch is taken, idle
+    workers steal the batches of the slowest workers by evaluating them
+    again, keeping the first result, so slow machines don't hold up
+    the generation.
+    """
+
+    def __init__(self, address = ('localhost', 0), *, authkey, batch_size = 16,
+                 heartbeat_timeout = 10.0, max_retries = 3, work_stealing = True):
+        """Starts listening for workers. The address may be a (host, port)
+        pair, or a path for a Unix socket. Port 0 picks a free port, and
+        the address used is given by coordinator.address."""
+
+        _check_authkey(authkey)
+        self.listener = Listener(address, authkey = authkey)
+        self.address = self.listener.address
+        self.authkey = authkey
+        self.batch_size = batch_size
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_retries = max_retries
+        self.work_stealing = work_stealing
+
+        self.workers = []
+        self.retries = 0
+        self.steals = 0
+        self.lost_workers = 0
+
+        self._batch_ids = itertools.count()
+        self._new_connections = queue.SimpleQueue()
+        self._closed = False
+        self._accept_thread = threading.Thread(target = self._accept, daemon = True)
+        self._accept_thread.start()
+
+
+    def _accept(self):
+        """Accepts new workers until the coordinator is closed."""
+
+        while True:
+            try:
+                connection = self.listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                if self._closed:
+                    return
+                continue
+
+            if self._closed:
+                connection.close()
+                return
+
+            self._new_connections.put(connection)
+
+
+    def _add_new_workers(self, timeout = None):
+        """Adds the workers which connected, waiting up
+        to timeout seconds for one if timeout is given."""
+
+        try:
+            if timeout is not None:
+                self.workers.append(_Worker(self._new_connections.get(timeout = timeout)))
+            while True:
+                self.workers.append(_Worker(self._new_connections.get_nowait()))
+        except queue.Empty:
+            pass
+
+
+    #=======================#
+    # Evaluation methods:   #
+    #=======================#
+
+
+    def evaluate(self, chromosome_list):
+        """Returns the fitness of each chromosome, evaluated by the
+        workers using the fitness function they were started with."""
+
+        gene_lists = [chromosome.gene_value_list for chromosome in chromosome_list]
+        fitness_list = [None] * len(gene_lists)
+
+        # Batches of (start, gene values), and the workers running them
+        batches = {
+            next(self._batch_ids) : (start, gene_lists[start : start + self.batch_size])
+            for start
+            in range(0, len(gene_lists), self.batch_size)
+        }
+        running = {batch_id : set() for batch_id in batches}
+        attempts = dict.fromkeys(batches, 0)
+        pending = deque(batches)
+
+        def lose(batch_id, error = None):
+            """Retries the batch if no other worker is running it."""
+
+            if batch_id not in running or running[batch_id]:
+                return
+
+            attempts[batch_id] += 1
+
+            if attempts[batch_id] > self.max_retries:
+                raise RuntimeError(f"Batch {batch_id} failed {attempts[batch_id]} times." + (f"\n{error}" if error else ""))
+
+            self.retries += 1
+            pending.appendleft(batch_id)
+
+        def drop(worker):
+            """Drops a lost worker, retrying its batch."""
+
+            self.workers.remove(worker)
+            self.lost_workers += 1
+            worker.connection.close()
+
+            if worker.batch_id in running:
+                running[worker.batch_id].discard(worker)
+                lose(worker.batch_id)
+
+        while len(running) > 0:
+
+            self._add_new_workers()
+
+            if len(self.workers) == 0:
+                self._add_new_workers(self.heartbeat_timeout)
+                if len(self.workers) == 0:
+                    raise RuntimeError(f"No workers connected to {self.address} within {self.heartbeat_timeout} seconds.")
+
+            # Give every idle worker a batch, stealing the oldest running batch once none are left
+            for worker in [worker for worker in self.workers if worker.batch_id is None]:
+
+                if len(pending) > 0:
+                    batch_id = pending.popleft()
+                elif self.work_stealing:
+                    batch_id = min(
+                        (batch_id for batch_id in running if len(running[batch_id]) == 1),
+                        key = lambda batch_id: next(iter(running[batch_id])).started,
+                        default = None,
+                    )
+                    if batch_id is None:
+                        break
+                    self.steals += 1
+                else:
+                    break
+
+                try:
+                    worker.connection.send(('batch', batch_id, batches[batch_id][1]))
+                except OSError:
+                    pending.appendleft(batch_id)
+                    drop(worker)
+                    continue
+
+                worker.batch_id = batch_id
+                worker.started = time.monotonic()
+                running[batch_id].add(worker)
+
+            # Handle the messages from the workers
+            connections = {worker.connection : worker for worker in self.workers}
+
+            for connection in wait(list(connections), timeout = min(1.0, self.heartbeat_timeout)):
+                worker = connections[connection]
+
+                try:
+                    kind, *message = connection.recv()
+                except (EOFError, OSError):
+                    drop(worker)
+                    continue
+
+                worker.last_seen = time.monotonic()
+
+                if kind == 'heartbeat':
+                    continue
+
+                batch_id, result = message
+                worker.batch_id = None
+
+                # Results of stolen or earlier batches may come late
+                if batch_id not in running:
+                    continue
+
+                running[batch_id].discard(worker)
+
+                if kind == 'result':
+                    start = batches[batch_id][0]
+                    fitness_list[start : start + len(result)] = result
+                    del running[batch_id]
+                else:
+                    lose(batch_id, result)
+
+            # Drop silent workers
+            now = time.monotonic()
+            for worker in [worker for worker in self.workers if now - worker.last_seen > self.heartbeat_timeout]:
+                drop(worker)
+
+        return fitness_list
+
+
+    def close(self):
+        """Stops the workers and stops listening."""
+
+        self._closed = True
+
+        # Wake up the accepting thread
+        try:
+            Client(self.address, authkey = self.authkey).close()
+        except (OSError, AuthenticationError):
+            pass
+
+        self._accept_thread.join(timeout = 1)
+        self.listener.close()
+        self._add_new_workers()
+
+        for worker in self.workers:
+            try:
+                worker.connection.send(('stop',))
+            except OSError:
+                pass
+            worker.connection.close()
+
+        self.workers = []
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __repr__(self):
+        return f"Coordinator(address = {self.address!r}, workers = {len(self.workers)})"
+
+
+class _Worker:
+    """Connection to a worker and the batch it is running."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.batch_id = None
+        self.started = None
+        self.last_seen = time.monotonic()
+
+
+def _check_authkey(authkey):
+    """Makes sure a secret authkey is given, since messages are pickled."""
+
+    if not isinstance(authkey, bytes) or len(authkey) == 0:
+        raise ValueError("A secret authkey of bytes is required, e.g. os.urandom(32).")
+
+
+def run_worker(address, fitness_function, *, authkey, make_chromosome = make_chromosome, heartbeat_interval = 1.0):
+    """Connects to the coordinator and evaluates batches of gene values
+    until the coordinator stops, using fitness_function(chromosome) on
+    chromosomes made by make_chromosome, e.g. ga.fitness_function_impl
+    and ga.make_chromosome. Sends heartbeats every heartbeat_interval
+    seconds, or never if it is None. Errors are sent to the coordinator."""
+
+    _check_authkey(authkey)
+    connection = Client(address, authkey = authkey)
+    lock = threading.Lock()
+    stopped = threading.Event()
+
+    def send(message):
+        with lock:
+            connection.send(message)
+
+    def heartbeat():
+        while not stopped.wait(heartbeat_interval):
+            try:
+                send(('heartbeat',))
+            except OSError:
+                return
+
+    if heartbeat_interval is not None:
+        threading.Thread(target = heartbeat, daemon = True).start()
+
+    try:
+        while True:
+            kind, *message = connection.recv()
+
+            if kind == 'stop':
+                break
+
+            batch_id, gene_lists = message
+
+            try:
+                result = [fitness_function(make_chromosome(gene_list)) for gene_list in gene_lists]
+            except Exception:
+                send(('error', batch_id, traceback.format_exc()))
+            else:
+                send(('result', batch_id, result))
+
+    except (EOFError, OSError):
+        pass
+
+    finally:
+        stopped.set()
+        connection.close()
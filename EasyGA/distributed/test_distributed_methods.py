@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+import time
+
+from EasyGA import GA, Distributed
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+
+def sum_of_squares(chromosome):
+    """Fitness function used by the workers."""
+    return sum(gene.value ** 2 for gene in chromosome)
+
+
+def slow_sum_of_squares(chromosome):
+    """Fitness function of a slow worker."""
+    time.sleep(0.05)
+    return sum_of_squares(chromosome)
+
+
+def hang(chromosome):
+    """Fitness function of a worker which never finishes."""
+    time.sleep(60)
+
+
+def start_worker(coordinator, fitness_function, heartbeat_interval = 0.1):
+    """Starts a worker process on localhost."""
+
+    worker = multiprocessing.Process(
+        target = Distributed.run_worker,
+        args = (coordinator.address, fitness_function),
+        kwargs = {'authkey' : coordinator.authkey, 'heartbeat_interval' : heartbeat_interval},
+        daemon = True,
+    )
+    worker.start()
+    return worker
+
+
+def test_distributed_evolve():
+    """A ga should evolve using workers on localhost."""
+
+    with Distributed.Coordinator(authkey = os.urandom(16), batch_size = 4) as coordinator:
+        workers = [start_worker(coordinator, sum_of_squares) for _ in range(2)]
+
+        ga = GA(seed = 1, generation_goal = 5, save_data = False, target_fitness_type = 'min')
+        ga.gene_impl = lambda: ga.rng.randint(-10, 10)
+        ga.coordinator = coordinator
+        ga.evolve()
+
+        assert all(chromosome.fitness == sum_of_squares(chromosome) for chromosome in ga.population)
+        assert ga.population_size <= ga.evaluation_count <= 5 * ga.population_size
+
+    for worker in workers:
+        worker.join(timeout = 5)
+        assert not worker.is_alive()
+
+
+def test_lost_batches_are_retried():
+    """Batches of a silent worker should be retried by the other workers."""
+
+    with Distributed.Coordinator(authkey = os.urandom(16), batch_size = 2, heartbeat_timeout = 0.5, work_stealing = False) as coordinator:
+        hung_worker = start_worker(coordinator, hang, heartbeat_interval = None)
+        coordinator._add_new_workers(timeout = 5)
+        start_worker(coordinator, sum_of_squares)
+
+        chromosome_list = [GA().make_chromosome([i, i]) for i in range(10)]
+        assert coordinator.evaluate(chromosome_list) == [2*i*i for i in range(10)]
+        assert coordinator.lost_workers == 1
+        assert coordinator.retries >= 1
+
+    hung_worker.terminate()
+
+
+def test_work_stealing():
+    """Fast workers should steal the batches of slow workers."""
+
+    with Distributed.Coordinator(authkey = os.urandom(16), batch_size = 10) as coordinator:
+        start_worker(coordinator, slow_sum_of_squares)
+        coordinator._add_new_workers(timeout = 5)
+        start_worker(coordinator, sum_of_squares)
+        time.sleep(0.5)
+
+        # The slow worker takes 0.5 seconds per batch
+        chromosome_list = [GA().make_chromosome([i]) for i in range(20)]
+        assert coordinator.evaluate(chromosome_list) == [i*i for i in range(20)]
+        assert coordinator.steals >= 1
+
+
+def test_authkey_required():
+    """A secret authkey must be given since messages are pickled."""
+
+    for authkey in (None, b''):
+        try:
+            Distributed.Coordinator(authkey = authkey)
+        except ValueError:
+            pass
+        else:
+            assert False, "Coordinator accepted a missing authkey"
@@ -0,0 +1,29 @@
+# Import all duplicate decorators
+from decorators import _replace_duplicates
+
+
+@_replace_duplicates
+def mutate(ga, chromosome):
+    """Mutates a copy of each duplicate using ga.mutation_individual_impl."""
+
+    chromosome = ga.make_chromosome(chromosome)
+    ga.mutation_individual_impl(chromosome)
+    chromosome.fitness = None
+    return chromosome
+
+
+@_replace_duplicates
+def replace(ga, chromosome):
+    """Replaces each duplicate with a completely new chromosome."""
+
+    # Using the chromosome_impl
+    if ga.chromosome_impl is not None:
+        return ga.make_chromosome(ga.chromosome_impl())
+
+    # Using the gene_impl
+    elif ga.gene_impl is not None:
+        return ga.make_chromosome([ga.gene_impl() for _ in range(len(chromosome))])
+
+    # Exit because no gene creation method specified
+    else:
+        raise Exception("Did not specify any initialization constraints.")
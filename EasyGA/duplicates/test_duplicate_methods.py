@@ -0,0 +1,38 @@
+from EasyGA import GA, Duplicates
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_duplicate_elimination():
+    """The next population should contain no duplicates before it is evaluated."""
+
+    for duplicate_elimination_impl in (Duplicates.mutate, Duplicates.replace):
+
+        ga = GA()
+        ga.save_data = False
+        ga.chromosome_length = 20
+        ga.evolve(1)
+
+        best = ga.population[0]
+        ga.population.next_population = [best] * len(ga.population)
+        ga.duplicate_elimination_impl = duplicate_elimination_impl
+        ga.duplicate_elimination_impl()
+
+        keys = [chromosome.key for chromosome in ga.population.next_population]
+        assert len(set(keys)) == len(keys)
+        assert ga.population.next_population[0] is best
+        assert best.key == ga.population[0].key
+
+
+def test_duplicate_elimination_evolve():
+    """Evolving with duplicate elimination should keep the population free of clones."""
+
+    ga = GA()
+    ga.save_data = False
+    ga.chromosome_length = 20
+    ga.generation_goal = 20
+    ga.mutation_population_impl = lambda ga: None
+    ga.duplicate_elimination_impl = Duplicates.mutate
+    ga.evolve()
+
+    assert len(set(chromosome.key for chromosome in ga.population)) == len(ga.population)
@@ -0,0 +1,413 @@
+import multiprocessing
+import os
+import traceback
+import weakref
+from multiprocessing.connection import wait
+
+import numpy as np
+
+from structure import Array_Chromosome
+
+# Import all engine decorators
+from decorators import _differential_evolution
+
+
+class Differential:
+    """Differential evolution for real-valued genes. Each generation every
+    chromosome is challenged by a trial vector made by adding the weighted
+    difference of two random chromosomes to a base vector and crossing it
+    with the chromosome, using ga.differential_weight and
+    ga.differential_crossover_rate."""
+
+    @_differential_evolution
+    def rand_1_bin(ga, matrix, index):
+        """Uses random chromosomes as the base vectors. (DE/rand/1/bin)"""
+        return matrix[index]
+
+
+    @_differential_evolution
+    def best_1_bin(ga, matrix, index):
+        """Uses the best chromosome as the base vector. (DE/best/1/bin)"""
+        return matrix[[0]]
+
+
+class Distribution:
+    """Methods which evolve a search distribution, replacing the population with samples from it."""
+
+    def cma_es(ga):
+        """Covariance matrix adaptation evolution strategy, (mu/mu_w, lambda)-CMA-ES
+        with lambda = population size and mu = lambda/2. Updates the distribution
+        using the best half of the sorted population, then replaces the population
+        with new samples. The initial step size is ga.cma_sigma, or the average
+        standard deviation of the genes if it is None. The state is kept in
+        ga.engine_state."""
+
+        if ga.multi_objective:
+            raise ValueError("CMA-ES requires a single objective.")
+
+        matrix = np.array([chromosome.gene_value_list for chromosome in ga.population], dtype = float)
+
+        # Start a new distribution, otherwise learn from the sorted samples
+        if not isinstance(ga.engine_state, CMA_ES_State) or ga.engine_state.dimension != matrix.shape[1]:
+            ga.engine_state = CMA_ES_State(matrix, ga.cma_sigma)
+        else:
+            ga.engine_state.tell(matrix)
+
+        # Replace the population with new samples
+        ga.population[:] = ga.engine_state.ask(len(ga.population), ga.rng.generator).tolist()
+
+
+class CMA_ES_State:
+    """State of the CMA-ES search distribution, following the
+    parameter choices of Hansen's "The CMA Evolution Strategy: A Tutorial"."""
+
+
+    def __init__(self, matrix, sigma = None):
+        """Initializes the distribution around the weighted mean
+        of the best half of the sorted gene matrix."""
+
+        size, self.dimension = matrix.shape
+        n = self.dimension
+
+        # Selection weights
+        self.mu = max(1, size // 2)
+        weights = np.log(self.mu + 1/2) - np.log(np.arange(1, self.mu+1))
+        self.weights = weights / weights.sum()
+        self.mu_eff = 1 / (self.weights ** 2).sum()
+
+        # Step size control
+        self.c_sigma = (self.mu_eff + 2) / (n + self.mu_eff + 5)
+        self.d_sigma = 1 + 2 * max(0, np.sqrt((self.mu_eff-1) / (n+1)) - 1) + self.c_sigma
+
+        # Covariance matrix adaptation
+        self.c_c = (4 + self.mu_eff/n) / (n + 4 + 2*self.mu_eff/n)
+        self.c_1 = 2 / ((n + 1.3) ** 2 + self.mu_eff)
+        self.c_mu = min(1 - self.c_1, 2 * (self.mu_eff - 2 + 1/self.mu_eff) / ((n+2) ** 2 + self.mu_eff))
+
+        # Expected length of a standard normal vector
+        self.chi_n = np.sqrt(n) * (1 - 1/(4*n) + 1/(21*n*n))
+
+        # Distribution
+        self.mean = self.weights @ matrix[:self.mu]
+        if sigma is None:
+            sigma = float(matrix.std(axis = 0).mean()) or 1.0
+        self.sigma = sigma
+        self.C = np.eye(n)
+        self.B = np.eye(n)
+        self.D = np.ones(n)
+        self.p_sigma = np.zeros(n)
+        self.p_c = np.zeros(n)
+        self.generation = 0
+
+
+    def ask(self, amount, rng = None):
+        """Returns the given amount of samples from the distribution,
+        using the numpy Generator rng, e.g. ga.rng.generator, if given."""
+
+        if rng is None:
+            rng = np.random.default_rng()
+
+        z = rng.standard_normal((amount, self.dimension))
+        return self.mean + self.sigma * (z * self.D) @ self.B.T
+
+
+    def tell(self, matrix):
+        """Updates the distribution using the samples,
+        which must be sorted from best to worst."""
+
+        n = self.dimension
+        self.generation += 1
+
+        # Weighted recombination of the best steps
+        y = (matrix[:self.mu] - self.mean) / self.sigma
+        y_w = self.weights @ y
+        self.mean = self.mean + self.sigma * y_w
+
+        # Step size path, using C^(-1/2) = B D^-1 B^T
+        C_inverse_root = (self.B / self.D) @ self.B.T
+        self.p_sigma = (1 - self.c_sigma) * self.p_sigma \
+            + np.sqrt(self.c_sigma * (2 - self.c_sigma) * self.mu_eff) * C_inverse_root @ y_w
+
+        # Stall the covariance path if the step size path is too long
+        p_sigma_norm = np.linalg.norm(self.p_sigma)
+        h_sigma = p_sigma_norm / np.sqrt(1 - (1 - self.c_sigma) ** (2 * self.generation)) \
+            < (1.4 + 2/(n+1)) * self.chi_n
+
+        self.p_c = (1 - self.c_c) * self.p_c \
+            + h_sigma * np.sqrt(self.c_c * (2 - self.c_c) * self.mu_eff) * y_w
+
+        # Rank one and rank mu updates
+        self.C = (1 - self.c_1 - self.c_mu) * self.C \
+            + self.c_1 * (np.outer(self.p_c, self.p_c) + (1 - h_sigma) * self.c_c * (2 - self.c_c) * self.C) \
+            + self.c_mu * (y.T * self.weights) @ y
+
+        # Step size
+        self.sigma *= np.exp(self.c_sigma / self.d_sigma * (p_sigma_norm / self.chi_n - 1))
+
+        # Keep C symmetric and decompose it into B D^2 B^T
+        self.C = (self.C + self.C.T) / 2
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+
+class Parallel:
+    """Methods which make the next generation in several worker processes."""
+
+    def float_shared_memory(ga):
+        """Makes the next generation of float genes in ga.engine_processes worker
+        processes. The gene values of the population and the next population are
+        kept in two matrices in shared memory, and the chromosomes are
+        Array_Chromosome views of their rows, so the workers never pickle
+        chromosomes. Every worker makes its own block of children using its own
+        random stream, spawned from ga.rng, with binary tournaments on the ranks
+        of the chromosomes, blend crossover, and gaussian mutation scaled by the
+        standard deviation of each gene, using ga.chromosome_mutation_rate and
+        ga.gene_mutation_rate. The ga's parent selection, crossover and mutation
+        methods are not used, and genes which aren't floats, e.g. of bit or
+        permutation chromosomes, are rejected. The best chromosome is kept. The
+        state is kept in ga.engine_state, and ga.engine_state.close() stops the
+        workers. Requires Python 3.8."""
+
+        # Start the workers, copying the population into shared memory
+        if not isinstance(ga.engine_state, Shared_Memory_State) or not ga.engine_state.holds(ga.population):
+            if isinstance(ga.engine_state, Shared_Memory_State):
+                ga.engine_state.close()
+            ga.engine_state = Shared_Memory_State(ga, ga.engine_processes)
+
+        ga.engine_state.next_generation(ga)
+
+
+class Shared_Memory_State:
+    """Shared memory and worker processes of Engine.Parallel.float_shared_memory."""
+
+    def __init__(self, ga, processes = None):
+        """Copies the sorted population into shared memory, replaces it with views
+        of the rows, and starts the workers. No processes are started if processes
+        is 0, in which case the children are made in this process."""
+
+        # Shared memory is new in Python 3.8
+        from multiprocessing import shared_memory
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+
+        size, length = len(ga.population), len(ga.population[0])
+
+        if size < 2:
+            raise ValueError("The shared memory engine requires a population of at least 2 chromosomes.")
+
+        # Other genes would silently become floats
+        if not all(isinstance(value, (float, np.floating)) for chromosome in ga.population for value in chromosome.gene_value_iter):
+            raise ValueError("The float shared memory engine requires float genes, and uses its own "
+                             "selection, crossover and mutation instead of the ga's methods.")
+
+        # Name, shape and dtype of each shared array
+        specs = [(size, length), (size, length), (size,), (length,)]
+        dtypes = [np.float64, np.float64, np.int64, np.float64]
+        self.memory = [
+            shared_memory.SharedMemory(create = True, size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+            for shape, dtype
+            in zip(specs, dtypes)
+        ]
+        self.layout = [
+            (memory.name, shape, np.dtype(dtype).str)
+            for memory, shape, dtype
+            in zip(self.memory, specs, dtypes)
+        ]
+        *self.buffers, self.ranks, self.scale = _attach(self.memory, self.layout)
+
+        # Chromosomes viewing each row of both buffers
+        self.views = [[], []]
+        for buffer, views in zip(self.buffers, self.views):
+            for row in range(size):
+                view = Array_Chromosome.from_array(buffer[row])
+                view.row = row
+                views.append(view)
+
+        self.buffers[0][:] = [chromosome.gene_value_list for chromosome in ga.population]
+        for view, chromosome in zip(self.views[0], ga.population):
+            view.fitness = chromosome.fitness
+        ga.population[:] = self.views[0]
+        self.current = 0
+
+        # Split the children, every row but the first, into one block per worker
+        self.bounds = np.linspace(1, size, max(1, processes) + 1).astype(int).tolist()
+        self.streams = ga.rng.spawn(max(1, processes))
+        self.connections = []
+        self.workers = []
+
+        context = multiprocessing.get_context()
+        for stream in self.streams[:processes]:
+            connection, worker_connection = context.Pipe()
+            worker = context.Process(
+                target = _shared_memory_worker,
+                args = (self.layout, stream.seed_sequence, worker_connection),
+                daemon = True,
+            )
+            worker.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.workers.append(worker)
+
+        # Stop the workers and free the memory when the state is garbage collected
+        self._finalizer = weakref.finalize(self, _release, self.connections, self.workers, self.memory, self.views)
+
+
+    def holds(self, population):
+        """Checks if the population is made of the views of the current buffer."""
+
+        views = self.views[self.current]
+
+        return self._finalizer.alive and len(population) == len(views) and all(
+            getattr(chromosome, 'row', None) is not None and views[chromosome.row] is chromosome
+            for chromosome
+            in population
+        )
+
+
+    def next_generation(self, ga):
+        """Makes the next population in the other buffer and replaces the population with it."""
+
+        population, children = self.buffers[self.current], self.buffers[1-self.current]
+        views = self.views[1-self.current]
+
+        # Share the ranks and scale of the sorted population
+        rows = np.fromiter((chromosome.row for chromosome in ga.population), dtype = np.int64, count = len(ga.population))
+        self.ranks[rows] = np.arange(len(rows))
+        self.scale[:] = population.std(axis = 0)
+
+        # Keep the best chromosome
+        children[0] = population[rows[0]]
+        views[0].fitness = ga.population[0].fitness
+        views[0]._modified()
+
+        # Make the children in blocks
+        rates = (ga.chromosome_mutation_rate, ga.gene_mutation_rate)
+        blocks = list(zip(self.bounds[:-1], self.bounds[1:]))
+
+        for connection, (start, end) in zip(self.connections, blocks):
+            connection.send((self.current, start, end, rates))
+
+        for stream, (start, end) in zip(self.streams[len(self.connections):], blocks[len(self.connections):]):
+            _make_children(population, children, self.ranks, self.scale, start, end, rates, stream.generator)
+
+        for connection in self.connections:
+            error = connection.recv()
+            if error is not None:
+                raise RuntimeError(f"A shared memory worker failed:\n{error}")
+
+        for view in views[1:]:
+            view.fitness = None
+            view._modified()
+            ga.statistics.changed(view)
+
+        self.current = 1 - self.current
+        ga.population[:] = views
+
+
+    def close(self):
+        """Stops the workers and frees the shared memory. The
+        chromosomes are copied out of the shared memory first."""
+
+        self._finalizer()
+        self.buffers = self.ranks = self.scale = None
+
+
+def _attach(memory_list, layout):
+    """Returns the arrays in the shared memory."""
+
+    return [
+        np.ndarray(shape, dtype = dtype, buffer = memory.buf)
+        for memory, (_, shape, dtype)
+        in zip(memory_list, layout)
+    ]
+
+
+def _make_children(population, children, ranks, scale, start, end, rates, rng, block_size = 4096):
+    """Makes the children from start to end, a few thousand at a time to stay in the cache."""
+
+    size, length = population.shape
+    chromosome_mutation_rate, gene_mutation_rate = rates
+
+    for block_start in range(start, end, block_size):
+        amount = min(block_size, end - block_start)
+
+        # Binary tournaments on the ranks, with 0 as the best
+        candidates = rng.integers(size, size = (2, amount, 2))
+        parents = np.where(ranks[candidates[0]] < ranks[candidates[1]], candidates[0], candidates[1])
+
+        # Blend crossover, BLX-0.5, which can reach past the parents
+        parent_1, parent_2 = population[parents[:, 0]], population[parents[:, 1]]
+        block = parent_1 + rng.uniform(-0.5, 1.5, (amount, length)) * (parent_2 - parent_1)
+
+        # Gaussian mutation
+        mutated = (rng.random((amount, length)) < gene_mutation_rate) & (rng.random((amount, 1)) < chromosome_mutation_rate)
+        block += mutated * rng.standard_normal((amount, length)) * scale
+
+        children[block_start : block_start + amount] = block
+
+
+def _shared_memory_worker(layout, seed_sequence, connection):
+    """Makes blocks of children until it receives None,
+    replying with None or the traceback of an error."""
+
+    from multiprocessing import shared_memory
+
+    memory_list = [shared_memory.SharedMemory(name) for name, _, _ in layout]
+    *buffers, ranks, scale = _attach(memory_list, layout)
+    rng = np.random.Generator(np.random.PCG64(seed_sequence))
+
+    # Stop if the main process dies without closing the connection,
+    # which may also be held open by the other workers
+    parent = multiprocessing.parent_process()
+
+    try:
+        while True:
+
+            if wait([connection, parent.sentinel]) == [parent.sentinel]:
+                break
+
+            task = connection.recv()
+
+            if task is None:
+                break
+
+            current, start, end, rates = task
+            try:
+                _make_children(buffers[current], buffers[1-current], ranks, scale, start, end, rates, rng)
+                connection.send(None)
+            except Exception:
+                connection.send(traceback.format_exc())
+    except EOFError:
+        pass
+    finally:
+        del buffers, ranks, scale
+        for memory in memory_list:
+            memory.close()
+
+
+def _release(connections, workers, memory_list, views_list):
+    """Stops the workers, copies the chromosomes out of the shared memory, and frees it."""
+
+    for connection in connections:
+        try:
+            connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+
+    for worker in workers:
+        worker.join(timeout = 5)
+        if worker.is_alive():
+            worker.terminate()
+
+    for connection in connections:
+        connection.close()
+
+    # The chromosomes may outlive the memory
+    for views in views_list:
+        for view in views:
+            view.values = view.values.copy()
+
+    for memory in memory_list:
+        memory.close()
+        memory.unlink()
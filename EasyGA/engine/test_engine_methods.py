@@ -0,0 +1,93 @@
+import random
+
+import numpy as np
+
+from EasyGA import GA, Engine
+from examples import Fitness
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def make_near_5_ga(engine_impl):
+    """Creates a ga minimizing the squared distance of every gene from 5."""
+
+    ga = GA()
+    ga.population_size = 20
+    ga.generation_goal = 150
+    ga.gene_impl = lambda: random.uniform(-10, 10)
+    ga.fitness_function_impl = Fitness.near_5
+    ga.target_fitness_type = 'min'
+    ga.engine_impl = engine_impl
+    return ga
+
+
+def test_differential_evolution():
+    """Both DE strategies should approach the optimum and never lose the best chromosome."""
+
+    for engine_impl in (Engine.Differential.rand_1_bin, Engine.Differential.best_1_bin):
+
+        ga = make_near_5_ga(engine_impl)
+        ga.evolve(1)
+        initial_best = ga.population[0].fitness
+        ga.evolve()
+
+        assert ga.population[0].fitness <= initial_best
+        assert ga.population[0].fitness < 5
+
+
+def test_cma_es():
+    """CMA-ES should converge on the optimum."""
+
+    ga = make_near_5_ga(Engine.Distribution.cma_es)
+    ga.evolve()
+
+    assert ga.population[0].fitness < 1e-6
+    assert ga.engine_state.sigma < 1
+
+
+def run_shared_memory_ga(processes):
+    """Returns a seeded ga evolved by the shared memory engine."""
+
+    ga = make_near_5_ga(Engine.Parallel.float_shared_memory)
+    ga.seed = 3
+    ga.gene_impl = lambda: ga.rng.uniform(-10, 10)
+    ga.save_data = False
+    ga.population_size = 100
+    ga.generation_goal = 60
+    ga.engine_processes = processes
+    ga.evolve()
+    return ga
+
+
+def test_shared_memory_engine():
+    """Workers should improve the population in shared memory,
+    and seeded runs should be repeatable."""
+
+    ga = run_shared_memory_ga(2)
+    state = ga.engine_state
+
+    assert ga.population[0].fitness < 1
+    assert len(state.workers) == 2
+    assert state.holds(ga.population)
+    assert np.shares_memory(ga.population[0].values, state.buffers[state.current])
+
+    # Every worker has its own stream, so timing doesn't matter
+    other_ga = run_shared_memory_ga(2)
+    other_ga.engine_state.close()
+    assert [chromosome.gene_value_list for chromosome in other_ga.population] == \
+        [chromosome.gene_value_list for chromosome in ga.population]
+
+    # Making the children in this process
+    assert run_shared_memory_ga(0).population[0].fitness < 1
+
+    state.close()
+    assert not any(worker.is_alive() for worker in state.workers)
+
+    # Integer genes aren't floats
+    ga = GA(save_data = False, engine_processes = 0)
+    ga.engine_impl = Engine.Parallel.float_shared_memory
+    try:
+        ga.evolve(2)
+        assert False
+    except ValueError:
+        pass
@@ -44,3 +44,13 @@ def index_dependent_values(self, chromosome):
             fitness += 1
 
     return fitness
+
+
+def one_max(self, chromosome):
+    """Counts the genes equal to 1, using popcount for bit chromosomes."""
+
+    # Count the packed bits directly
+    if hasattr(chromosome, 'popcount'):
+        return chromosome.popcount()
+
+    return sum(1 for gene in chromosome if gene.value == 1)
@@ -0,0 +1,78 @@
+from math import ceil
+
+# Import all local search decorators
+from decorators import _check_local_search_rate, _search_chromosomes, _accept_improving_moves
+
+
+class Population:
+    """Methods for selecting chromosomes to improve by local search.
+    ceil(ga.local_search_rate * population size) chromosomes are selected."""
+
+    @_check_local_search_rate
+    @_search_chromosomes
+    def best(ga):
+        """Selects the best chromosomes."""
+
+        amount = ceil(ga.local_search_rate*len(ga.population))
+        return [ga.population.writable(index) for index in range(amount)]
+
+
+    @_check_local_search_rate
+    @_search_chromosomes
+    def random_selection(ga):
+        """Selects random chromosomes."""
+
+        amount = ceil(ga.local_search_rate*len(ga.population))
+        return [ga.population.writable(index) for index in ga.rng.sample(range(len(ga.population)), amount)]
+
+
+class Individual:
+    """Methods for improving a single chromosome, by making ga.local_search_budget
+    random moves and keeping only the moves which improve the fitness. Moves
+    are drawn from the given rng, which is ga.rng unless an executor is used.
+    Methods marked as serial are run one chromosome at a time even with an
+    executor, see _search_chromosomes."""
+
+    @_accept_improving_moves
+    def hill_climbing(ga, chromosome, rng):
+        """Changes a random gene into a completely new gene. The new genes
+        come from ga.chromosome_impl or ga.gene_impl, which may draw from
+        ga.rng, so chromosomes are climbed serially even with an executor."""
+
+        index = rng.randrange(len(chromosome))
+        old_value = chromosome[index].value
+
+        # Using the chromosome_impl
+        if ga.chromosome_impl is not None:
+            chromosome[index] = ga.make_gene(ga.chromosome_impl()[index])
+
+        # Using the gene_impl
+        elif ga.gene_impl is not None:
+            chromosome[index] = ga.make_gene(ga.gene_impl())
+
+        # Exit because no gene creation method specified
+        else:
+            raise Exception("Did not specify any initialization constraints.")
+
+        return [index], [old_value]
+
+    # ga.rng can't be shared between the executor's threads
+    hill_climbing.serial = True
+
+
+    @_accept_improving_moves
+    def two_opt(ga, chromosome, rng):
+        """Reverses a random segment of the chromosome, which
+        replaces two edges of a tour by two other edges."""
+
+        # Chromosome too short to reverse
+        if len(chromosome) < 2:
+            return [], []
+
+        index_one, index_two = sorted(rng.sample(range(len(chromosome)), 2))
+        changed_indexes = list(range(index_one, index_two+1))
+        old_values = [chromosome[index].value for index in changed_indexes]
+
+        chromosome[index_one:index_two+1] = reversed(chromosome[index_one:index_two+1])
+
+        return changed_indexes, old_values
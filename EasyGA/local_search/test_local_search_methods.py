@@ -0,0 +1,132 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from EasyGA import GA, Local_Search
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def tour_length(chromosome):
+    """Length of a tour visiting the points 0, ..., n-1 on a line in the given order."""
+
+    values = chromosome.gene_value_list
+    return sum(
+        abs(values[i] - values[i-1])
+        for i
+        in range(len(values))
+    )
+
+
+def delta_tour_length(ga, chromosome, changed_indexes, old_values):
+    """Updates the tour length using only the edges around the changed genes."""
+
+    values = chromosome.gene_value_list
+    old = dict(zip(changed_indexes, old_values))
+    edges = {(i-1) % len(values) for i in changed_indexes} | set(changed_indexes)
+
+    difference = 0
+    for i in edges:
+        j = (i+1) % len(values)
+        difference += abs(values[j] - values[i])
+        difference -= abs(old.get(j, values[j]) - old.get(i, values[i]))
+
+    return chromosome.fitness + difference
+
+
+def make_tour_ga():
+    ga = GA()
+    ga.chromosome_length = 12
+    ga.population_size = 10
+    ga.generation_goal = 5
+    ga.save_data = False
+    ga.chromosome_impl = lambda: random.sample(range(ga.chromosome_length), ga.chromosome_length)
+    ga.fitness_function_impl = tour_length
+    ga.target_fitness_type = 'min'
+    ga.permutation_chromosomes()
+    ga.local_search_population_impl = Local_Search.Population.best
+    ga.local_search_individual_impl = Local_Search.Individual.two_opt
+    return ga
+
+
+def test_hill_climbing():
+    """Hill climbing should never make a chromosome worse."""
+
+    ga = GA()
+    ga.save_data = False
+    ga.evolve(1)
+
+    chromosome = ga.population[-1]
+    fitness = chromosome.fitness
+    ga.local_search_budget = 50
+    evaluations = ga.local_search_individual_impl(chromosome)
+
+    assert evaluations == 50
+    assert chromosome.fitness >= fitness
+    assert chromosome.fitness == ga.fitness_function_impl(chromosome)
+
+
+def test_two_opt_delta_fitness():
+    """Delta fitness should give the same tours as full re-evaluation."""
+
+    ga = make_tour_ga()
+    ga.delta_fitness_impl = delta_tour_length
+    ga.local_search_rate = 1
+    ga.local_search_budget = 200
+    ga.profiler.enabled = True
+    ga.evolve(2)
+
+    for chromosome in ga.population:
+        assert sorted(chromosome.gene_value_list) == list(range(ga.chromosome_length))
+        assert chromosome.fitness == tour_length(chromosome)
+
+    assert ga.population[0].fitness < 2*ga.chromosome_length
+    assert ga.profiler.calls['local_search'] == 1
+
+
+def test_local_search_executor():
+    """Local search and evaluation should give consistent results with a worker pool."""
+
+    ga = make_tour_ga()
+    ga.local_search_population_impl = Local_Search.Population.random_selection
+
+    with ThreadPoolExecutor(max_workers = 4) as executor:
+        ga.executor = executor
+        ga.evolve()
+
+    for chromosome in ga.population:
+        assert chromosome.fitness == tour_length(chromosome)
+
+
+def test_local_search_executor_reproducible():
+    """Seeded runs should match with a worker pool, whichever order the moves run in."""
+
+    def run():
+        ga = make_tour_ga()
+        ga.seed = 7
+        ga.chromosome_impl = lambda: ga.rng.sample(range(ga.chromosome_length), ga.chromosome_length)
+        ga.local_search_population_impl = Local_Search.Population.random_selection
+
+        with ThreadPoolExecutor(max_workers = 4) as executor:
+            ga.executor = executor
+            ga.evolve()
+
+        return [chromosome.gene_value_list for chromosome in ga.population]
+
+    assert run() == run()
+
+
+def test_hill_climbing_executor_reproducible():
+    """Hill climbing draws new genes from ga.rng, so it should run serially with a worker pool."""
+
+    def run():
+        ga = GA(seed = 7, population_size = 10, generation_goal = 5, save_data = False)
+        ga.local_search_population_impl = Local_Search.Population.best
+        ga.local_search_rate = 1
+
+        with ThreadPoolExecutor(max_workers = 4) as executor:
+            ga.executor = executor
+            ga.evolve()
+
+        return [chromosome.gene_value_list for chromosome in ga.population]
+
+    assert run() == run()
@@ -0,0 +1,184 @@
+import numpy as np
+
+
+def gene_matrix(chromosome_list):
+    """Returns the gene values of the chromosomes as a 2D numpy array,
+    with one row per chromosome. Numeric genes give a numeric array,
+    anything else gives an array of python objects."""
+
+    values = [chromosome.gene_value_list for chromosome in chromosome_list]
+
+    if len(set(map(len, values))) > 1:
+        raise ValueError("Diversity metrics require chromosomes of equal length.")
+
+    try:
+        matrix = np.array(values)
+        if matrix.dtype.kind in 'biuf' and matrix.ndim == 2:
+            return matrix
+    except ValueError:
+        pass
+
+    # Strings, mixed types, nested values, etc.
+    matrix = np.empty((len(values), len(values[0]) if values else 0), dtype = object)
+    matrix[:] = values
+    return matrix
+
+
+def column_counts(column):
+    """Returns the number of occurrences of each distinct value in the column."""
+
+    try:
+        return np.unique(column, return_counts = True)[1]
+
+    # Values which can't be sorted
+    except TypeError:
+        counts = {}
+        for value in column:
+            counts[value] = counts.get(value, 0) + 1
+        return np.array(list(counts.values()))
+
+
+def bin_columns(matrix, bins):
+    """Digitizes each column into equal width bins between its min and max."""
+
+    low  = matrix.min(axis = 0)
+    high = matrix.max(axis = 0)
+    width = np.where(high > low, (high - low) / bins, 1)
+    return np.minimum(((matrix - low) / width).astype(int), bins-1)
+
+
+def sample_pairs(size, amount, rng):
+    """Returns two index arrays of random pairs of distinct rows."""
+
+    first  = rng.integers(size, size = amount)
+    second = rng.integers(size-1, size = amount)
+    second += (second >= first)
+    return first, second
+
+
+def pair_distances(matrix, first, second, metric):
+    """Returns the distances between the paired rows."""
+
+    if metric == 'hamming':
+        return (matrix[first] != matrix[second]).sum(axis = 1)
+    elif metric == 'euclidean':
+        difference = matrix[first].astype(float) - matrix[second].astype(float)
+        return np.sqrt((difference * difference).sum(axis = 1))
+    else:
+        raise ValueError(f"Unknown diversity metric {metric}, use 'hamming' or 'euclidean'.")
+
+
+def euclidean_distance_sum(matrix, block_size = 256):
+    """Returns the sum of the Euclidean distances over all pairs of distinct
+    rows, using |a-b|^2 = |a|^2 + |b|^2 - 2 a.b on blocks of rows so
+    that only block_size * rows distances are held at once."""
+
+    matrix = np.asarray(matrix, dtype = float)
+    norms = (matrix * matrix).sum(axis = 1)
+    total = 0.0
+
+    for start in range(0, len(matrix), block_size):
+        block = matrix[start : start + block_size]
+        squared = norms[start : start + block_size, None] + norms[None, :] - 2 * (block @ matrix.T)
+
+        # Only pairs with the second row after the first, k = start+1 in block coordinates
+        total += np.sqrt(np.triu(np.maximum(squared, 0), start + 1)).sum()
+
+    return total
+
+
+def mean_pairwise_distance(
+        matrix,
+        metric = 'hamming',
+        max_rows = 1000,
+        max_error = 0.05,
+        rng = None,
+        return_error = False,
+    ):
+    """Returns the mean distance over all pairs of distinct rows.
+
+    The Hamming distance is computed exactly from the value counts of each
+    locus in O(rows * loci). The Euclidean distance is computed exactly
+    for at most max_rows rows, otherwise it is estimated from random pairs,
+    doubling the sample until the 95% confidence interval is within
+    max_error relative to the estimate. If return_error is True, the
+    estimate and its error are returned.
+    """
+
+    size = len(matrix)
+
+    if size < 2:
+        return (0.0, 0.0) if return_error else 0.0
+
+    # Differing pairs at a locus = (size^2 - sum of squared counts) / 2
+    if metric == 'hamming':
+        differing = sum(
+            size*size - (column_counts(matrix[:, locus]).astype(float)**2).sum()
+            for locus
+            in range(matrix.shape[1])
+        )
+        mean = differing / (size * (size-1))
+        return (mean, 0.0) if return_error else mean
+
+    # Exact mean over every pair for small matrices
+    if size <= max_rows:
+        mean = euclidean_distance_sum(matrix) / (size * (size-1) / 2)
+        return (mean, 0.0) if return_error else mean
+
+    # Estimate from random pairs
+    if rng is None:
+        rng = np.random.default_rng()
+
+    amount = max_rows
+    distances = np.empty(0)
+
+    while True:
+        first, second = sample_pairs(size, amount - len(distances), rng)
+        distances = np.concatenate((distances, pair_distances(matrix, first, second, metric)))
+
+        mean  = distances.mean()
+        error = 1.96 * distances.std() / np.sqrt(len(distances))
+
+        # Within the error bound, or the sample is as large as the number of pairs
+        if error <= max_error * mean or amount >= size * (size-1) // 2:
+            break
+
+        amount *= 2
+
+    return (mean, error) if return_error else mean
+
+
+def locus_entropy(matrix, bins = None):
+    """Returns the Shannon entropy, in bits, of the values at each locus.
+    Float genes are grouped into 10 equal width bins by default."""
+
+    if bins is None and matrix.dtype.kind == 'f':
+        bins = 10
+
+    if bins is not None:
+        matrix = bin_columns(matrix, bins)
+
+    size = len(matrix)
+    entropy = np.empty(matrix.shape[1])
+
+    for locus in range(matrix.shape[1]):
+        p = column_counts(matrix[:, locus]) / size
+        entropy[locus] = -(p * np.log2(p)).sum()
+
+    return entropy
+
+
+def unique_ratio(matrix):
+    """Returns the fraction of rows which are distinct genotypes."""
+
+    if len(matrix) == 0:
+        return 0.0
+
+    try:
+        unique = len(np.unique(matrix, axis = 0))
+
+    # Objects can't be compared row by row by numpy
+    except TypeError:
+        unique = len(set(map(tuple, matrix)))
+
+    return unique / len(matrix)
@@ -0,0 +1,188 @@
+import heapq
+
+import numpy as np
+
+
+class KD_Tree:
+    """Static k-d tree over the rows of a 2D array, for euclidean nearest
+    neighbor queries in roughly O(log n) time per query point instead of
+    comparing against every row. Leaves hold up to leaf_size rows which
+    are compared using numpy.
+
+        tree = KD_Tree(points)
+        distances, indexes = tree.query(query_points, k = 5)
+        neighbors = tree.query_radius(query_points, radius = 0.5)
+    """
+
+    def __init__(self, points, leaf_size = 16):
+
+        self.points = np.asarray(points, dtype = float).reshape(len(points), -1)
+        self.leaf_size = leaf_size
+
+        # Rows are reordered so that each node covers order[start:end]
+        self.order = np.arange(len(self.points))
+
+        # Node arrays, where axis is -1 for leaves
+        self.start = []
+        self.end   = []
+        self.axis  = []
+        self.split = []
+        self.left  = []
+        self.right = []
+
+        if len(self.points) > 0:
+            self._build()
+
+
+    def __len__(self):
+        return len(self.points)
+
+
+    def _add_node(self, start, end):
+        """Adds a leaf node and returns its index."""
+
+        self.start.append(start)
+        self.end.append(end)
+        self.axis.append(-1)
+        self.split.append(0.0)
+        self.left.append(-1)
+        self.right.append(-1)
+        return len(self.start) - 1
+
+
+    def _build(self):
+        """Splits nodes at the median of their widest axis until they are small enough."""
+
+        stack = [self._add_node(0, len(self.points))]
+
+        while stack:
+
+            node = stack.pop()
+            start, end = self.start[node], self.end[node]
+
+            if end - start <= self.leaf_size:
+                continue
+
+            rows = self.order[start:end]
+            spread = self.points[rows].max(axis = 0) - self.points[rows].min(axis = 0)
+            axis = int(spread.argmax())
+
+            # All the points are equal
+            if spread[axis] == 0:
+                continue
+
+            # Partition around the median
+            middle = (end - start) // 2
+            partition = np.argpartition(self.points[rows, axis], middle)
+            self.order[start:end] = rows[partition]
+
+            self.axis[node] = axis
+            self.split[node] = self.points[self.order[start + middle], axis]
+            self.left[node] = self._add_node(start, start + middle)
+            self.right[node] = self._add_node(start + middle, end)
+
+            stack.append(self.left[node])
+            stack.append(self.right[node])
+
+
+    def query(self, query_points, k = 1):
+        """Returns the distances and indexes of the k nearest rows to
+        each query point, as two arrays of shape (queries, k) sorted
+        from nearest to farthest."""
+
+        query_points = np.asarray(query_points, dtype = float).reshape(-1, self.points.shape[1])
+        k = min(k, len(self.points))
+
+        distances = np.empty((len(query_points), k))
+        indexes = np.empty((len(query_points), k), dtype = int)
+
+        for i, point in enumerate(query_points):
+            distances[i], indexes[i] = self._query_point(point, k)
+
+        return distances, indexes
+
+
+    def query_radius(self, query_points, radius):
+        """Returns a list with the distances and indexes of the rows
+        within the radius of each query point, as pairs of arrays."""
+
+        query_points = np.asarray(query_points, dtype = float).reshape(-1, self.points.shape[1])
+
+        return [
+            self._query_point_radius(point, radius)
+            for point
+            in query_points
+        ]
+
+
+    def _query_point_radius(self, point, radius):
+        """Returns the distances and indexes of the rows within the radius of a single point."""
+
+        distances = []
+        indexes = []
+        stack = [0] if len(self.points) > 0 else []
+
+        while stack:
+
+            node = stack.pop()
+            axis = self.axis[node]
+
+            # Compare against every row in the leaf
+            if axis < 0:
+                rows = self.order[self.start[node]:self.end[node]]
+                difference = self.points[rows] - point
+                leaf_distances = np.sqrt((difference * difference).sum(axis = 1))
+                within = leaf_distances <= radius
+                distances.append(leaf_distances[within])
+                indexes.append(rows[within])
+                continue
+
+            # Only search the far side if it is within the radius
+            difference = point[axis] - self.split[node]
+            near, far = (self.left[node], self.right[node]) if difference < 0 else (self.right[node], self.left[node])
+            if abs(difference) <= radius:
+                stack.append(far)
+            stack.append(near)
+
+        if len(distances) == 0:
+            return np.empty(0), np.empty(0, dtype = int)
+
+        return np.concatenate(distances), np.concatenate(indexes)
+
+
+    def _query_point(self, point, k):
+        """Returns the k nearest distances and indexes to a single point."""
+
+        # Max-heap of the k nearest rows found so far, using negative distances
+        heap = []
+        stack = [(0, 0.0)]
+
+        while stack:
+
+            node, bound = stack.pop()
+
+            # The node can't contain anything nearer
+            if len(heap) == k and bound >= -heap[0][0]:
+                continue
+
+            axis = self.axis[node]
+
+            # Compare against every row in the leaf
+            if axis < 0:
+                rows = self.order[self.start[node]:self.end[node]]
+                difference = self.points[rows] - point
+                for distance, row in zip(np.sqrt((difference * difference).sum(axis = 1)).tolist(), rows.tolist()):
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-distance, row))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, row))
+                continue
+
+            # Search the near side first
+            difference = point[axis] - self.split[node]
+            near, far = (self.left[node], self.right[node]) if difference < 0 else (self.right[node], self.left[node])
+            stack.append((far, max(bound, abs(difference))))
+            stack.append((near, bound))
+
+        result = sorted((-distance, row) for distance, row in heap)
+        return [distance for distance, _ in result], [row for _, row in result]
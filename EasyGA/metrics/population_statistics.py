@@ -0,0 +1,235 @@
+# Population level diversity metrics
+from metrics import diversity
+
+# Non-dominated fronts for multiple objectives
+from pareto import nsga2
+
+
+class Population_Statistics:
+    """Statistics of the current population, refreshed whenever the
+    population has been evaluated and sorted, e.g. using
+
+        ga.statistics.update(ga)
+
+    Holds the fitness quantiles, the fitness at the convergence threshold,
+    the distances from the best chromosome to the chromosomes used for
+    adapting, the number of generations without improvement of the best
+    fitness, and the number of failed, timed out and retried fitness
+    evaluations in the run. If ga.diversity_metric is set to 'hamming' or
+    'euclidean', a diversity estimate using ga.dist, the mean pairwise
+    distance, mean per-locus entropy and unique genotype ratio are also
+    computed, otherwise they are None. Distances are cached per chromosome
+    and only recomputed for chromosomes which were re-evaluated since the
+    last update, or for every chromosome if the best chromosome changed.
+    Only the distances of the current population are kept.
+    """
+
+    # Fractions of the population ranked above the quantile,
+    # so 0 is the best fitness and 1 is the worst fitness.
+    quantiles = (0, 0.25, 0.5, 0.75, 1)
+
+    # Number of evenly ranked chromosomes used to estimate diversity
+    diversity_sample_size = 32
+
+
+    def __init__(self):
+        self.history = []
+        self.reset()
+
+
+    def reset(self):
+        """Clears the current statistics and cached distances."""
+
+        self.generation = None
+        self.best_fitness = None
+        self.record_fitness = None
+        self.stagnant_generations = 0
+        self.threshold_fitness = None
+        self.fitness_quantiles = {}
+        self.distances = {}
+        self.diversity = None
+        self.pairwise_distance = None
+        self.pairwise_distance_error = None
+        self.entropy = None
+        self.unique_ratio = None
+        self.failed_evaluations = 0
+        self.timed_out_evaluations = 0
+        self.retried_evaluations = 0
+        self._best = None
+        self._dist = None
+        self._distance_cache = {}
+
+
+    def changed(self, chromosome):
+        """Marks the chromosome as changed, invalidating its cached
+        distance. Called whenever a chromosome is re-evaluated."""
+
+        # Everything is measured relative to the best chromosome
+        if chromosome is self._best:
+            self._best = None
+            self._distance_cache = {}
+        else:
+            self._distance_cache.pop(id(chromosome), None)
+
+
+    def evaluation_failed(self, timed_out = False, retried = False):
+        """Counts a fitness evaluation which raised an error or timed out."""
+
+        self.failed_evaluations += 1
+        self.timed_out_evaluations += timed_out
+        self.retried_evaluations += retried
+
+
+    def distance_to_best(self, ga, index, population = None):
+        """Returns ga.dist between the best chromosome and the indexed
+        chromosome, using the cached value if it is still valid. The
+        population is ga.population_by_fitness() unless it is given."""
+
+        if population is None:
+            population = ga.population_by_fitness()
+
+        best = population[0]
+        chromosome = population[index]
+        dist = getattr(ga.dist, '__func__', ga.dist)
+
+        # A new best chromosome or distance function invalidates every cached distance
+        if best is not self._best or dist is not self._dist:
+            self._best = best
+            self._dist = dist
+            self._distance_cache = {}
+
+        entry = self._distance_cache.get(id(chromosome))
+
+        # Make sure the id wasn't reused by a new chromosome
+        if entry is not None and entry[0] is chromosome:
+            return entry[1]
+
+        distance = ga.dist(best, chromosome)
+        self._distance_cache[id(chromosome)] = (chromosome, distance)
+        return distance
+
+
+    def update(self, ga):
+        """Refreshes the statistics from the sorted, evaluated population
+        and records them in the history. With novelty search the population
+        is sorted by novelty, so a copy sorted by fitness is used."""
+
+        population = ga.population_by_fitness()
+        size = len(population)
+
+        if size == 0:
+            return
+
+        # Drop the cached distances of chromosomes which left the population
+        live = {id(chromosome) for chromosome in population}
+        self._distance_cache = {
+            key : entry
+            for key, entry
+            in self._distance_cache.items()
+            if key in live
+        }
+
+        new_generation = (self.generation != ga.current_generation)
+        self.generation = ga.current_generation
+        self.best_fitness = population[0].fitness
+        self.update_stagnation(ga, population, new_generation)
+        self.threshold_fitness = population[min(size-1, round(ga.percent_converged*size))].fitness
+
+        # Fitnesses are sorted, so quantiles are read off directly
+        self.fitness_quantiles = {
+            quantile : population[round(quantile*(size-1))].fitness
+            for quantile
+            in self.quantiles
+        }
+
+        # Distances used for adapting
+        amount_converged = min(size-1, round(ga.percent_converged*size))
+        self.distances = {
+            index : self.distance_to_best(ga, index, population)
+            for index
+            in {amount_converged//4, amount_converged//2}
+        }
+
+        # Diversity metrics, only computed when asked for
+        if ga.diversity_metric is not None:
+
+            # Average distance from the best chromosome to evenly ranked chromosomes
+            sample_size = min(size-1, self.diversity_sample_size)
+            if sample_size > 0:
+                self.diversity = sum(
+                    self.distance_to_best(ga, 1 + i*(size-1)//sample_size, population)
+                    for i
+                    in range(sample_size)
+                ) / sample_size
+            else:
+                self.diversity = 0
+
+            self.update_diversity(ga)
+
+        # Replace the record if the generation was already recorded, e.g. after adapting
+        if self.history and self.history[-1]['generation'] == self.generation:
+            self.history[-1] = self.snapshot()
+        else:
+            self.history.append(self.snapshot())
+
+
+    def update_stagnation(self, ga, population, new_generation):
+        """Counts the generations since the record best fitness improved.
+        With multiple objectives, the record is the best non-dominated front
+        found so far, which improves if any new point isn't dominated by it."""
+
+        if ga.multi_objective:
+            front = [chromosome.fitness for chromosome in population if getattr(chromosome, 'rank', None) == 0]
+            record = self.record_fitness or []
+            improved = nsga2.improves_front(front, record, ga.target_fitness_type)
+            best = nsga2.first_front(record + front, ga.target_fitness_type)
+
+        else:
+            improved = (
+                self.record_fitness is None
+                or (ga.target_fitness_type == 'max' and self.best_fitness > self.record_fitness)
+                or (ga.target_fitness_type == 'min' and self.best_fitness < self.record_fitness)
+            )
+            best = self.best_fitness
+
+        if improved:
+            self.record_fitness = best
+            self.stagnant_generations = 0
+        elif new_generation:
+            self.stagnant_generations += 1
+
+
+    def update_diversity(self, ga):
+        """Computes the population level diversity metrics."""
+
+        matrix = diversity.gene_matrix(ga.population)
+
+        self.pairwise_distance, self.pairwise_distance_error = diversity.mean_pairwise_distance(
+            matrix,
+            metric = ga.diversity_metric,
+            max_rows = ga.diversity_max_rows,
+            max_error = ga.diversity_max_error,
+            rng = ga.rng.generator,
+            return_error = True,
+        )
+        self.entropy = diversity.locus_entropy(matrix).mean()
+        self.unique_ratio = diversity.unique_ratio(matrix)
+
+
+    def snapshot(self):
+        """Returns a dictionary of the current statistics."""
+
+        return {
+            'generation'        : self.generation,
+            'best_fitness'      : self.best_fitness,
+            'threshold_fitness' : self.threshold_fitness,
+            'stagnant_generations' : self.stagnant_generations,
+            'fitness_quantiles' : dict(self.fitness_quantiles),
+            'diversity'         : self.diversity,
+            'pairwise_distance' : self.pairwise_distance,
+            'entropy'           : self.entropy,
+            'unique_ratio'      : self.unique_ratio,
+            'failed_evaluations'    : self.failed_evaluations,
+            'timed_out_evaluations' : self.timed_out_evaluations,
+            'retried_evaluations'   : self.retried_evaluations,
+        }
@@ -0,0 +1,208 @@
+import time
+from math import log, ceil
+
+from tabulate import tabulate
+
+
+class Histogram:
+    """Log-scaled histogram of durations. Keeps a fixed number of
+    buckets so percentiles can be estimated across any number of
+    generations without storing every sample."""
+
+
+    def __init__(self, buckets_per_decade = 20, minimum = 1e-7):
+        self.buckets_per_decade = buckets_per_decade
+        self.minimum = minimum
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+    def add(self, value):
+        """Adds a value to the histogram."""
+
+        # Values below the minimum all share the first bucket
+        if value <= self.minimum:
+            bucket = 0
+        else:
+            bucket = ceil(log(value / self.minimum, 10) * self.buckets_per_decade)
+
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+
+    def percentile(self, percent):
+        """Returns an estimate of the given percentile (0 to 100),
+        accurate to the width of one bucket."""
+
+        if self.count == 0:
+            return None
+
+        # Number of samples needed to reach the percentile
+        target = percent / 100 * self.count
+        seen = 0
+
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+
+            # The last bucket always ends at the largest sample
+            if seen >= self.count:
+                return self.max
+
+            if seen >= target:
+                # Upper edge of the bucket, never above the largest sample
+                return min(self.max, self.minimum * 10 ** (bucket / self.buckets_per_decade))
+
+        return self.max
+
+
+class Stage_Profiler:
+    """Optional instrumentation around every stage of ga.evolve.
+
+    Records the wall time and number of calls of each stage, keeps a
+    histogram of the time spent per generation in each stage, and calls
+    any pre/post-stage hooks so the numbers can be forwarded elsewhere.
+    Does nothing unless enabled, e.g. using
+
+        ga.profiler.enabled = True
+    """
+
+    # Percentiles shown in the summary
+    percentiles = (50, 90, 99)
+
+
+    def __init__(self):
+        self.enabled = False
+        self.pre_stage_hooks = []
+        self.post_stage_hooks = []
+        self.reset()
+
+
+    def reset(self):
+        """Clears all recorded timings."""
+
+        self.total_time = {}
+        self.calls = {}
+        self.histograms = {}
+        self.generation_time = {}
+        self.generations = 0
+
+
+    def add_hook(self, pre = None, post = None):
+        """Adds callbacks run before and after every stage.
+        pre is called as pre(stage) and post as post(stage, elapsed)."""
+
+        if pre is not None:
+            self.pre_stage_hooks.append(pre)
+        if post is not None:
+            self.post_stage_hooks.append(post)
+
+
+    def stage(self, name):
+        """Returns a context manager timing the named stage.
+
+            with ga.profiler.stage('crossover'):
+                ga.crossover_population_impl()
+        """
+
+        if not self.enabled:
+            return _null_stage
+        return _Timed_Stage(self, name)
+
+
+    def record(self, name, elapsed):
+        """Records a single call of the named stage."""
+
+        self.total_time[name] = self.total_time.get(name, 0.0) + elapsed
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.generation_time[name] = self.generation_time.get(name, 0.0) + elapsed
+
+
+    def end_generation(self):
+        """Moves the time spent in each stage this generation into the histograms."""
+
+        if not self.enabled:
+            return
+
+        for name, elapsed in self.generation_time.items():
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].add(elapsed)
+
+        self.generation_time = {}
+        self.generations += 1
+
+
+    def percentile(self, name, percent):
+        """Returns the estimated percentile of the time
+        spent per generation in the named stage."""
+
+        histogram = self.histograms.get(name)
+        return None if histogram is None else histogram.percentile(percent)
+
+
+    def summary(self):
+        """Returns a list of rows with the stage name, calls,
+        total time and per-generation percentiles of each stage."""
+
+        return [
+            [name, self.calls[name], self.total_time[name]]
+            + [self.percentile(name, percent) for percent in self.percentiles]
+            for name
+            in sorted(self.total_time, key = self.total_time.get, reverse = True)
+        ]
+
+
+    def print_summary(self):
+        """Prints the summary as a table."""
+
+        print(
+            tabulate(
+                self.summary(),
+                headers = ['stage', 'calls', 'total (s)']
+                          + [f'p{percent} (s/gen)' for percent in self.percentiles]
+            )
+        )
+
+
+class _Timed_Stage:
+    """Context manager used by Stage_Profiler.stage."""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+
+    def __enter__(self):
+        for hook in self.profiler.pre_stage_hooks:
+            hook(self.name)
+        self.start = time.perf_counter()
+        return self
+
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.profiler.record(self.name, elapsed)
+        for hook in self.profiler.post_stage_hooks:
+            hook(self.name, elapsed)
+
+
+class _Null_Stage:
+    """Context manager used when profiling is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_null_stage = _Null_Stage()
@@ -0,0 +1,182 @@
+import random
+import numpy as np
+
+from EasyGA import GA
+from metrics import diversity, neighbors
+from metrics.profiler import Histogram
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_histogram_percentiles():
+    """Percentile estimates should be within one bucket (about 12%) of the true values."""
+
+    histogram = Histogram()
+
+    for i in range(1, 101):
+        histogram.add(i / 1000)
+
+    assert histogram.count == 100
+    assert abs(histogram.percentile(50) - 0.050) <= 0.050 * 0.15
+    assert abs(histogram.percentile(90) - 0.090) <= 0.090 * 0.15
+    assert histogram.percentile(100) == histogram.max
+
+
+def test_stage_profiler():
+    """Every stage of evolve should be timed and reported to the hooks."""
+
+    ga = GA()
+    ga.generation_goal = 5
+    ga.profiler.enabled = True
+
+    started  = []
+    finished = []
+    ga.profiler.add_hook(
+        pre  = lambda stage: started.append(stage),
+        post = lambda stage, elapsed: finished.append(stage),
+    )
+
+    ga.evolve()
+
+    for stage in ('parent_selection', 'crossover', 'survivor_selection', 'mutation', 'fitness', 'sort', 'save'):
+        assert ga.profiler.calls[stage] > 0
+        assert ga.profiler.percentile(stage, 50) is not None
+
+    assert ga.profiler.generations == 5
+    assert started == finished
+
+
+def test_stage_profiler_disabled():
+    """Nothing should be recorded unless the profiler is enabled."""
+
+    ga = GA()
+    ga.generation_goal = 3
+    ga.evolve()
+
+    assert ga.profiler.calls == {}
+    assert ga.profiler.generations == 0
+
+
+def test_population_statistics():
+    """Statistics should match the sorted population and only
+    recompute distances for re-evaluated chromosomes."""
+
+    ga = GA()
+    ga.population_size = 20
+    ga.generation_goal = 3
+    ga.evolve()
+
+    statistics = ga.statistics
+    assert statistics.best_fitness == ga.population[0].fitness
+    assert statistics.fitness_quantiles[1] == ga.population[-1].fitness
+    assert len(statistics.history) == 3
+
+    # Count how often dist is used
+    calls = []
+    def dist(ga, chromosome_1, chromosome_2):
+        calls.append(None)
+        return abs(chromosome_1.fitness - chromosome_2.fitness)
+    ga.dist = dist
+
+    statistics.update(ga)
+    first_calls = len(calls)
+    assert first_calls > 0
+
+    # Nothing changed, so everything is cached
+    statistics.update(ga)
+    assert len(calls) == first_calls
+
+    # Only the re-evaluated chromosome is recomputed
+    ga.population[-1].fitness = None
+    ga.set_all_fitness()
+    statistics.distance_to_best(ga, len(ga.population)-1)
+    assert len(calls) == first_calls + 1
+
+    # Only the distances of the current population are kept
+    ga.generation_goal = 30
+    for _ in range(5):
+        ga.evolve(5)
+        assert len(statistics._distance_cache) <= len(ga.population)
+
+
+def test_pairwise_distance():
+    """Hamming distances should be exact and sampled Euclidean
+    distances should be within the requested error bound."""
+
+    matrix = np.array([[random.randint(0, 3) for _ in range(8)] for _ in range(50)])
+
+    brute_force = np.mean([
+        (matrix[i] != matrix[j]).sum()
+        for i in range(50)
+        for j in range(50)
+        if i != j
+    ])
+    assert abs(diversity.mean_pairwise_distance(matrix, 'hamming') - brute_force) < 1e-9
+
+    matrix = np.random.default_rng(0).random((3000, 5))
+    exact = diversity.mean_pairwise_distance(matrix, 'euclidean', max_rows = 3000)
+    estimate, error = diversity.mean_pairwise_distance(matrix, 'euclidean', max_rows = 100, max_error = 0.02, return_error = True)
+
+    assert error <= 0.02 * estimate
+    assert abs(estimate - exact) <= 0.05 * exact
+
+
+def test_entropy_and_unique_ratio():
+    """Entropy and unique ratios of simple gene matrices."""
+
+    matrix = np.array([[0, 1], [0, 0], [0, 1], [0, 0]])
+    assert list(diversity.locus_entropy(matrix)) == [0, 1]
+    assert diversity.unique_ratio(matrix) == 0.5
+
+    # Non-numeric genes
+    matrix = diversity.gene_matrix(GA().make_population([['up', 1], ['down', 1]]))
+    assert diversity.unique_ratio(matrix) == 1
+    assert diversity.mean_pairwise_distance(matrix, 'hamming') == 1
+
+
+def test_diversity_statistics():
+    """Diversity metrics should be recorded in the history only when enabled."""
+
+    ga = GA()
+    ga.generation_goal = 5
+    ga.evolve()
+
+    assert all(record['diversity'] is None for record in ga.statistics.history)
+
+    ga = GA()
+    ga.generation_goal = 5
+    ga.diversity_metric = 'hamming'
+    ga.evolve()
+
+    for record in ga.statistics.history:
+        assert 0 <= record['unique_ratio'] <= 1
+        assert record['pairwise_distance'] >= 0
+        assert record['diversity'] >= 0
+
+
+def test_kd_tree():
+    """The k-d tree should find the same neighbors as comparing every pair."""
+
+    rng = np.random.default_rng(0)
+    points = rng.normal(size = (500, 3))
+    queries = rng.normal(size = (50, 3))
+
+    distances, indexes = neighbors.KD_Tree(points, leaf_size = 8).query(queries, k = 7)
+    brute = np.sqrt(((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis = 2))
+
+    assert np.allclose(distances, np.sort(brute, axis = 1)[:, :7])
+    assert np.allclose(brute[np.arange(50)[:, None], indexes], distances)
+
+
+def test_kd_tree_radius():
+    """Radius queries should find exactly the rows within the radius."""
+
+    rng = np.random.default_rng(1)
+    points = rng.uniform(size = (300, 2))
+    queries = rng.uniform(size = (20, 2))
+
+    brute = np.sqrt(((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis = 2))
+
+    for row, (distances, indexes) in zip(brute, neighbors.KD_Tree(points, leaf_size = 4).query_radius(queries, 0.2)):
+        assert sorted(indexes.tolist()) == np.flatnonzero(row <= 0.2).tolist()
+        assert np.allclose(row[indexes], distances)
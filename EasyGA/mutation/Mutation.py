@@ -1,9 +1,11 @@
-import random
 from math import ceil
 
 # Import all mutation decorators
 from decorators import _check_chromosome_mutation_rate, _check_gene_mutation_rate, _reset_fitness, _loop_random_mutations
 
+# Packed bit chromosomes
+from structure.bit_chromosome import random_mask
+
 
 class Population:
     """Methods for selecting chromosomes to mutate"""
@@ -16,8 +18,8 @@ class Population:
         sample_size  = ceil(len(ga.population)*ga.chromosome_mutation_rate)
 
         # Loop the individual method until enough genes are mutated.
-        for index in random.sample(sample_space, sample_size):
-            ga.mutation_individual_impl(ga.population[index])
+        for index in ga.rng.sample(sample_space, sample_size):
+            ga.mutation_individual_impl(ga.population.writable(index))
 
 
     @_check_chromosome_mutation_rate
@@ -27,8 +29,8 @@ class Population:
         sample_space = range(ceil(ga.percent_converged*len(ga.population)*3/16), len(ga.population))
         sample_size  = ceil(ga.chromosome_mutation_rate*len(ga.population))
 
-        for index in random.sample(sample_space, sample_size):
-            ga.mutation_individual_impl(ga.population[index])
+        for index in ga.rng.sample(sample_space, sample_size):
+            ga.mutation_individual_impl(ga.population.writable(index))
 
 
     @_check_chromosome_mutation_rate
@@ -117,7 +119,7 @@ class Individual:
 
             # Indexes of genes to swap
             index_one = index
-            index_two = random.randrange(len(chromosome))
+            index_two = ga.rng.randrange(len(chromosome))
 
             # Swap genes
             chromosome[index_one], chromosome[index_two] = chromosome[index_two], chromosome[index_one]
@@ -133,12 +135,60 @@ class Individual:
                 return
 
             # Indexes to split the chromosome
-            index_two = random.randrange(2, len(chromosome))
-            index_one = random.randrange(1, index_two)
+            index_two = ga.rng.randrange(2, len(chromosome))
+            index_one = ga.rng.randrange(1, index_two)
 
             # Extract segments and shuffle them
             segments = [chromosome[:index_one], chromosome[index_one:index_two], chromosome[index_two:]]
-            random.shuffle(segments)
+            ga.rng.shuffle(segments)
 
             # Put segments back together
             chromosome.gene_list = segments[0] + segments[1] + segments[2]
+
+
+        @_check_gene_mutation_rate
+        @_reset_fitness
+        def inversion(ga, chromosome):
+            """Reverses the genes between two random indexes,
+            which is the 2-opt move when the genes are a tour."""
+
+            # Chromosome too short to mutate
+            if len(chromosome) < 2:
+                return
+
+            # Indexes of the segment to reverse
+            index_two = ga.rng.randrange(1, len(chromosome))
+            index_one = ga.rng.randrange(index_two)
+
+            chromosome[index_one:index_two+1] = reversed(chromosome[index_one:index_two+1])
+
+
+        @_check_gene_mutation_rate
+        @_reset_fitness
+        def insertion(ga, chromosome):
+            """Moves a random gene to a random index,
+            shifting the genes in between."""
+
+            # Chromosome too short to mutate
+            if len(chromosome) < 2:
+                return
+
+            index_one, index_two = ga.rng.sample(range(len(chromosome)), 2)
+
+            # Rotate the genes between the indexes, keeping the length fixed
+            if index_one < index_two:
+                chromosome[index_one:index_two+1] = chromosome[index_one+1:index_two+1] + [chromosome[index_one]]
+            else:
+                chromosome[index_two:index_one+1] = [chromosome[index_one]] + chromosome[index_two:index_one]
+
+
+    class Bits:
+        """Methods for mutating bit chromosomes, see ga.bit_chromosomes()."""
+
+        @_check_gene_mutation_rate
+        @_reset_fitness
+        def flip_bits(ga, chromosome):
+            """Flips each bit with probability gene_mutation_rate,
+            using a random bit mask to flip them all at once."""
+
+            chromosome.flip(random_mask(len(chromosome), ga.gene_mutation_rate, ga.rng))
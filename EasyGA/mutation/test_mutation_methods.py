@@ -0,0 +1,55 @@
+import random
+
+from EasyGA import GA, Mutation
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def delta_sum(ga, chromosome, changed_indexes, old_values):
+    """Updates the sum of the genes using only the changed genes."""
+
+    return chromosome.fitness + sum(
+        chromosome[index].value - old_value
+        for index, old_value
+        in zip(changed_indexes, old_values)
+    )
+
+
+def make_sum_ga():
+    ga = GA()
+    ga.chromosome_length = 50
+    ga.gene_mutation_rate = 0.1
+    ga.fitness_function_impl = lambda chromosome: sum(chromosome.gene_value_list)
+    ga.delta_fitness_impl = delta_sum
+    ga.save_data = False
+    ga.evolve(1)
+    return ga
+
+
+def test_delta_fitness():
+    """Mutations should update the fitness incrementally without re-evaluating."""
+
+    ga = make_sum_ga()
+
+    for mutation_impl in (Mutation.Individual.individual_genes, Mutation.Individual.Permutation.swap_genes):
+
+        ga.mutation_individual_impl = mutation_impl
+        evaluation_count = ga.evaluation_count
+
+        for chromosome in ga.population:
+            ga.mutation_individual_impl(chromosome)
+            assert chromosome.fitness == ga.fitness_function_impl(chromosome)
+            assert chromosome.changes is None
+
+        assert ga.evaluation_count == evaluation_count
+
+
+def test_delta_fitness_untracked():
+    """Mutations replacing the gene list should reset the fitness instead."""
+
+    ga = make_sum_ga()
+    ga.mutation_individual_impl = Mutation.Individual.Permutation.swap_segments
+
+    for chromosome in ga.population:
+        ga.mutation_individual_impl(chromosome)
+        assert chromosome.fitness is None
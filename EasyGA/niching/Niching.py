@@ -0,0 +1,71 @@
+import numpy as np
+
+# Gene vectors and the spatial index for finding neighbors
+from metrics.diversity import gene_matrix
+from metrics.neighbors import KD_Tree
+
+
+def gene_points(chromosome_list):
+    """Returns the gene values of the chromosomes as a 2D float array."""
+
+    try:
+        return gene_matrix(chromosome_list).astype(float)
+    except (TypeError, ValueError):
+        raise ValueError("Niching requires numeric genes.")
+
+
+class Fitness_Sharing:
+    """Fitness sharing for maintaining several optima in the population.
+    Used by setting
+
+        ga.fitness_sharing = Niching.Fitness_Sharing(radius = 1.0)
+
+    which makes parent selection use the shared fitness
+
+        shared fitness = fitness / sum(1 - (distance/radius) ** alpha)
+
+    summed over every chromosome within the radius of the chromosome,
+    including itself, using the euclidean distance between the genes.
+    Neighbors are found using a k-d tree instead of comparing every pair.
+    Fitness is converted using ga.convert_fitness, and shifted to be
+    non-negative if necessary.
+    """
+
+    def __init__(self, radius, alpha = 1, leaf_size = 16):
+        self.radius = radius
+        self.alpha = alpha
+        self.leaf_size = leaf_size
+
+
+    def niche_counts(self, points):
+        """Returns the sum of the sharing function over the neighbors of each point."""
+
+        tree = KD_Tree(points, self.leaf_size)
+
+        return np.array([
+            (1 - (distances / self.radius) ** self.alpha).sum()
+            for distances, _
+            in tree.query_radius(points, self.radius)
+        ])
+
+
+    def share(self, ga):
+        """Sets the shared fitness (chromosome.shared_fitness) of every
+        chromosome and sorts the population by decreasing shared fitness.
+        The population must be sorted by fitness."""
+
+        if ga.multi_objective:
+            raise ValueError("Fitness sharing requires a single objective.")
+
+        fitness = np.array([ga.convert_fitness(chromosome.fitness) for chromosome in ga.population], dtype = float)
+
+        # Sharing requires non-negative fitness
+        if fitness.min() < 0:
+            fitness -= fitness.min()
+
+        shared_fitness = fitness / self.niche_counts(gene_points(ga.population))
+
+        for chromosome, value in zip(ga.population, shared_fitness.tolist()):
+            chromosome.shared_fitness = value
+
+        ga.population.sort(key = lambda chromosome: chromosome.shared_fitness, reverse = True)
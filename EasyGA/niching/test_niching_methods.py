@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+
+from EasyGA import GA, Niching, Survivor
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def two_peaks(chromosome):
+    """Two equally good peaks, at -5 and 5."""
+    return -min(abs(chromosome[0].value - 5), abs(chromosome[0].value + 5))
+
+
+def make_two_peaks_ga():
+    ga = GA()
+    ga.chromosome_length = 1
+    ga.population_size = 40
+    ga.generation_goal = 30
+    ga.save_data = False
+    ga.gene_impl = lambda: random.uniform(-10, 10)
+    ga.fitness_function_impl = two_peaks
+    ga.numeric_chromosomes()
+    return ga
+
+
+def test_niche_counts():
+    """Chromosomes in crowded niches should have larger niche counts."""
+
+    sharing = Niching.Fitness_Sharing(radius = 1.0)
+    counts = sharing.niche_counts(np.array([[0.0], [0.0], [0.5], [10.0]]))
+
+    assert np.allclose(counts, [2.5, 2.5, 2.0, 1.0])
+
+
+def test_fitness_sharing():
+    """Parent selection on the shared fitness should keep both peaks populated."""
+
+    ga = make_two_peaks_ga()
+    ga.fitness_sharing = Niching.Fitness_Sharing(radius = 3.0)
+    ga.evolve()
+
+    values = [chromosome[0].value for chromosome in ga.population]
+    assert any(value > 0 for value in values)
+    assert any(value < 0 for value in values)
+    assert values[0] == max(values, key = lambda value: -min(abs(value - 5), abs(value + 5)))
+
+
+def test_deterministic_crowding():
+    """Crowding should keep the population size and never lose the best chromosome."""
+
+    ga = make_two_peaks_ga()
+    ga.survivor_selection_impl = Survivor.deterministic_crowding
+    ga.evolve(1)
+    best = ga.population[0].fitness
+    ga.evolve()
+
+    assert len(ga.population) == ga.population_size
+    assert ga.population[0].fitness >= best
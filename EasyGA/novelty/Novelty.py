@@ -0,0 +1,94 @@
+import numpy as np
+
+# Spatial index for the nearest neighbor queries
+from metrics.neighbors import KD_Tree
+
+
+class Novelty_Search:
+    """Ranks chromosomes by novelty instead of fitness, for deceptive problems
+    where following the fitness leads to local optima. Used by setting
+
+        ga.novelty_search()
+
+    The novelty of a chromosome is the mean distance from its behavior to the
+    behaviors of its k nearest neighbors among the chromosomes being sorted
+    and the archive of past behaviors. The behavior is ga.behavior_impl(chromosome)
+    if it is set, otherwise the gene values. Each generation the archive_amount
+    most novel behaviors are archived, keeping at most max_archive behaviors.
+    Fitness is still evaluated, and the best chromosome found by fitness is kept
+    as best_chromosome.
+    """
+
+    def __init__(self, k = 15, archive_amount = 2, max_archive = 5000, leaf_size = 16):
+        self.k = k
+        self.archive_amount = archive_amount
+        self.max_archive = max_archive
+        self.leaf_size = leaf_size
+        self.reset()
+
+
+    def reset(self):
+        """Clears the archive and the best chromosome."""
+
+        self.archive = []
+        self.best_chromosome = None
+
+
+    def behaviors(self, ga, chromosome_list):
+        """Returns the behaviors of the chromosomes as a 2D numpy array."""
+
+        if ga.behavior_impl is not None:
+            behaviors = [ga.behavior_impl(chromosome) for chromosome in chromosome_list]
+        else:
+            behaviors = [chromosome.gene_value_list for chromosome in chromosome_list]
+
+        try:
+            return np.array(behaviors, dtype = float).reshape(len(behaviors), -1)
+        except (TypeError, ValueError):
+            raise ValueError("Novelty search requires numeric behaviors of equal length.")
+
+
+    def score(self, ga, chromosome_list):
+        """Sets the novelty (chromosome.novelty) of each chromosome."""
+
+        if len(chromosome_list) == 0:
+            return
+
+        behaviors = self.behaviors(ga, chromosome_list)
+
+        if len(self.archive) > 0:
+            points = np.concatenate((behaviors, np.array(self.archive)))
+        else:
+            points = behaviors
+
+        # Nearest neighbors, where the nearest is the chromosome itself
+        k = min(self.k + 1, len(points))
+        distances, _ = KD_Tree(points, self.leaf_size).query(behaviors, k)
+        novelty = distances[:, 1:].mean(axis = 1) if k > 1 else np.zeros(len(behaviors))
+
+        for chromosome, value in zip(chromosome_list, novelty.tolist()):
+            chromosome.novelty = value
+
+
+    def update(self, ga):
+        """Archives the most novel behaviors of the sorted population
+        and keeps track of the best chromosome by fitness."""
+
+        population = [chromosome for chromosome in ga.population if chromosome.fitness is not None]
+
+        if len(population) == 0:
+            return
+
+        # Population is sorted by novelty
+        self.archive.extend(self.behaviors(ga, population[:self.archive_amount]).tolist())
+        if len(self.archive) > self.max_archive:
+            del self.archive[:-self.max_archive]
+
+        # Best by fitness, including the previous best
+        if self.best_chromosome is not None:
+            population.append(self.best_chromosome)
+        best = ga.sort_by_best_fitness(population, in_place = False, by_fitness = True)[0]
+
+        if best is not self.best_chromosome:
+            self.best_chromosome = best.copy()
+            self.best_chromosome.fitness = best.fitness
@@ -0,0 +1,56 @@
+from EasyGA import GA
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_novelty_search():
+    """The population should be ranked by novelty while the best fitness is kept."""
+
+    ga = GA()
+    ga.generation_goal = 10
+    ga.population_size = 20
+    ga.save_data = False
+    ga.novelty_search(k = 5)
+    ga.evolve()
+
+    novelty = [chromosome.novelty for chromosome in ga.population]
+    assert novelty == sorted(novelty, reverse = True)
+    assert len(ga.novelty.archive) == 2 * ga.current_generation
+
+    best_fitness = max(chromosome.fitness for chromosome in ga.population)
+    assert ga.novelty.best_chromosome.fitness >= best_fitness
+
+
+def test_novelty_behavior():
+    """Chromosomes with the same behavior should have no novelty."""
+
+    ga = GA()
+    ga.save_data = False
+    ga.behavior_impl = lambda chromosome: [0, 0]
+    ga.novelty_search(k = 3)
+    ga.evolve(1)
+
+    assert all(chromosome.novelty == 0 for chromosome in ga.population)
+
+
+def test_novelty_statistics():
+    """Statistics and the fitness goal should use the fitness, not the novelty."""
+
+    ga = GA(seed = 3, generation_goal = 30, population_size = 20, save_data = False)
+    ga.novelty_search(k = 5)
+    ga.evolve()
+
+    best_fitness = max(chromosome.fitness for chromosome in ga.population)
+    quantiles = [ga.statistics.fitness_quantiles[quantile] for quantile in ga.statistics.quantiles]
+
+    assert ga.statistics.best_fitness == best_fitness
+    assert quantiles == sorted(quantiles, reverse = True)
+    assert ga.convert_fitness(best_fitness) == best_fitness
+
+    # The goal is reached by the best chromosome even if it isn't the most novel
+    ga = GA(seed = 3, generation_goal = 30, population_size = 20, save_data = False)
+    ga.novelty_search(k = 5)
+    ga.fitness_goal = 1
+    ga.evolve()
+
+    assert ga.current_generation < 30
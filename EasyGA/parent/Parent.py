@@ -1,5 +1,3 @@
-import random
-
 # Import all parent decorators
 from decorators import _check_selection_probability, _check_positive_fitness, _ensure_sorted, _compute_parent_amount
 
@@ -30,7 +28,7 @@ class Rank:
         while len(ga.population.mating_pool) < parent_amount:
 
             # Generate a random tournament group and sort by fitness.
-            tournament_group = sorted(random.sample(
+            tournament_group = sorted(ga.rng.sample(
                 range(len(ga.population)),
                 tournament_size
             ))
@@ -41,12 +39,12 @@ class Rank:
                 # Probability required is selection_probability * (1-selection_probability) ^ index
                 # Each chromosome is (1-selection_probability) times
                 # more likely to become a parent than the next ranked.
-                if random.random() < ga.selection_probability * (1-ga.selection_probability) ** index:
+                if ga.rng.random() < ga.selection_probability * (1-ga.selection_probability) ** index:
                     break
 
             # Use random in tournament if noone wins
             else:
-                index = random.randrange(tournament_size)
+                index = ga.rng.randrange(tournament_size)
 
             ga.population.set_parent(tournament_group[index])
 
@@ -59,7 +57,7 @@ class Rank:
         Selects parents with probabilities given by a geometric progression. This
         method is similar to tournament selection, but doesn't create several
         tournaments. Instead, it assigns probabilities to each rank and selects
-        the entire mating pool using random.choices. Since it essentially uses the
+        the entire mating pool using ga.rng.choices. Since it essentially uses the
         entire population as a tournament repeatedly, it is less likely to select
         worse parents than tournament selection.
         """
@@ -74,7 +72,7 @@ class Rank:
         ]
 
         # Set the mating pool.
-        ga.population.mating_pool = random.choices(ga.population, weights, k = parent_amount)
+        ga.population.mating_pool = ga.rng.choices(ga.population, weights, k = parent_amount)
 
 
     @_check_selection_probability
@@ -103,7 +101,7 @@ class Rank:
         ]
 
         # Set the mating pool.
-        ga.population.mating_pool = random.choices(ga.population, weights, k = parent_amount)
+        ga.population.mating_pool = ga.rng.choices(ga.population, weights, k = parent_amount)
 
 
 class Fitness:
@@ -141,7 +139,7 @@ class Fitness:
         while len(ga.population.mating_pool) < parent_amount:
 
             # Spin the roulette
-            rand_number = random.random()
+            rand_number = ga.rng.random()
 
             # Find where the roulette landed.
             for index in range(len(probability)):
@@ -156,7 +154,7 @@ class Fitness:
     def stochastic(ga, parent_amount):
         """
         Selects parents using the same probability approach as roulette selection,
-        but doesn't spin a roulette for every selection. Uses random.choices with
+        but doesn't spin a roulette for every selection. Uses ga.rng.choices with
         weighted values to select parents and may produce duplicate parents.
         """
 
@@ -193,4 +191,4 @@ class Fitness:
         ]
 
         # Set the mating pool.
-        ga.population.mating_pool = random.choices(ga.population, weights, k = parent_amount)
+        ga.population.mating_pool = ga.rng.choices(ga.population, weights, k = parent_amount)
@@ -0,0 +1,141 @@
+import numpy as np
+
+
+def objective_matrix(fitness_list, target_fitness_type):
+    """Returns the fitness vectors as a 2D numpy array in which every
+    objective is minimized, by negating the objectives to maximize."""
+
+    signs = np.array([-1.0 if target == 'max' else 1.0 for target in target_fitness_type])
+    objectives = np.array(fitness_list, dtype = float).reshape(len(fitness_list), len(signs))
+    return objectives * signs
+
+
+def domination_matrix(objectives_1, objectives_2 = None):
+    """Returns a boolean matrix D where D[i, j] is True
+    if objectives_1[i] dominates objectives_2[j] when minimizing,
+    i.e. it is no worse in every objective and better in at least one."""
+
+    if objectives_2 is None:
+        objectives_2 = objectives_1
+
+    no_worse = np.ones((len(objectives_1), len(objectives_2)), dtype = bool)
+    better   = np.zeros((len(objectives_1), len(objectives_2)), dtype = bool)
+
+    # Build up the matrix one objective at a time to save memory
+    for m in range(objectives_1.shape[1]):
+        column_1 = objectives_1[:, m, None]
+        column_2 = objectives_2[None, :, m]
+        no_worse &= (column_1 <= column_2)
+        better   |= (column_1 <  column_2)
+
+    return no_worse & better
+
+
+def non_dominated_sort(objectives):
+    """Returns the front of each row, where front 0 is non-dominated, front 1
+    is only dominated by front 0, etc. Uses a vectorized version of the
+    fast non-dominated sort in O(M N^2) time for N rows and M objectives."""
+
+    size = len(objectives)
+    dominates = domination_matrix(objectives)
+
+    # Number of rows dominating each row
+    dominated_count = dominates.sum(axis = 0)
+
+    fronts = np.full(size, -1)
+    front = np.flatnonzero(dominated_count == 0)
+    rank = 0
+
+    # Peel off one front at a time
+    while front.size > 0:
+        fronts[front] = rank
+        dominated_count -= dominates[front].sum(axis = 0)
+        dominated_count[front] = -1
+        front = np.flatnonzero(dominated_count == 0)
+        rank += 1
+
+    return fronts
+
+
+def crowding_distance(objectives, fronts):
+    """Returns the crowding distance of each row within its front.
+    Boundary rows of each front have infinite distance."""
+
+    distance = np.zeros(len(objectives))
+
+    for rank in np.unique(fronts):
+
+        indexes = np.flatnonzero(fronts == rank)
+
+        # Too few to measure crowding
+        if len(indexes) <= 2:
+            distance[indexes] = np.inf
+            continue
+
+        for m in range(objectives.shape[1]):
+
+            order  = indexes[np.argsort(objectives[indexes, m], kind = 'stable')]
+            values = objectives[order, m]
+            spread = values[-1] - values[0]
+
+            distance[order[0]] = distance[order[-1]] = np.inf
+
+            if spread > 0:
+                distance[order[1:-1]] += (values[2:] - values[:-2]) / spread
+
+    return distance
+
+
+def rank_chromosomes(chromosome_list, target_fitness_type):
+    """Sets the front (chromosome.rank) and crowding distance
+    (chromosome.crowding_distance) of each chromosome. Chromosomes
+    without fitness are given infinite rank."""
+
+    evaluated = [chromosome for chromosome in chromosome_list if chromosome.fitness is not None]
+
+    for chromosome in chromosome_list:
+        if chromosome.fitness is None:
+            chromosome.rank = float('inf')
+            chromosome.crowding_distance = 0.0
+
+    if len(evaluated) == 0:
+        return
+
+    objectives = objective_matrix([chromosome.fitness for chromosome in evaluated], target_fitness_type)
+    fronts = non_dominated_sort(objectives)
+    distance = crowding_distance(objectives, fronts)
+
+    for chromosome, rank, crowding in zip(evaluated, fronts.tolist(), distance.tolist()):
+        chromosome.rank = rank
+        chromosome.crowding_distance = crowding
+
+
+def improves_front(new_fitness_list, record_fitness_list, target_fitness_type):
+    """Returns True if any of the new fitness vectors is
+    not weakly dominated by any of the recorded fitness vectors."""
+
+    if len(record_fitness_list) == 0:
+        return len(new_fitness_list) > 0
+
+    new    = objective_matrix(new_fitness_list, target_fitness_type)
+    record = objective_matrix(record_fitness_list, target_fitness_type)
+
+    weakly_dominated = (record[:, None, :] <= new[None, :, :]).all(axis = 2).any(axis = 0)
+
+    return not weakly_dominated.all()
+
+
+def first_front(fitness_list, target_fitness_type):
+    """Returns the non-dominated fitness vectors."""
+
+    if len(fitness_list) == 0:
+        return []
+
+    fronts = non_dominated_sort(objective_matrix(fitness_list, target_fitness_type))
+
+    return [
+        fitness
+        for fitness, rank
+        in zip(fitness_list, fronts)
+        if rank == 0
+    ]
@@ -0,0 +1,79 @@
+import random
+import numpy as np
+
+from EasyGA import GA
+from pareto import nsga2
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_non_dominated_sort():
+    """Fronts should match a brute force definition of domination."""
+
+    objectives = np.random.default_rng(0).integers(0, 10, size = (60, 3)).astype(float)
+    fronts = nsga2.non_dominated_sort(objectives)
+
+    dominates = lambda a, b: (a <= b).all() and (a < b).any()
+
+    for i in range(len(objectives)):
+
+        # Nothing in the same or a later front dominates it
+        assert not any(
+            dominates(objectives[j], objectives[i])
+            for j in range(len(objectives))
+            if fronts[j] >= fronts[i]
+        )
+
+        # Something in the previous front dominates it
+        if fronts[i] > 0:
+            assert any(
+                dominates(objectives[j], objectives[i])
+                for j in range(len(objectives))
+                if fronts[j] == fronts[i] - 1
+            )
+
+
+def test_crowding_distance():
+    """Boundary points are infinitely far and interior points are measured by their neighbors."""
+
+    objectives = np.array([[0.0, 4.0], [1.0, 3.0], [3.0, 1.0], [4.0, 0.0]])
+    distance = nsga2.crowding_distance(objectives, np.zeros(4, dtype = int))
+
+    assert np.isinf(distance[0]) and np.isinf(distance[3])
+    assert distance[1] == distance[2] == 3/4 + 3/4
+
+
+def test_multi_objective_evolve():
+    """Evolving two competing objectives should store pareto fronts in the database."""
+
+    ga = GA()
+    ga.generation_goal = 10
+    ga.gene_impl = lambda: random.uniform(0, 1)
+
+    # Minimize the first gene and the distance of the first gene from 1
+    ga.fitness_function_impl = lambda ga, chromosome: (chromosome[0].value, 1 - chromosome[0].value + sum(gene.value for gene in chromosome[1:]))
+    ga.multi_objective_fitness(('min', 'min'))
+    ga.evolve()
+
+    # The population is sorted by front
+    ranks = [chromosome.rank for chromosome in ga.population]
+    assert ranks == sorted(ranks)
+
+    front = ga.database.get_pareto_front()
+    assert len(front) == ranks.count(0)
+    assert all(len(fitness) == 2 for fitness in front)
+
+
+def test_numpy_fitness_vectors():
+    """Fitness vectors of numpy floats should be stored and read back as floats."""
+
+    ga = GA()
+    ga.generation_goal = 3
+    ga.gene_impl = lambda: random.uniform(0, 1)
+    ga.fitness_function_impl = lambda ga, chromosome: np.array([chromosome[0].value, 1 - chromosome[0].value])
+    ga.multi_objective_fitness(('min', 'min'))
+    ga.evolve()
+
+    front = ga.database.get_pareto_front()
+    assert len(front) > 0
+    assert all(len(fitness) == 2 and all(type(value) is float for value in fitness) for fitness in front)
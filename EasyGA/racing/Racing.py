@@ -0,0 +1,152 @@
+from math import ceil, erf, inf, sqrt
+
+import numpy as np
+
+
+class Race:
+    """Racing evaluation of noisy fitness functions, where the fitness of a
+    chromosome is the mean of several samples of the fitness function. Used
+    by setting
+
+        ga.racing = Racing.Race(max_samples = 30)
+
+    Instead of taking max_samples samples of every chromosome, the
+    chromosomes are sampled round_size times per round, and a chromosome
+    stops being sampled once its confidence interval is entirely worse than
+    the threshold of the survivors: the survivor_ratio fraction of the
+    chromosomes with the best pessimistic bounds. Chromosomes which were
+    evaluated before, e.g. survivors, take part in the race with the samples
+    they already have, and keep gaining samples each generation until they
+    have max_samples, so chromosomes which survive become more accurate.
+
+    The fitness of every chromosome is the mean of its samples, so sorting
+    and survivor selection work as usual. The number of samples and the
+    standard error of the mean are kept in chromosome.fitness_samples and
+    chromosome.fitness_error. The samples saved compared to sampling every
+    new chromosome max_samples times are counted in saved_evaluations, and
+    each race is recorded in the history.
+    """
+
+    def __init__(self, max_samples = 30, round_size = 5, survivor_ratio = 0.5, confidence = 0.95):
+        self.max_samples = max_samples
+        self.round_size = max(2, round_size)
+        self.survivor_ratio = survivor_ratio
+        self.confidence = confidence
+        self.reset()
+
+
+    def reset(self):
+        """Clears the saved evaluations and history."""
+
+        self.evaluations = 0
+        self.saved_evaluations = 0
+        self.history = []
+
+
+    def race(self, ga, chromosome_list):
+        """Samples the chromosomes in rounds until every chromosome has
+        max_samples samples or is worse than the survivors' threshold.
+        Returns the chromosomes which were sampled."""
+
+        if ga.multi_objective:
+            raise ValueError("Racing requires a single objective.")
+
+        chromosome_list = list(chromosome_list)
+        z = _normal_quantile((1 + self.confidence) / 2)
+        sign = 1 if ga.target_fitness_type == 'max' else -1
+        survivor_amount = ceil(len(chromosome_list) * self.survivor_ratio)
+
+        # Running mean and sum of squared differences of the samples
+        count = np.zeros(len(chromosome_list))
+        mean = np.zeros(len(chromosome_list))
+        m2 = np.zeros(len(chromosome_list))
+        new_amount = 0
+
+        for i, chromosome in enumerate(chromosome_list):
+
+            # New chromosomes start without samples
+            if chromosome.fitness is None or ga.update_fitness:
+                chromosome.fitness_samples = 0
+                new_amount += 1
+
+            # Other fitness values, e.g. surrogate predictions, are taken as exact
+            elif getattr(chromosome, 'fitness_samples', 0) == 0:
+                count[i] = inf
+                mean[i] = chromosome.fitness
+
+            else:
+                count[i] = chromosome.fitness_samples
+                mean[i] = chromosome.fitness
+                m2[i] = chromosome.fitness_error**2 * count[i] * (count[i]-1)
+
+        alive = np.flatnonzero(count < self.max_samples)
+        sampled = alive.tolist()
+        evaluations = 0
+
+        while len(alive) > 0:
+
+            # Sample every racing chromosome
+            amounts = np.minimum(self.round_size, self.max_samples - count[alive]).astype(int)
+            repeated = [chromosome_list[i] for i, amount in zip(alive.tolist(), amounts.tolist()) for _ in range(amount)]
+            samples = np.array(list(ga.evaluate_all(repeated)), dtype = float)
+            evaluations += len(repeated)
+
+            # Combine the new samples with the old ones
+            offsets = np.concatenate(([0], np.cumsum(amounts)))
+            for i, start, end in zip(alive.tolist(), offsets[:-1].tolist(), offsets[1:].tolist()):
+                batch = samples[start:end]
+                total = count[i] + len(batch)
+                delta = batch.mean() - mean[i]
+                m2[i] += ((batch - batch.mean())**2).sum() + delta**2 * count[i] * len(batch) / total
+                mean[i] += delta * len(batch) / total
+                count[i] = total
+
+            # Confidence intervals, with the best fitness as the largest score
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                error = np.where(count > 1, np.sqrt(m2 / (count * np.maximum(count-1, 1))), inf)
+            error[np.isinf(count)] = 0
+            upper = sign*mean + z*error
+            lower = sign*mean - z*error
+
+            # Drop the chromosomes which can't reach the survivors
+            if survivor_amount < len(chromosome_list):
+                threshold = np.partition(lower, len(lower) - survivor_amount)[len(lower) - survivor_amount]
+                alive = alive[upper[alive] >= threshold]
+
+            alive = alive[count[alive] < self.max_samples]
+
+        for i in sampled:
+            chromosome = chromosome_list[i]
+            chromosome.fitness = float(mean[i])
+            chromosome.fitness_samples = int(count[i])
+            chromosome.fitness_error = float(np.sqrt(m2[i] / (count[i] * (count[i]-1)))) if count[i] > 1 else inf
+            ga.statistics.changed(chromosome)
+
+        self.evaluations += evaluations
+        self.saved_evaluations += new_amount * self.max_samples - evaluations
+        ga.evaluation_count += evaluations
+
+        self.history.append({
+            'generation'        : ga.current_generation,
+            'chromosomes'       : len(sampled),
+            'evaluations'       : evaluations,
+            'saved_evaluations' : self.saved_evaluations,
+        })
+
+        return [chromosome_list[i] for i in sampled]
+
+
+def _normal_quantile(probability):
+    """Returns the standard normal quantile using bisection, since
+    statistics.NormalDist is only available from Python 3.8."""
+
+    low, high = -40.0, 40.0
+
+    for _ in range(100):
+        middle = (low + high) / 2
+        if (1 + erf(middle / sqrt(2))) / 2 < probability:
+            low = middle
+        else:
+            high = middle
+
+    return (low + high) / 2
@@ -0,0 +1,46 @@
+from EasyGA import GA, Racing
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+
+def make_noisy_ga():
+    """Creates a ga maximizing the first gene, measured with noise."""
+
+    ga = GA(seed = 2, chromosome_length = 1, population_size = 20, save_data = False)
+    ga.fitness_function_impl = lambda chromosome: chromosome[0].value + ga.rng.generator.normal()
+    ga.racing = Racing.Race(max_samples = 30, round_size = 5, survivor_ratio = 0.25)
+    return ga
+
+
+def test_race():
+    """Clearly worse chromosomes should be dropped early, saving evaluations,
+    while the survivors are sampled max_samples times."""
+
+    ga = make_noisy_ga()
+    ga.initialize_population()
+    for i, chromosome in enumerate(ga.population):
+        chromosome[0] = ga.make_gene(2*i)
+
+    ga.set_all_fitness()
+    ga.sort_by_best_fitness()
+
+    assert [chromosome[0].value for chromosome in ga.population[:5]] == [38, 36, 34, 32, 30]
+    assert all(chromosome.fitness_samples == 30 for chromosome in ga.population[:5])
+    assert all(chromosome.fitness_samples < 30 for chromosome in ga.population[-5:])
+    assert ga.racing.saved_evaluations > 0
+    assert ga.racing.evaluations + ga.racing.saved_evaluations == 20 * 30
+    assert ga.evaluation_count == ga.racing.evaluations
+
+
+def test_race_evolve():
+    """Survivors should keep gaining samples in later generations."""
+
+    ga = make_noisy_ga()
+    ga.gene_impl = lambda: ga.rng.uniform(0, 10)
+    ga.generation_goal = 10
+    ga.evolve()
+
+    assert ga.population[0].fitness_samples == 30
+    assert len(ga.racing.history) == 10
+    assert ga.racing.saved_evaluations > 0
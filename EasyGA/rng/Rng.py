@@ -0,0 +1,163 @@
+from bisect import bisect
+from math import floor
+
+import numpy as np
+
+
+class Random_Stream:
+    """Random number stream of a ga, backed by a numpy Generator, which
+    replaces the global random module so that runs can be reproduced
+
+        ga = GA(seed = 42)
+        ga.rng.random()
+        ga.rng.sample(ga.population, 5)
+        ga.rng.generator.random((10, 3))
+
+    The methods mirror the random module. Single floats are drawn from the
+    generator in blocks of block_size values, avoiding the per-call overhead
+    of the generator. Array draws should use the generator directly.
+    Independent child streams, e.g. for workers, are made using spawn,
+    and get_state/set_state save and restore the exact position of the
+    stream, e.g. for checkpoints.
+    """
+
+    def __init__(self, seed = None, block_size = 1024):
+        """Seeds the stream using an integer, a numpy SeedSequence,
+        or fresh entropy from the operating system if seed is None."""
+
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+
+        self.seed = seed
+        self.block_size = block_size
+        self.generator = np.random.Generator(np.random.PCG64(self.seed_sequence))
+        self.block = []
+        self.block_index = 0
+
+
+    def spawn(self, amount):
+        """Returns a list of independent child streams."""
+
+        return [
+            Random_Stream(seed_sequence, self.block_size)
+            for seed_sequence
+            in self.seed_sequence.spawn(amount)
+        ]
+
+
+    def get_state(self):
+        """Returns the state of the stream as a picklable dictionary."""
+
+        return {
+            'bit_generator' : self.generator.bit_generator.state,
+            'block'         : self.block[self.block_index:],
+        }
+
+
+    def set_state(self, state):
+        """Restores the state of the stream from get_state."""
+
+        self.generator.bit_generator.state = state['bit_generator']
+        self.block = list(state['block'])
+        self.block_index = 0
+
+
+    #=========================#
+    # random module methods:  #
+    #=========================#
+
+
+    def random(self):
+        """Returns a random float in [0, 1)."""
+
+        # Draw the next block
+        if self.block_index >= len(self.block):
+            self.block = self.generator.random(self.block_size).tolist()
+            self.block_index = 0
+
+        self.block_index += 1
+        return self.block[self.block_index - 1]
+
+
+    def uniform(self, a, b):
+        """Returns a random float between a and b."""
+        return a + (b-a) * self.random()
+
+
+    def randrange(self, start, stop = None):
+        """Returns a random integer from range(start, stop)."""
+
+        if stop is None:
+            start, stop = 0, start
+
+        if stop <= start:
+            raise ValueError(f"empty range for randrange({start}, {stop})")
+
+        return start + floor((stop-start) * self.random())
+
+
+    def randint(self, a, b):
+        """Returns a random integer from a to b, including b."""
+        return self.randrange(a, b+1)
+
+
+    def getrandbits(self, k):
+        """Returns an integer with k random bits."""
+
+        if k <= 0:
+            return 0
+
+        return int.from_bytes(self.generator.bytes((k+7) // 8), 'little') >> (-k % 8)
+
+
+    def choice(self, sequence):
+        """Returns a random item from the sequence."""
+
+        if len(sequence) == 0:
+            raise IndexError("Cannot choose from an empty sequence")
+
+        return sequence[self.randrange(len(sequence))]
+
+
+    def choices(self, population, weights = None, *, cum_weights = None, k = 1):
+        """Returns k random items from the population with replacement,
+        drawing the items with a single search over the cumulative weights."""
+
+        if weights is None and cum_weights is None:
+            return [population[index] for index in self.generator.integers(len(population), size = k).tolist()]
+
+        if cum_weights is None:
+            cum_weights = np.cumsum(weights, dtype = float)
+        else:
+            cum_weights = np.asarray(cum_weights, dtype = float)
+
+        if len(cum_weights) != len(population):
+            raise ValueError("The number of weights does not match the population")
+
+        # Single choice, avoiding the array overhead
+        if k == 1:
+            return [population[min(bisect(cum_weights.tolist(), self.random() * cum_weights[-1]), len(population)-1)]]
+
+        indexes = np.searchsorted(cum_weights, self.generator.random(k) * cum_weights[-1], side = 'right')
+        return [population[index] for index in np.minimum(indexes, len(population)-1).tolist()]
+
+
+    def sample(self, population, k):
+        """Returns k distinct random items from the population."""
+
+        if not 0 <= k <= len(population):
+            raise ValueError("Sample larger than population or is negative")
+
+        return [population[index] for index in self.generator.choice(len(population), k, replace = False).tolist()]
+
+
+    def shuffle(self, sequence):
+        """Shuffles the list in place."""
+        sequence[:] = [sequence[index] for index in self.generator.permutation(len(sequence)).tolist()]
+
+
+    def __repr__(self):
+        """Shows the seed, which is stored in the database config."""
+        return f"Random_Stream(seed = {self.seed!r})"
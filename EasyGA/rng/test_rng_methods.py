@@ -0,0 +1,59 @@
+import pickle
+
+from EasyGA import GA, Rng
+
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+
+def run_ga(seed):
+    """Returns the final gene values of a seeded run."""
+
+    ga = GA(seed = seed)
+    ga.generation_goal = 15
+    ga.save_data = False
+    ga.evolve()
+    return [chromosome.gene_value_list for chromosome in ga.population]
+
+
+def test_seeded_runs():
+    """Runs with the same seed should be identical."""
+
+    assert run_ga(7) == run_ga(7)
+    assert run_ga(7) != run_ga(8)
+
+
+def test_random_stream_methods():
+    """The stream should behave like the random module."""
+
+    rng = Rng.Random_Stream(0, block_size = 16)
+    items = list(range(10))
+
+    assert all(0 <= rng.random() < 1 for _ in range(100))
+    assert all(3 <= rng.randrange(3, 7) < 7 for _ in range(100))
+    assert all(0 <= rng.getrandbits(13) < 2**13 for _ in range(100))
+    assert sorted(rng.sample(items, 10)) == items
+    assert rng.choices(items, [0]*9 + [1], k = 5) == [9]*5
+    assert rng.choices(items, cum_weights = [0]*9 + [1]) == [9]
+
+    rng.shuffle(items)
+    assert sorted(items) == list(range(10))
+
+
+def test_random_stream_state():
+    """Restoring the state should repeat the stream exactly,
+    and spawned streams should differ from each other."""
+
+    rng = Rng.Random_Stream(3, block_size = 16)
+    rng.random()
+
+    state = pickle.loads(pickle.dumps(rng.get_state()))
+    values = [rng.random() for _ in range(40)]
+    rng.set_state(state)
+    assert [rng.random() for _ in range(40)] == values
+
+    child_1, child_2 = rng.spawn(2)
+    assert child_1.random() != child_2.random()
+    assert [stream.random() for stream in Rng.Random_Stream(3).spawn(2)] == \
+        [stream.random() for stream in Rng.Random_Stream(3).spawn(2)]
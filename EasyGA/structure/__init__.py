@@ -1,4 +1,7 @@
 # FROM (. means local) file_name IMPORT function_name
 from .gene import Gene
 from .chromosome import Chromosome
+from .bit_chromosome import Bit_Chromosome
+from .permutation_chromosome import Permutation_Chromosome
+from .array_chromosome import Array_Chromosome
 from .population import Population
\ No newline at end of file
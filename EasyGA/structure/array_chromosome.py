@@ -0,0 +1,259 @@
+import numpy as np
+
+from structure import Gene as make_gene
+from .chromosome import Chromosome
+
+
+class Array_Chromosome(Chromosome):
+    """Chromosome whose gene values are stored in a single numpy array.
+    Slicing returns an Array_Chromosome which is a view of the same array
+    instead of a list of genes, and concatenating chromosomes copies the
+    arrays once, so crossover methods such as
+
+        ga.population.add_child(parent_1[:index] + parent_2[index:])
+
+    make a child with a single allocation instead of one gene per value.
+    Views are read-only, since changing them would change the chromosome
+    they were sliced from without updating its hash; use copy() to get a
+    chromosome which can be changed. Gene objects are only created when
+    genes are accessed individually.
+
+        chromosome = Array_Chromosome([1.5, 2.0, 3.5])
+        chromosome = Array_Chromosome.from_array(np.zeros(10))
+    """
+
+    def __init__(self, gene_list = (), dtype = None):
+        """Initialize the chromosome with fitness value of None, and a
+        copy of the genes, gene values, array or Array_Chromosome given."""
+
+        if isinstance(gene_list, Array_Chromosome):
+            values = np.array(gene_list.values, dtype = dtype)
+        elif isinstance(gene_list, np.ndarray):
+            values = np.array(gene_list, dtype = dtype)
+        else:
+            values = np.array([
+                gene.value if isinstance(gene, make_gene) else gene
+                for gene
+                in gene_list
+            ], dtype = dtype)
+
+        self.values = values.reshape(-1)
+        self.fitness = None
+        self.changes = None
+        self._modified()
+
+
+    @classmethod
+    def from_array(cls, values):
+        """Returns a chromosome using the 1D array without copying it."""
+
+        chromosome = cls.__new__(cls)
+        chromosome.values = values
+        chromosome.fitness = None
+        chromosome.changes = None
+        chromosome._modified()
+        return chromosome
+
+
+    @staticmethod
+    def _to_array(gene_list):
+        """Returns the values of the genes as an array."""
+
+        if isinstance(gene_list, Array_Chromosome):
+            return gene_list.values
+
+        return np.array([
+            gene.value if isinstance(gene, make_gene) else gene
+            for gene
+            in gene_list
+        ])
+
+
+    def _set_values(self, values):
+        """Replaces every value, which stops tracking changes."""
+
+        self.values = np.array(values).reshape(-1)
+        self.changes = None
+        self._modified()
+
+
+    @property
+    def gene_list(self):
+        """Returns a new list of genes. Changing
+        it does not change the chromosome."""
+        return [make_gene(value) for value in self.values.tolist()]
+
+
+    @gene_list.setter
+    def gene_list(self, gene_list):
+        """Replaces the genes, which stops tracking changes."""
+        self._set_values(self._to_array(gene_list))
+
+
+    @property
+    def gene_value_list(self):
+        """Returns a list of gene values"""
+        return self.values.tolist()
+
+
+    @property
+    def gene_value_iter(self):
+        """Returns an iterable of gene values"""
+        return iter(self.values.tolist())
+
+
+    #==================================================#
+    # Magic-Dunder Methods replicating list structure. #
+    #==================================================#
+
+
+    def __iter__(self):
+        """Iterates over new genes."""
+        return iter(self.gene_list)
+
+
+    def __getitem__(self, index):
+        """Returns a new gene, or a read-only view of the genes for slices."""
+
+        # Single gene
+        if isinstance(index, (int, np.integer)):
+            return make_gene(self.values[index].item())
+
+        # Multiple genes, sharing the array for basic slices
+        values = self.values[index]
+        if np.may_share_memory(values, self.values):
+            values = values.view()
+            values.flags.writeable = False
+
+        return Array_Chromosome.from_array(values)
+
+
+    def __setitem__(self, index, gene):
+        """Sets the value of the gene, or the values of the genes for slices."""
+
+        # Single gene
+        if isinstance(index, (int, np.integer)):
+            index_list = [int(index) % len(self)]
+            values = gene.value if isinstance(gene, make_gene) else gene
+
+        # Multiple genes, copied first in case they are a view of this chromosome
+        else:
+            index_list = np.arange(len(self))[index].tolist()
+            values = np.array(self._to_array(gene))
+
+            # Resizing the chromosome can't be done in place
+            if len(values) != len(index_list):
+                new_values = self.values.tolist()
+                new_values[index] = values.tolist()
+                self._set_values(new_values)
+                return
+
+        if self.changes is not None:
+            for i in index_list:
+                self.changes.setdefault(i, self.values[i].item())
+
+        self.values[index] = values
+        self._modified()
+
+
+    def __delitem__(self, index):
+        """Deletes the genes, copying the remaining values."""
+        self._set_values(np.delete(self.values, np.arange(len(self))[index]))
+
+
+    def __len__(self):
+        """Returns the number of genes."""
+        return len(self.values)
+
+
+    def __contains__(self, gene):
+        """Checks if any value equals the gene."""
+        return bool((self.values == (gene.value if isinstance(gene, make_gene) else gene)).any())
+
+
+    def __eq__(self, chromosome):
+        """Returns self == chromosome, True if all genes match."""
+        if isinstance(chromosome, Array_Chromosome):
+            return np.array_equal(self.values, chromosome.values)
+        return self.gene_value_list == [gene.value for gene in chromosome]
+
+
+    # Defining __eq__ removes the inherited hash
+    __hash__ = Chromosome.__hash__
+
+
+    def __add__(self, chromosome):
+        """Return self + chromosome, a chromosome made by concatenating the values once."""
+        return Array_Chromosome.from_array(np.concatenate((self.values, self._to_array(chromosome))))
+
+
+    def __radd__(self, gene_list):
+        """Return gene_list + self, for lists of genes or values."""
+        return Array_Chromosome.from_array(np.concatenate((self._to_array(gene_list), self.values)))
+
+
+    def __iadd__(self, chromosome):
+        """Implement self += chromosome by concatenating the new values."""
+        self._set_values(np.concatenate((self.values, self._to_array(chromosome))))
+        return self
+
+
+    def append(self, gene):
+        """Append gene to the end of the chromosome."""
+        self += [gene]
+
+
+    def clear(self):
+        """Remove all genes from chromosome."""
+        self._set_values(self.values[:0])
+
+
+    def copy(self):
+        """Return a copy of the chromosome."""
+        return Array_Chromosome(self)
+
+
+    def count(self, gene):
+        """Return number of occurrences of the gene in the chromosome."""
+        return int((self.values == (gene.value if isinstance(gene, make_gene) else gene)).sum())
+
+
+    def index(self, gene, guess = None):
+        """Returns the index of the gene, see Chromosome.index."""
+
+        if guess is not None:
+            return super().index(gene, guess)
+
+        matches = np.flatnonzero(self.values == (gene.value if isinstance(gene, make_gene) else gene))
+
+        if len(matches) == 0:
+            raise ValueError("No such gene in the chromosome found")
+
+        return int(matches[0])
+
+
+    def insert(self, index, gene):
+        """Insert gene so that self[index] == gene."""
+        self._set_values(np.insert(self.values, index, gene.value if isinstance(gene, make_gene) else gene))
+
+
+    def pop(self, index = -1):
+        """Remove and return gene at index (default last)."""
+        gene = self[index]
+        del self[index]
+        return gene
+
+
+    def remove(self, gene):
+        """Remove first occurrence of gene."""
+        del self[self.index(gene)]
+
+
+    def __repr__(self):
+        """Returns the list of gene values, as for Chromosome."""
+        return repr(self.gene_value_list)
+
+
+    def __str__(self):
+        """Returns the genes as [1.5][2.0]..., as for Chromosome."""
+        return ''.join(f'[{value}]' for value in self.values.tolist())
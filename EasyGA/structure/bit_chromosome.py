@@ -0,0 +1,330 @@
+import random
+
+import numpy as np
+
+from structure import Gene as make_gene
+from .chromosome import Chromosome
+
+
+# Number of set bits in an integer, using int.bit_count if available
+if hasattr(int, 'bit_count'):
+    popcount = int.bit_count
+else:
+    popcount = lambda bits: bin(bits).count('1')
+
+
+def random_mask(length, probability = 0.5, rng = None):
+    """Returns an integer whose first length bits are each set with the
+    given probability, using the random stream rng (e.g. ga.rng) if given."""
+
+    if length <= 0 or probability <= 0:
+        return 0
+
+    # Every random bit is used directly
+    if probability == 0.5:
+        return (rng or random).getrandbits(length)
+
+    bits = (np.random if rng is None else rng.generator).random(length) < probability
+    return int.from_bytes(np.packbits(bits, bitorder = 'little').tobytes(), 'little')
+
+
+def set_bit_indexes(bits):
+    """Returns the indexes of the set bits, from lowest to highest."""
+
+    indexes = []
+    while bits:
+        lowest = bits & -bits
+        indexes.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return indexes
+
+
+class Bit_Chromosome(Chromosome):
+    """Chromosome of 0/1 genes packed into the bits of a single integer,
+    where gene i is bit i, using about one bit of memory per gene instead
+    of a Gene object per gene. Behaves like a Chromosome of 0/1 genes,
+    creating Gene objects only when genes are accessed individually, but
+    bitwise operators and popcount work on the packed bits directly.
+
+        chromosome = Bit_Chromosome([1, 0, 1, 1])
+        chromosome = Bit_Chromosome.from_bits(0b1101, length = 4)
+        chromosome = Bit_Chromosome.random(length = 100)
+    """
+
+    def __init__(self, gene_list = ()):
+        """Initialize the chromosome with fitness value of None, and
+        the bits of the 0/1 genes, gene values or Bit_Chromosome given."""
+
+        # Copy the packed bits directly
+        if isinstance(gene_list, Bit_Chromosome):
+            bits, length = gene_list.bits, gene_list.length
+        else:
+            bits, length = self._pack(gene_list)
+
+        self.bits = bits
+        self.length = length
+        self.fitness = None
+        self.changes = None
+        self._modified()
+
+
+    @classmethod
+    def from_bits(cls, bits, length):
+        """Returns a chromosome with the given packed bits."""
+
+        chromosome = cls()
+        chromosome.bits = bits & ((1 << length) - 1)
+        chromosome.length = length
+        return chromosome
+
+
+    @classmethod
+    def random(cls, length, rng = None):
+        """Returns a chromosome with random bits."""
+        return cls.from_bits(random_mask(length, rng = rng), length)
+
+
+    @staticmethod
+    def _pack(gene_list):
+        """Returns the packed bits and the number of genes."""
+
+        values = [
+            gene.value if isinstance(gene, make_gene) else gene
+            for gene
+            in gene_list
+        ]
+
+        if any(value not in (0, 1) for value in values):
+            raise ValueError("Bit chromosomes can only contain 0 and 1.")
+
+        bits = int(''.join(str(int(value)) for value in reversed(values)) or '0', 2)
+        return bits, len(values)
+
+
+    def _set_values(self, values):
+        """Replaces every gene with the given 0/1 values or genes."""
+        self.bits, self.length = self._pack(values)
+        self._modified()
+
+
+    @property
+    def mask(self):
+        """Returns an integer with a set bit for every gene."""
+        return (1 << self.length) - 1
+
+
+    def popcount(self):
+        """Returns the number of genes equal to 1."""
+        return popcount(self.bits)
+
+
+    @property
+    def gene_list(self):
+        """Returns a new list of genes. Changing
+        it does not change the chromosome."""
+        return [make_gene(value) for value in self.gene_value_iter]
+
+
+    @gene_list.setter
+    def gene_list(self, gene_list):
+        """Replaces the genes, which stops tracking changes."""
+        self.changes = None
+        self._set_values(gene_list)
+
+
+    @property
+    def gene_value_list(self):
+        """Returns a list of gene values"""
+        return list(self.gene_value_iter)
+
+
+    @property
+    def gene_value_iter(self):
+        """Returns an iterable of gene values"""
+        return map(int, reversed(format(self.bits, f'0{self.length}b'))) if self.length > 0 else iter(())
+
+
+    #==================================================#
+    # Magic-Dunder Methods replicating list structure. #
+    #==================================================#
+
+
+    def __iter__(self):
+        """Iterates over new genes."""
+        return iter(self.gene_list)
+
+
+    def __getitem__(self, index):
+        """Returns a new gene, or a list of new genes for slices."""
+
+        # Single gene
+        if isinstance(index, int):
+            if not -self.length <= index < self.length:
+                raise IndexError("chromosome index out of range")
+            return make_gene((self.bits >> (index % self.length)) & 1)
+
+        # Multiple genes
+        return self.gene_list[index]
+
+
+    def __setitem__(self, index, gene):
+        """Sets the bit of the gene, or the bits of the genes for slices."""
+
+        # Fall back to the list of values for slices
+        if not isinstance(index, int):
+            old_values = self.gene_value_list
+            old_bits, old_length = self.bits, self.length
+            values = list(old_values)
+            values[index] = gene
+            self._set_values(values)
+
+            # Record the changed bits, unless resized
+            if self.changes is not None and self.length != old_length:
+                self.changes = None
+            elif self.changes is not None:
+                for i in set_bit_indexes(self.bits ^ old_bits):
+                    self.changes.setdefault(i, old_values[i])
+            return
+
+        if not -self.length <= index < self.length:
+            raise IndexError("chromosome assignment index out of range")
+
+        index %= self.length
+        value = gene.value if isinstance(gene, make_gene) else gene
+
+        if value not in (0, 1):
+            raise ValueError("Bit chromosomes can only contain 0 and 1.")
+
+        if self.changes is not None:
+            self.changes.setdefault(index, (self.bits >> index) & 1)
+
+        self.bits = (self.bits & ~(1 << index)) | (int(value) << index)
+        self._modified()
+
+
+    def flip(self, mask):
+        """Flips the genes of the set bits in the mask."""
+
+        mask &= self.mask
+
+        if self.changes is not None:
+            for index in set_bit_indexes(mask):
+                self.changes.setdefault(index, (self.bits >> index) & 1)
+
+        self.bits ^= mask
+        self._modified()
+
+
+    def __delitem__(self, index):
+        """Deletes the gene, shifting the following bits down."""
+        values = self.gene_value_list
+        del values[index]
+        self.changes = None
+        self._set_values(values)
+
+
+    def __len__(self):
+        """Returns the number of genes."""
+        return self.length
+
+
+    def __contains__(self, gene):
+        """Checks if any bit equals the gene."""
+        value = gene.value if isinstance(gene, make_gene) else gene
+        return self.length > 0 and (
+            (value == 1 and self.bits != 0)
+            or (value == 0 and self.bits != self.mask)
+        )
+
+
+    def __eq__(self, chromosome):
+        """Returns self == chromosome, True if all genes match."""
+        if isinstance(chromosome, Bit_Chromosome):
+            return self.length == chromosome.length and self.bits == chromosome.bits
+        return self.gene_value_list == [gene.value for gene in chromosome]
+
+
+    # Defining __eq__ removes the inherited hash
+    __hash__ = Chromosome.__hash__
+
+
+    def __add__(self, chromosome):
+        """Return self + chromosome, a chromosome made by concatenating the genes."""
+        if isinstance(chromosome, Bit_Chromosome):
+            return Bit_Chromosome.from_bits(self.bits | (chromosome.bits << self.length), self.length + chromosome.length)
+        return Bit_Chromosome(self.gene_value_list + [gene.value if isinstance(gene, make_gene) else gene for gene in chromosome])
+
+
+    def __iadd__(self, chromosome):
+        """Implement self += chromosome by concatenating the new genes."""
+        result = self + chromosome
+        self.changes = None
+        self.bits, self.length = result.bits, result.length
+        self._modified()
+        return self
+
+
+    def append(self, gene):
+        """Append gene to the end of the chromosome."""
+        self += [gene]
+
+
+    def clear(self):
+        """Remove all genes from chromosome."""
+        self.changes = None
+        self.bits, self.length = 0, 0
+        self._modified()
+
+
+    def copy(self):
+        """Return a copy of the chromosome."""
+        return Bit_Chromosome(self)
+
+
+    def count(self, gene):
+        """Return number of occurrences of the gene in the chromosome, using popcount."""
+        value = gene.value if isinstance(gene, make_gene) else gene
+        ones = self.popcount()
+        return ones if value == 1 else self.length - ones if value == 0 else 0
+
+
+    def index(self, gene, guess = None):
+        """Returns the index of the gene, see Chromosome.index."""
+        return super().index(gene, guess) if guess is not None else self.gene_value_list.index(
+            gene.value if isinstance(gene, make_gene) else gene
+        )
+
+
+    def insert(self, index, gene):
+        """Insert gene so that self[index] == gene."""
+        values = self.gene_value_list
+        values.insert(index, gene)
+        self.changes = None
+        self._set_values(values)
+
+
+    def pop(self, index = -1):
+        """Remove and return gene at index (default last)."""
+        values = self.gene_value_list
+        value = values.pop(index)
+        self.changes = None
+        self._set_values(values)
+        return make_gene(value)
+
+
+    def remove(self, gene):
+        """Remove first occurrence of gene."""
+        values = self.gene_value_list
+        values.remove(gene.value if isinstance(gene, make_gene) else gene)
+        self.changes = None
+        self._set_values(values)
+
+
+    def __repr__(self):
+        """Returns the list of gene values, as for Chromosome."""
+        return repr(self.gene_value_list)
+
+
+    def __str__(self):
+        """Returns the genes as [1][0]..., as for Chromosome."""
+        return ''.join(f'[{value}]' for value in self.gene_value_iter)
@@ -1,5 +1,7 @@
 from structure import Gene as make_gene
+from structure.gene import immutable_types
 from itertools import chain
+from copy import deepcopy
 
 def to_gene(gene):
     """Converts the input to a gene if it isn't already one."""
@@ -11,6 +13,27 @@ def to_gene(gene):
 
 
 class Chromosome():
+    """A list of genes with a fitness.
+
+    The key and hash of the gene values are cached and cleared when the
+    chromosome is changed through its methods, e.g. chromosome[i] = value.
+    Changing a gene in place, e.g. chromosome[i].value = value, or a mutable
+    gene value, doesn't clear them, so the chromosome is then found under its
+    old contents by populations, sets and dictionaries. Set the gene again
+    after changing it in place, e.g. chromosome[i] = chromosome[i].value."""
+
+    # Number of modifications made to any chromosome, used to
+    # check if indexes over chromosome contents are still valid
+    modification_count = 0
+
+    # If the chromosome may be referenced from elsewhere, in which
+    # case it is copied before being changed, see Population.writable
+    shared = False
+
+    # If the chromosome was made by a population, in which case it may be
+    # reused for new children once it leaves, see Population.update
+    recyclable = False
+
 
     def __init__(self, gene_list):
         """Initialize the chromosome with fitness value of None, and a
@@ -19,6 +42,77 @@ class Chromosome():
         self.gene_list = [make_gene(gene) for gene in gene_list]
         self.fitness = None
 
+        # Old values of the changed genes by index while changes are
+        # tracked, see track_changes, otherwise None
+        self.changes = None
+
+
+    @property
+    def gene_list(self):
+        """Returns the list of genes."""
+        return self._gene_list
+
+
+    @gene_list.setter
+    def gene_list(self, gene_list):
+        """Replaces the list of genes, which stops tracking changes."""
+        self._gene_list = gene_list
+        self.changes = None
+        self._modified()
+
+
+    def _modified(self):
+        """Clears the cached key and hash after the genes are changed."""
+        self._key = None
+        self._hash = None
+        Chromosome.modification_count += 1
+
+
+    @property
+    def key(self):
+        """Returns a hashable key of the gene values, which is equal for
+        equal chromosomes of any type, like the hash. Cached until the
+        chromosome is changed through its methods. Unhashable gene values
+        use their repr instead."""
+
+        if self._key is None:
+            key = tuple(self.gene_value_iter)
+            try:
+                hash(key)
+            except TypeError:
+                key = repr(list(key))
+            self._key = key
+
+        return self._key
+
+
+    def track_changes(self):
+        """Starts recording the old value of every gene set using
+        chromosome[index] = gene. Changes to the length of the
+        chromosome stop the tracking, setting changes back to None."""
+        self.changes = {}
+
+
+    def _record_changes(self, index, amount = None):
+        """Records the old values at the index or slice
+        before amount genes are set there."""
+
+        # Single gene
+        if isinstance(index, int):
+            index_list = (index % len(self),)
+
+        # Multiple genes
+        else:
+            index_list = range(*index.indices(len(self)))
+
+            # Resizing the chromosome can't be tracked
+            if len(index_list) != amount:
+                self.changes = None
+                return
+
+        for i in index_list:
+            self.changes.setdefault(i, self.gene_list[i].value)
+
 
     @property
     def gene_value_list(self):
@@ -73,11 +167,17 @@ class Chromosome():
 
         # Single gene
         if isinstance(index, int):
-            self.gene_list[index] = to_gene(gene)
+            gene = to_gene(gene)
 
         # Multiple genes
         else:
-            self.gene_list[index] = [to_gene(item) for item in gene]
+            gene = [to_gene(item) for item in gene]
+
+        if self.changes is not None:
+            self._record_changes(index, None if isinstance(index, int) else len(gene))
+
+        self.gene_list[index] = gene
+        self._modified()
 
 
     def __delitem__(self, index):
@@ -86,7 +186,9 @@ class Chromosome():
                 del chromosome[index]
         to delete a gene at the specified index.
         """
+        self.changes = None
         del self.gene_list[index]
+        self._modified()
 
 
     def __len__(self):
@@ -112,6 +214,22 @@ class Chromosome():
         return self.gene_list == chromosome.gene_list
 
 
+    def __hash__(self):
+        """Returns a hash of the gene values, so that equal chromosomes of any
+        type have equal hashes. Cached until the chromosome is changed through
+        its methods, so chromosomes in sets or used as dictionary keys must
+        not be changed. Unhashable gene values use their repr instead."""
+
+        if self._hash is None:
+            values = tuple(self.gene_value_iter)
+            try:
+                self._hash = hash(values)
+            except TypeError:
+                self._hash = hash(repr(list(values)))
+
+        return self._hash
+
+
     def __add__(self, chromosome):
         """Return self + chromosome, a chromosome made by concatenating the genes."""
         return Chromosome(chain(self, chromosome))
@@ -119,12 +237,15 @@ class Chromosome():
 
     def __iadd__(self, chromosome):
         """Implement self += chromosome by concatenating the new genes."""
+        self.changes = None
         self.gene_list += (to_gene(gene) for gene in chromosome)
 
 
     def append(self, gene):
         """Append gene to the end of the chromosome."""
+        self.changes = None
         self.gene_list.append(to_gene(gene))
+        self._modified()
 
 
     def clear(self):
@@ -137,6 +258,28 @@ class Chromosome():
         return Chromosome(self)
 
 
+    def overwrite(self, gene_list):
+        """Replaces the genes with copies of the given genes or values and
+        resets the fitness, reusing the existing Gene objects if the length
+        matches. Used for recycling chromosomes, see Population.update."""
+
+        gene_list = list(gene_list)
+
+        # Different length, make new genes
+        if len(gene_list) != len(self._gene_list):
+            self.gene_list = [make_gene(gene) for gene in gene_list]
+
+        # Same length, copy the values into the genes
+        else:
+            for gene, value in zip(self._gene_list, gene_list):
+                value = value.value if isinstance(value, make_gene) else value
+                gene.value = value if type(value) in immutable_types else deepcopy(value)
+            self.changes = None
+            self._modified()
+
+        self.fitness = None
+
+
     def count(self, gene):
         """Return number of occurrences of the gene in the chromosome."""
         return self.gene_list.count(to_gene(gene))
@@ -182,7 +325,9 @@ class Chromosome():
 
     def insert(self, index, gene):
         """Insert gene so that self[index] == gene."""
+        self.changes = None
         self.gene_list.insert(index, to_gene(gene))
+        self._modified()
 
 
     def pop(self, index = -1):
@@ -190,6 +335,8 @@ class Chromosome():
 
         Raises IndexError if chromosome is empty or index is out of range.
         """
+        self.changes = None
+        self._modified()
         return self.gene_list.pop(index)
 
 
@@ -198,7 +345,9 @@ class Chromosome():
 
         Raises ValueError if the gene in not present.
         """
+        self.changes = None
         self.gene_list.remove(to_gene(gene))
+        self._modified()
 
 
     def __repr__(self):
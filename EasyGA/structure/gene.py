@@ -1,17 +1,30 @@
 from copy import deepcopy
 
+# Values which can be shared between genes instead of being copied
+immutable_types = frozenset((int, float, complex, bool, str, bytes, type(None)))
+
 class Gene:
+    """A single value of a chromosome.
+
+    Changing gene.value directly isn't seen by the chromosome, whose key
+    and hash are cached, so chromosomes in populations, sets or dictionary
+    keys must be changed through their methods, e.g. chromosome[i] = value."""
 
     def __init__(self, value):
         """Initialize a gene with the input value."""
 
-        # Copy another gene
-        try:
-            self.value = deepcopy(value.value)
-
-        # Otherwise copy the given value
-        except:
-            self.value = deepcopy(value)
+        # Share immutable values, skipping deepcopy
+        if type(value) in immutable_types:
+            self.value = value
+        elif type(value) is Gene and type(value.value) in immutable_types:
+            self.value = value.value
+
+        # Copy another gene, otherwise copy the given value
+        else:
+            try:
+                self.value = deepcopy(value.value)
+            except:
+                self.value = deepcopy(value)
 
 
     def __eq__(self, other_gene):
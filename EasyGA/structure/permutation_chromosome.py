@@ -0,0 +1,261 @@
+import numpy as np
+
+from structure import Gene as make_gene
+from .chromosome import Chromosome
+
+
+class Permutation_Chromosome(Chromosome):
+    """Chromosome whose genes are a permutation of 0, 1, ..., n-1, stored as
+    an integer array together with the inverse array of the position of
+    each value. Finding a gene with index, swapping genes and measuring
+    distances between permutations use the arrays directly instead of
+    comparing Gene objects. The length is fixed, and every change must
+    leave the genes as a permutation once it is finished, e.g.
+
+        chromosome[i], chromosome[j] = chromosome[j], chromosome[i]
+        chromosome[i:j] = reversed(chromosome[i:j])
+    """
+
+    def __init__(self, gene_list = ()):
+        """Initialize the chromosome with fitness value of None, and
+        the genes, gene values or Permutation_Chromosome given."""
+
+        # Copy the arrays directly
+        if isinstance(gene_list, Permutation_Chromosome):
+            self.order = gene_list.order.copy()
+            self.position = gene_list.position.copy()
+        else:
+            self._set_values(gene_list)
+
+        self.fitness = None
+        self.changes = None
+        self._modified()
+
+
+    @classmethod
+    def random(cls, length, rng = None):
+        """Returns a chromosome with a random permutation, using
+        the random stream rng (e.g. ga.rng) if given."""
+
+        generator = np.random.default_rng() if rng is None else rng.generator
+        return cls(generator.permutation(length))
+
+
+    def _set_values(self, gene_list):
+        """Replaces every gene, checking that they form a permutation."""
+
+        order = np.array([
+            gene.value if isinstance(gene, make_gene) else gene
+            for gene
+            in gene_list
+        ], dtype = np.int64)
+
+        position = np.full(len(order), -1, dtype = np.int64)
+
+        if len(order) > 0 and (order.min() < 0 or order.max() >= len(order)):
+            raise ValueError("Permutation chromosomes must contain each of 0, 1, ..., n-1 once.")
+
+        position[order] = np.arange(len(order))
+
+        if (position < 0).any():
+            raise ValueError("Permutation chromosomes must contain each of 0, 1, ..., n-1 once.")
+
+        self.order = order
+        self.position = position
+        self._modified()
+
+
+    def _resize(self, *args):
+        """Permutation chromosomes can't change length."""
+        raise TypeError("Permutation chromosomes have a fixed length.")
+
+
+    @property
+    def gene_list(self):
+        """Returns a new list of genes. Changing
+        it does not change the chromosome."""
+        return [make_gene(value) for value in self.order.tolist()]
+
+
+    @gene_list.setter
+    def gene_list(self, gene_list):
+        """Replaces the genes, which stops tracking changes."""
+        self.changes = None
+        self._set_values(gene_list)
+
+
+    @property
+    def gene_value_list(self):
+        """Returns a list of gene values"""
+        return self.order.tolist()
+
+
+    @property
+    def gene_value_iter(self):
+        """Returns an iterable of gene values"""
+        return iter(self.order.tolist())
+
+
+    #=======================#
+    # Permutation methods:  #
+    #=======================#
+
+
+    def swap(self, index_1, index_2):
+        """Swaps two genes in O(1)."""
+        self[index_1], self[index_2] = self[index_2], self[index_1]
+
+
+    def reverse(self, start, end):
+        """Reverses the genes from start to end (exclusive), which is the 2-opt move for tours."""
+
+        if end - start > 1:
+            self[start:end] = self.order[start:end][::-1]
+
+
+    def move(self, index_1, index_2):
+        """Moves the gene at index_1 to index_2, shifting the genes in between."""
+
+        if index_1 < index_2:
+            self[index_1:index_2+1] = np.roll(self.order[index_1:index_2+1], -1)
+        elif index_2 < index_1:
+            self[index_2:index_1+1] = np.roll(self.order[index_2:index_1+1], 1)
+
+
+    def hamming_distance(self, chromosome):
+        """Returns the number of positions with different genes."""
+        return int((self.order != chromosome.order).sum())
+
+
+    def adjacency_distance(self, chromosome):
+        """Returns the number of edges between consecutive genes, including the
+        edge from the last gene back to the first, which aren't in the other
+        chromosome in either direction. Useful for tours, where it doesn't
+        depend on the starting point or direction."""
+
+        if len(self) < 2:
+            return 0
+
+        next_values = np.roll(self.order, -1)
+        other_position = chromosome.position[self.order]
+        other_next = chromosome.order[(other_position + 1) % len(self)]
+        other_previous = chromosome.order[other_position - 1]
+
+        return int(len(self) - ((next_values == other_next) | (next_values == other_previous)).sum())
+
+
+    #==================================================#
+    # Magic-Dunder Methods replicating list structure. #
+    #==================================================#
+
+
+    def __iter__(self):
+        """Iterates over new genes."""
+        return iter(self.gene_list)
+
+
+    def __getitem__(self, index):
+        """Returns a new gene, or a list of new genes for slices."""
+
+        # Single gene
+        if isinstance(index, (int, np.integer)):
+            return make_gene(int(self.order[index]))
+
+        # Multiple genes
+        return [make_gene(value) for value in self.order[index].tolist()]
+
+
+    def __setitem__(self, index, gene):
+        """Sets the gene and its position. The genes are only
+        a permutation again once all changes are finished."""
+
+        # Single gene
+        if isinstance(index, (int, np.integer)):
+            index = int(index) % len(self)
+            index_list = np.array([index])
+            values = np.array([gene.value if isinstance(gene, make_gene) else gene], dtype = np.int64)
+
+        # Multiple genes
+        else:
+            index_list = np.arange(len(self))[index]
+            values = np.array([
+                item.value if isinstance(item, make_gene) else item
+                for item
+                in gene
+            ], dtype = np.int64)
+
+            if len(values) != len(index_list):
+                self._resize()
+
+        if len(values) > 0 and (values.min() < 0 or values.max() >= len(self)):
+            raise ValueError("Permutation chromosomes must contain each of 0, 1, ..., n-1 once.")
+
+        # Record the old values
+        if self.changes is not None:
+            for i, value in zip(index_list.tolist(), self.order[index_list].tolist()):
+                self.changes.setdefault(i, value)
+
+        self.order[index_list] = values
+        self.position[values] = index_list
+        self._modified()
+
+
+    # Permutations have a fixed length
+    __delitem__ = __iadd__ = append = clear = insert = pop = remove = _resize
+
+
+    def __len__(self):
+        """Returns the number of genes."""
+        return len(self.order)
+
+
+    def __contains__(self, gene):
+        """Checks if the value is in 0, 1, ..., n-1 in O(1)."""
+        value = gene.value if isinstance(gene, make_gene) else gene
+        return isinstance(value, (int, np.integer)) and 0 <= value < len(self)
+
+
+    def __eq__(self, chromosome):
+        """Returns self == chromosome, True if all genes match."""
+        if isinstance(chromosome, Permutation_Chromosome):
+            return np.array_equal(self.order, chromosome.order)
+        return self.gene_value_list == [gene.value for gene in chromosome]
+
+
+    # Defining __eq__ removes the inherited hash
+    __hash__ = Chromosome.__hash__
+
+
+    def __add__(self, chromosome):
+        """Concatenated permutations are plain chromosomes."""
+        return Chromosome(self.gene_value_list + [gene.value for gene in chromosome])
+
+
+    def copy(self):
+        """Return a copy of the chromosome."""
+        return Permutation_Chromosome(self)
+
+
+    def count(self, gene):
+        """Return number of occurrences of the gene in the chromosome."""
+        return int(gene in self)
+
+
+    def index(self, gene, guess = None):
+        """Returns the index of the gene in O(1) using the position array.
+        The guess is ignored since every gene occurs once."""
+
+        if gene not in self:
+            raise ValueError("No such gene in the chromosome found")
+
+        return int(self.position[gene.value if isinstance(gene, make_gene) else gene])
+
+
+    def __repr__(self):
+        """Returns the list of gene values, as for Chromosome."""
+        return repr(self.gene_value_list)
+
+
+    def __str__(self):
+        """Returns the genes as [2][0][1]..., as for Chromosome."""
+        return ''.join(f'[{value}]' for value in self.order.tolist())
@@ -16,17 +16,133 @@ class Population:
         """Initialize the population with a collection
         of chromosomes dependant on user-passed parameter."""
 
-        self.chromosome_list = [make_chromosome(chromosome) for chromosome in chromosome_list]
+        self.chromosome_list = [
+            chromosome.copy() if isinstance(chromosome, make_chromosome) else make_chromosome(chromosome)
+            for chromosome
+            in chromosome_list
+        ]
+        for chromosome in self._chromosome_list:
+            chromosome.recyclable = True
         self.mating_pool = []
         self.next_population = []
 
+        # Chromosomes which left the population, reused for new
+        # children when double buffered, see update, otherwise None
+        self.spare_chromosomes = None
+
+
+    @property
+    def chromosome_list(self):
+        """Returns the list of chromosomes."""
+        return self._chromosome_list
+
+
+    @chromosome_list.setter
+    def chromosome_list(self, chromosome_list):
+        """Replaces the list of chromosomes."""
+        self._chromosome_list = chromosome_list
+        self._modified()
+
+
+    def _modified(self):
+        """Invalidates the content index after the chromosomes are changed."""
+        self._content_index = None
+
+
+    def content_index(self):
+        """Returns a dictionary from chromosome keys to the indexes of the
+        chromosomes with that key. Rebuilt if the population or any
+        chromosome was modified since it was last built, reusing the cached
+        keys of the chromosomes which weren't modified."""
 
-    def update(self):
+        if self._content_index is None or self._content_index_count != make_chromosome.modification_count:
+
+            index = {}
+            for i, chromosome in enumerate(self._chromosome_list):
+                index.setdefault(chromosome.key, []).append(i)
+
+            self._content_index = index
+            self._content_index_count = make_chromosome.modification_count
+
+        return self._content_index
+
+
+    def update(self, double_buffered = False):
         """Sets all the population variables to what they should be at
-        the end of the generation """
+        the end of the generation.
+
+        If double_buffered is True, the lists of the current and next
+        population swap roles instead of being replaced, and chromosomes
+        which didn't survive are kept as spare chromosomes. New children
+        given as lists of genes are then written into the spare chromosomes
+        by add_child instead of allocating new chromosomes and genes.
+
+        Only chromosomes made by the population, from the initial list or
+        from lists of genes given to add_child, are reused. Chromosomes
+        given to add_child are never changed. References to chromosomes
+        made by the population don't survive a generation once they leave
+        it, so chromosomes kept elsewhere, e.g. in an archive, should be
+        copies."""
+
+        # Survivors and repeated chromosomes are shared
+        self._mark_shared()
+
+        if not double_buffered:
+            self.spare_chromosomes = None
+            self.chromosome_list = self.next_population
+            self.reset_mating_pool()
+            self.reset_next_population()
+            return
+
+        if self.spare_chromosomes is None:
+            self.spare_chromosomes = []
+
+        # Keep the plain chromosomes which didn't survive, up to one population of them
+        survivors = {id(chromosome) for chromosome in self.next_population}
+        self.spare_chromosomes.extend(
+            chromosome
+            for chromosome
+            in self._chromosome_list
+            if id(chromosome) not in survivors
+            if type(chromosome) is make_chromosome and chromosome.recyclable
+        )
+        del self.spare_chromosomes[len(self.next_population):]
+
+        # Swap the buffers
+        back_buffer = self._chromosome_list
         self.chromosome_list = self.next_population
-        self.reset_mating_pool()
-        self.reset_next_population()
+        back_buffer.clear()
+        self.next_population = back_buffer
+        self.mating_pool.clear()
+
+
+    def _mark_shared(self):
+        """Marks the chromosomes of the next population which are in the current
+        population, e.g. survivors, or which are repeated as shared."""
+
+        seen = {id(chromosome) for chromosome in self._chromosome_list}
+
+        for chromosome in self.next_population:
+            if id(chromosome) in seen:
+                chromosome.shared = True
+            seen.add(id(chromosome))
+
+
+    def writable(self, index):
+        """Returns the indexed chromosome for changing it in place. Shared
+        chromosomes are first replaced by a copy with the same fitness
+        (copy-on-write), so survivors can be kept without copying them
+        unless they are actually changed."""
+
+        chromosome = self._chromosome_list[index]
+
+        if chromosome.shared:
+            copy = chromosome.copy()
+            copy.fitness = chromosome.fitness
+            self._chromosome_list[index] = chromosome = copy
+            self._modified()
+
+        return chromosome
 
 
     def reset_mating_pool(self):
@@ -41,6 +157,7 @@ class Population:
 
     def remove_chromosome(self, index):
         """Removes and returns a chromosome from the indicated index from the population"""
+        self._modified()
         return self.chromosome_list.pop(index)
 
 
@@ -71,6 +188,7 @@ class Population:
         if index is None:
             index = len(self)
         self.chromosome_list.insert(index, to_chromosome(chromosome))
+        self._modified()
 
 
     def add_parent(self, chromosome):
@@ -79,8 +197,19 @@ class Population:
 
 
     def add_child(self, chromosome):
-        """Adds a chromosome to the next population"""
-        self.next_population.append(to_chromosome(chromosome))
+        """Adds a chromosome to the next population, reusing
+        a spare chromosome for lists of genes if there is one."""
+
+        if isinstance(chromosome, make_chromosome):
+            self.next_population.append(chromosome)
+        elif self.spare_chromosomes:
+            spare = self.spare_chromosomes.pop()
+            spare.overwrite(chromosome)
+            self.next_population.append(spare)
+        else:
+            child = make_chromosome(chromosome)
+            child.recyclable = True
+            self.next_population.append(child)
 
 
     def set_parent(self, index):
@@ -126,10 +255,12 @@ class Population:
         # Just one chromosome
         if isinstance(index, int):
             self.chromosome_list[index] = to_chromosome(chromosome)
+            self._modified()
 
         # Multiple chromosomes
         else:
             self.chromosome_list[index] = [to_chromosome(item) for item in chromosome]
+            self._modified()
 
 
     def __delitem__(self, index):
@@ -139,6 +270,7 @@ class Population:
         to delete a chromosome at the specified index.
         """
         del self.chromosome_list[index]
+        self._modified()
 
 
     def __len__(self):
@@ -155,8 +287,9 @@ class Population:
         Allows the user to use
                 if chromosome in population
         to check if a chromosome is in the population.
+        Uses the content index instead of comparing every chromosome.
         """
-        return (to_chromosome(chromosome) in self.chromosome_list)
+        return (to_chromosome(chromosome).key in self.content_index())
 
 
     def __eq__(self, population):
@@ -177,6 +310,7 @@ class Population:
     def append(self, chromosome):
         """Append chromosome to the end of the population."""
         self.chromosome_list.append(to_chromosome(chromosome))
+        self._modified()
 
 
     def clear(self):
@@ -191,7 +325,7 @@ class Population:
 
     def count(self, chromosome):
         """Return number of occurrences of the chromosome in the population."""
-        return self.chromosome_list.count(to_chromosome(chromosome))
+        return len(self.content_index().get(to_chromosome(chromosome).key, ()))
 
 
     def index(self, chromosome, guess = None):
@@ -203,37 +337,37 @@ class Population:
 
         If no guess is given, it finds the index of the first match.
         If a guess is given, it finds index of the nearest match.
+        Uses the content index instead of comparing every chromosome.
         """
 
-        chromosome = to_chromosome(chromosome)
+        index_list = self.content_index().get(to_chromosome(chromosome).key)
 
         # Use built-in method
         if guess is None:
-            return self.chromosome_list.index(chromosome)
-
-        # Use symmetric mod
-        guess %= len(self)
-        if guess >= len(self)//2:
-            guess -= len(self)
-
-        # Search outwards for the chromosome
-        for i in range(len(self)//2):
-
-            # Search to the left
-            if chromosome == self[guess-i]:
-                return (guess-i) % len(self)
-
-            # Search to the right
-            elif chromosome == self[guess+i]:
-                return (guess+i) % len(self)
+            if index_list is None:
+                raise ValueError("No such chromosome in the population found")
+            return index_list[0]
 
         # Chromosome not found
-        raise IndexError("No such chromosome in the population found")
+        if index_list is None:
+            raise IndexError("No such chromosome in the population found")
+
+        # Find the nearest match, wrapping around the population
+        # and preferring matches to the left of the guess
+        guess %= len(self)
+        return min(
+            index_list,
+            key = lambda index: (
+                min((guess - index) % len(self), (index - guess) % len(self)),
+                (index - guess) % len(self) < (guess - index) % len(self),
+            )
+        )
 
 
     def insert(self, index, chromosome):
         """Insert chromosome so that self[index] == chromsome."""
         self.chromosome_list.insert(index, to_chromosome(chromosome))
+        self._modified()
 
 
     def pop(self, index = -1):
@@ -241,6 +375,7 @@ class Population:
 
         Raises IndexError if population is empty or index is out of range.
         """
+        self._modified()
         return self.chromosome_list.pop(index)
 
 
@@ -250,6 +385,7 @@ class Population:
         Raises ValueError if the chromosome is not present.
         """
         self.chromosome_list.remove(to_chromosome(chromosome))
+        self._modified()
 
 
     def sort(self, *, key = lambda chromosome: chromosome.fitness, reverse):
@@ -258,6 +394,7 @@ class Population:
             key = key,
             reverse = reverse
         )
+        self._modified()
 
 
     def __repr__(self):
@@ -1 +1,283 @@
- 
+import numpy as np
+
+from EasyGA import GA
+from structure import Chromosome, Bit_Chromosome, Permutation_Chromosome, Array_Chromosome, Population
+from crossover import Crossover
+from examples import Fitness
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_chromosome_key():
+    """Keys should match for equal genes and follow changes to the chromosome."""
+
+    chromosome = Chromosome([1, 2, 3])
+    assert chromosome.key == Chromosome([1, 2, 3]).key
+
+    chromosome[0] = 5
+    assert chromosome.key == (5, 2, 3)
+
+    chromosome.gene_list = chromosome.gene_list[::-1]
+    assert chromosome.key == (3, 2, 5)
+
+    assert Chromosome([[1], [2]]).key == Chromosome([[1], [2]]).key
+
+    # Equal chromosomes of different types have equal keys
+    assert Chromosome([1., 2., 3.]) in Population([Array_Chromosome([1., 2., 3.])])
+    assert Chromosome([1, 0, 1]) in Population([Bit_Chromosome([1, 0, 1])])
+    assert Population([Chromosome([2, 0, 1])]).count(Permutation_Chromosome([2, 0, 1])) == 1
+
+
+def test_population_content_index():
+    """Membership, counts and indexes should use the genes and stay up to date."""
+
+    population = Population([[1, 2], [3, 4], [1, 2], [5, 6]])
+
+    assert [1, 2] in population
+    assert [7, 8] not in population
+    assert population.count([1, 2]) == 2
+    assert population.index([1, 2]) == 0
+    assert population.index([1, 2], guess = 3) == 2
+
+    # Changing a chromosome in place
+    population[3][0] = 7
+    assert [5, 6] not in population
+    assert population.index([7, 6]) == 3
+
+    # Changing the population
+    population.append([8, 8])
+    del population[0]
+    assert population.index([8, 8]) == 3
+    assert population.count([1, 2]) == 1
+
+
+def test_bit_chromosome():
+    """Bit chromosomes should behave like chromosomes of 0/1 genes."""
+
+    chromosome = Bit_Chromosome([1, 0, 1, 1])
+
+    assert len(chromosome) == 4
+    assert chromosome.gene_value_list == [1, 0, 1, 1]
+    assert chromosome == Chromosome([1, 0, 1, 1])
+    assert chromosome.popcount() == 3
+    assert repr(chromosome) == repr(Chromosome([1, 0, 1, 1]))
+
+    chromosome.track_changes()
+    chromosome[1] = 1
+    chromosome.flip(0b1001)
+    assert chromosome.gene_value_list == [0, 1, 1, 0]
+    assert chromosome.changes == {1: 0, 0: 1, 3: 1}
+
+    # Copies keep the packed bits
+    population = Population([chromosome])
+    assert isinstance(population[0], Bit_Chromosome)
+    assert population[0] is not chromosome and population[0] == chromosome
+
+
+def test_bit_chromosomes_one_max():
+    """The ga should solve OneMax using bit chromosomes."""
+
+    ga = GA()
+    ga.chromosome_length = 200
+    ga.population_size = 30
+    ga.generation_goal = 60
+    ga.gene_mutation_rate = 0.01
+    ga.save_data = False
+    ga.fitness_function_impl = Fitness.one_max
+    ga.bit_chromosomes()
+    ga.evolve()
+
+    assert all(isinstance(chromosome, Bit_Chromosome) for chromosome in ga.population)
+    assert ga.population[0].fitness == sum(ga.population[0].gene_value_list)
+    assert ga.population[0].fitness > 75
+
+
+def test_permutation_chromosome():
+    """Permutation chromosomes should keep the positions of the genes consistent."""
+
+    chromosome = Permutation_Chromosome([2, 0, 3, 1, 4])
+
+    assert chromosome == Chromosome([2, 0, 3, 1, 4])
+    assert chromosome.index(3) == 2
+
+    chromosome.track_changes()
+    chromosome.swap(0, 4)
+    chromosome.reverse(1, 4)
+    chromosome.move(0, 2)
+    assert chromosome.gene_value_list == [1, 3, 4, 0, 2]
+    assert all(chromosome.index(value) == i for i, value in enumerate(chromosome.gene_value_list))
+    assert set(chromosome.changes) == {0, 1, 2, 3, 4}
+
+    # Rotated and reversed tours share every edge
+    other = Permutation_Chromosome([0, 4, 3, 1, 2])
+    assert chromosome.hamming_distance(other) == 4
+    assert chromosome.adjacency_distance(other) == 0
+
+    try:
+        Permutation_Chromosome([0, 0, 1])
+        assert False
+    except ValueError:
+        pass
+
+    # Random permutations use the random stream of the ga
+    assert Permutation_Chromosome.random(8, GA(seed = 3).rng) == Permutation_Chromosome.random(8, GA(seed = 3).rng)
+    assert sorted(Permutation_Chromosome.random(8).gene_value_list) == list(range(8))
+
+
+def test_edge_recombination():
+    """Edge recombination should only use edges from the parents when possible."""
+
+    ga = GA()
+    ga.chromosome_length = 30
+    ga.integer_permutation_chromosomes()
+    ga.population = ga.make_population([ga.chromosome_impl() for _ in range(2)])
+    parent_1, parent_2 = ga.population
+
+    Crossover.Individual.Permutation.edge_recombination(ga, parent_1, parent_2)
+    child = ga.population.next_population[-1]
+
+    assert isinstance(child, Permutation_Chromosome)
+    assert sorted(child.gene_value_list) == list(range(30))
+
+
+def test_integer_permutation_chromosomes():
+    """The ga should sort a permutation using integer permutation chromosomes."""
+
+    def sorted_edges(chromosome):
+        values = chromosome.gene_value_list
+        return sum(abs(x - y) == 1 for x, y in zip(values, values[1:]))
+
+    ga = GA()
+    ga.chromosome_length = 20
+    ga.population_size = 30
+    ga.generation_goal = 60
+    ga.save_data = False
+    ga.fitness_function_impl = sorted_edges
+    ga.integer_permutation_chromosomes()
+    ga.evolve()
+
+    assert all(isinstance(chromosome, Permutation_Chromosome) for chromosome in ga.population)
+    assert ga.population[0].fitness > 7
+
+
+def test_double_buffered_population():
+    """Chromosomes which leave a double buffered population should be reused for children."""
+
+    population = Population([[1, 2], [3, 4], [5, 6]])
+    survivor, dead_1, dead_2 = population
+    genes = dead_1.gene_list[0], dead_2.gene_list[0]
+
+    population.next_population = [survivor, Chromosome([0, 0]), Chromosome([0, 0])]
+    population.update(double_buffered = True)
+    assert population.spare_chromosomes == [dead_1, dead_2]
+    assert population.next_population == []
+
+    population.add_child([7, 8])
+    population.add_child(Chromosome([9, 9]))
+    child = population.next_population[0]
+
+    assert child is dead_2 and child.gene_value_list == [7, 8] and child.fitness is None
+    assert child.gene_list[0] in genes and child.gene_list[0] is genes[1]
+    assert population.next_population[1] is not dead_1
+
+    # Chromosomes given to the population are never reused
+    population.update(double_buffered = True)
+    population.spare_chromosomes.clear()
+    population.next_population = [Chromosome([0, 0]), Chromosome([0, 0])]
+    population.update(double_buffered = True)
+    assert len(population.spare_chromosomes) == 1 and population.spare_chromosomes[0] is child
+
+
+def test_double_buffered_ga():
+    """Double buffered runs should evolve like normal runs."""
+
+    ga = GA(seed = 1, double_buffered = True, generation_goal = 20, save_data = False)
+    ga.evolve()
+    double_buffered = [chromosome.gene_value_list for chromosome in ga.population]
+
+    ga = GA(seed = 1, generation_goal = 20, save_data = False)
+    ga.evolve()
+
+    assert double_buffered == [chromosome.gene_value_list for chromosome in ga.population]
+
+
+def test_array_chromosome():
+    """Array chromosome slices should be read-only views, and concatenation a single copy."""
+
+    parent_1 = Array_Chromosome([1.0, 2.0, 3.0, 4.0])
+    parent_2 = Array_Chromosome([5.0, 6.0, 7.0, 8.0])
+
+    view = parent_1[1:3]
+    assert np.shares_memory(view.values, parent_1.values)
+    try:
+        view[0] = 9.0
+    except ValueError:
+        pass
+    else:
+        assert False, "Views should be read-only"
+    assert parent_1.gene_value_list == [1.0, 2.0, 3.0, 4.0]
+
+    # Changes go through the chromosome, keeping its hash up to date
+    population = Population([parent_1])
+    population[0][1] = 9.0
+    parent_1[1] = 9.0
+    assert Array_Chromosome([1.0, 9.0, 3.0, 4.0]) in population
+    assert hash(parent_1) == hash(Array_Chromosome([1.0, 9.0, 3.0, 4.0]))
+
+    copy = view.copy()
+    copy[0] = 0.0
+    assert parent_1[1].value == 9.0
+
+    child = parent_1[:2] + parent_2[2:]
+    assert isinstance(child, Array_Chromosome)
+    assert child.gene_value_list == [1.0, 9.0, 7.0, 8.0]
+    assert not any(np.shares_memory(child.values, parent.values) for parent in (parent_1, parent_2))
+    assert ([Chromosome([0.0])[0]] + parent_2[3:]).gene_value_list == [0.0, 8.0]
+
+    child.track_changes()
+    child[1:3] = reversed(child[1:3])
+    assert child.gene_value_list == [1.0, 7.0, 9.0, 8.0]
+    assert child.changes == {1: 9.0, 2: 7.0}
+    assert child == Chromosome([1.0, 7.0, 9.0, 8.0])
+
+
+def test_array_chromosomes():
+    """The ga should evolve array chromosomes."""
+
+    ga = GA(seed = 3, generation_goal = 20, save_data = False)
+    ga.array_chromosomes()
+    ga.evolve()
+
+    assert all(isinstance(chromosome, Array_Chromosome) for chromosome in ga.population)
+    assert ga.population[0].fitness >= 5
+
+
+def test_copy_on_write_survivors():
+    """Survivors should be shared, and only copied once they are changed."""
+
+    population = Population([[1, 2], [3, 4]])
+    survivor, _ = population
+    survivor.fitness = 5
+
+    population.next_population = [survivor, survivor]
+    population.update()
+    assert population[0] is survivor and survivor.shared
+
+    chromosome = population.writable(0)
+    chromosome[0] = 9
+    assert chromosome is not survivor and chromosome.fitness == 5
+    assert survivor.gene_value_list == [1, 2]
+    assert population.writable(0) is chromosome
+
+
+def test_mutation_keeps_old_chromosomes():
+    """Mutating survivors should never change chromosomes from previous generations."""
+
+    ga = GA(seed = 4, chromosome_mutation_rate = 0.5, gene_mutation_rate = 0.5, save_data = False)
+    ga.evolve(3)
+
+    old_chromosomes = list(ga.population)
+    old_values = [chromosome.gene_value_list for chromosome in old_chromosomes]
+    ga.evolve(5)
+
+    assert [chromosome.gene_value_list for chromosome in old_chromosomes] == old_values
@@ -0,0 +1,253 @@
+from math import ceil
+
+import numpy as np
+
+# Gene vectors of the chromosomes
+from metrics.diversity import gene_matrix
+
+
+class Surrogate_Model:
+    """Cheap model of the fitness function, trained on the gene vectors and
+    fitness of every chromosome evaluated by ga.set_all_fitness. Used by
+    setting
+
+        ga.surrogate = Surrogate.Nearest_Neighbors()
+
+    Before each fitness evaluation, the unevaluated chromosomes are
+    screened: only the evaluation_rate fraction with the best predicted
+    fitness are evaluated, and the rest are given their predicted fitness.
+    The best chromosome is always evaluated for real. The model is
+    retrained every retrain_rate generations, and the accuracy of the
+    predictions for the evaluated chromosomes is recorded in the history.
+
+    Subclasses implement fit(matrix, fitness) and predict(matrix).
+    """
+
+    def __init__(self, evaluation_rate = 0.25, retrain_rate = 1, min_samples = 20, max_samples = 5000):
+        self.evaluation_rate = evaluation_rate
+        self.retrain_rate = retrain_rate
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.reset()
+
+
+    def reset(self):
+        """Clears the training data, model and history."""
+
+        self.samples = []
+        self.fitness = []
+        self.trained = False
+        self.last_trained = None
+        self.saved_evaluations = 0
+        self.history = []
+        self._predictions = {}
+        self._screened = {}
+
+
+    #=======================#
+    # Training the model:   #
+    #=======================#
+
+
+    def record(self, chromosome_list):
+        """Adds the evaluated chromosomes to the training data, comparing
+        their fitness to their prediction if they were screened."""
+
+        if len(chromosome_list) == 0:
+            return
+
+        self.samples.extend(chromosome.gene_value_list for chromosome in chromosome_list)
+        self.fitness.extend(chromosome.fitness for chromosome in chromosome_list)
+
+        # Keep the most recent samples
+        if len(self.samples) > self.max_samples:
+            del self.samples[:-self.max_samples]
+            del self.fitness[:-self.max_samples]
+
+        # Predictions which can now be checked
+        predicted = []
+        actual = []
+        for chromosome in chromosome_list:
+            self._screened.pop(id(chromosome), None)
+            entry = self._predictions.pop(id(chromosome), None)
+            if entry is not None and entry[0] is chromosome:
+                predicted.append(entry[1])
+                actual.append(chromosome.fitness)
+
+        if len(predicted) > 0:
+            self.record_accuracy(np.array(predicted), np.array(actual))
+
+
+    def record_accuracy(self, predicted, actual):
+        """Records the mean absolute error and rank correlation of the predictions."""
+
+        if len(predicted) > 1 and predicted.std() > 0 and actual.std() > 0:
+            rank_correlation = np.corrcoef(predicted.argsort().argsort(), actual.argsort().argsort())[0, 1]
+        else:
+            rank_correlation = None
+
+        self.history.append({
+            'generation'          : self.last_trained,
+            'samples'             : len(predicted),
+            'mean_absolute_error' : float(np.abs(predicted - actual).mean()),
+            'rank_correlation'    : rank_correlation,
+            'saved_evaluations'   : self.saved_evaluations,
+        })
+
+
+    def train(self, ga):
+        """Fits the model to the training data if there is enough of it."""
+
+        if len(self.samples) < self.min_samples:
+            return
+
+        self.fit(np.array(self.samples, dtype = float), np.array(self.fitness, dtype = float))
+        self.trained = True
+        self.last_trained = ga.current_generation
+
+
+    #=======================#
+    # Screening:            #
+    #=======================#
+
+
+    def screen(self, ga):
+        """Predicts the fitness of the unevaluated chromosomes and gives the
+        predicted fitness to all but the most promising ones, which are left
+        to be evaluated by ga.set_all_fitness."""
+
+        if ga.multi_objective:
+            raise ValueError("Surrogate models require a single objective.")
+
+        # Retrain the model if it is due
+        if self.last_trained is None or ga.current_generation - self.last_trained >= self.retrain_rate:
+            self.train(ga)
+
+        pending = [chromosome for chromosome in ga.population if chromosome.fitness is None]
+
+        if not self.trained or len(pending) == 0:
+            return
+
+        try:
+            matrix = gene_matrix(pending).astype(float)
+        except (TypeError, ValueError):
+            raise ValueError("Surrogate models require numeric genes.")
+
+        predicted = self.predict(matrix)
+
+        # Order from most to least promising
+        order = np.argsort(-predicted if ga.target_fitness_type == 'max' else predicted, kind = 'stable')
+        amount = ceil(self.evaluation_rate*len(pending))
+
+        # Remember the predictions of the chromosomes to be evaluated
+        for index in order[:amount].tolist():
+            self._predictions[id(pending[index])] = (pending[index], predicted[index])
+
+        # Use the predictions for the rest
+        for index in order[amount:].tolist():
+            chromosome = pending[index]
+            chromosome.fitness = float(predicted[index])
+            self._screened[id(chromosome)] = chromosome
+            self.saved_evaluations += 1
+
+
+    def is_screened(self, chromosome):
+        """Returns True if the chromosome has a predicted fitness."""
+        return self._screened.get(id(chromosome)) is chromosome
+
+
+    def verify(self, ga):
+        """Evaluates the best chromosome until it isn't screened,
+        so that the best fitness found is always real. The
+        population must be sorted."""
+
+        # Forget chromosomes which are gone or were re-evaluated
+        population_ids = {id(chromosome) for chromosome in ga.population}
+        self._screened = {
+            key : chromosome
+            for key, chromosome
+            in self._screened.items()
+            if key in population_ids
+        }
+        self._predictions = {
+            key : entry
+            for key, entry
+            in self._predictions.items()
+            if key in population_ids
+        }
+
+        while len(ga.population) > 0 and self.is_screened(ga.population[0]):
+            chromosome = self._screened.pop(id(ga.population[0]))
+            chromosome.fitness = None
+            self.saved_evaluations -= 1
+            ga.set_all_fitness([chromosome])
+            ga.sort_by_best_fitness()
+
+
+    #=======================#
+    # Model:                #
+    #=======================#
+
+
+    def fit(self, matrix, fitness):
+        """Fits the model to the gene matrix and fitness values."""
+        raise NotImplementedError
+
+
+    def predict(self, matrix):
+        """Returns the predicted fitness of each row of the gene matrix."""
+        raise NotImplementedError
+
+
+class Nearest_Neighbors(Surrogate_Model):
+    """Predicts the distance weighted average fitness of the k nearest
+    training samples, using the euclidean distance between gene vectors."""
+
+    def __init__(self, k = 5, **kwargs):
+        self.k = k
+        super().__init__(**kwargs)
+
+
+    def fit(self, matrix, fitness):
+        self.matrix = matrix
+        self.matrix_norms = (matrix * matrix).sum(axis = 1)
+        self.values = fitness
+
+
+    def predict(self, matrix):
+
+        # Squared distances using |a-b|^2 = |a|^2 - 2a.b + |b|^2
+        distances = (matrix * matrix).sum(axis = 1)[:, None] - 2 * matrix @ self.matrix.T + self.matrix_norms[None, :]
+        distances = np.sqrt(np.maximum(distances, 0))
+
+        k = min(self.k, distances.shape[1])
+        nearest = np.argpartition(distances, k-1, axis = 1)[:, :k]
+        weights = 1 / (np.take_along_axis(distances, nearest, axis = 1) + 1e-12)
+
+        return (weights * self.values[nearest]).sum(axis = 1) / weights.sum(axis = 1)
+
+
+class Ridge_Regression(Surrogate_Model):
+    """Predicts the fitness using a linear model of the standardized genes,
+    fitted by least squares with an L2 penalty of alpha on the weights."""
+
+    def __init__(self, alpha = 1.0, **kwargs):
+        self.alpha = alpha
+        super().__init__(**kwargs)
+
+
+    def fit(self, matrix, fitness):
+
+        self.mean = matrix.mean(axis = 0)
+        self.scale = np.where(matrix.std(axis = 0) > 0, matrix.std(axis = 0), 1)
+        self.intercept = fitness.mean()
+
+        x = (matrix - self.mean) / self.scale
+        self.weights = np.linalg.solve(
+            x.T @ x + self.alpha * np.eye(x.shape[1]),
+            x.T @ (fitness - self.intercept)
+        )
+
+
+    def predict(self, matrix):
+        return self.intercept + ((matrix - self.mean) / self.scale) @ self.weights
@@ -0,0 +1,41 @@
+import random
+
+import numpy as np
+
+from EasyGA import GA, Surrogate
+from examples import Fitness
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_models_fit():
+    """Both models should fit a smooth function closely."""
+
+    rng = np.random.default_rng(0)
+    matrix = rng.uniform(-1, 1, (400, 3))
+    fitness = matrix @ np.array([1.0, -2.0, 0.5]) + 3
+
+    for model in (Surrogate.Nearest_Neighbors(), Surrogate.Ridge_Regression(alpha = 1e-6)):
+        model.fit(matrix, fitness)
+        test = rng.uniform(-0.9, 0.9, (50, 3))
+        error = np.abs(model.predict(test) - (test @ np.array([1.0, -2.0, 0.5]) + 3))
+        assert error.mean() < 0.25
+
+
+def test_surrogate_screening():
+    """The surrogate should skip evaluations while keeping the best fitness real."""
+
+    ga = GA()
+    ga.population_size = 40
+    ga.generation_goal = 30
+    ga.save_data = False
+    ga.gene_impl = lambda: random.uniform(-10, 10)
+    ga.fitness_function_impl = Fitness.near_5
+    ga.target_fitness_type = 'min'
+    ga.surrogate = Surrogate.Nearest_Neighbors(evaluation_rate = 0.5)
+    ga.evolve()
+
+    assert ga.surrogate.saved_evaluations > 0
+    assert len(ga.surrogate.history) > 0
+    assert not ga.surrogate.is_screened(ga.population[0])
+    assert ga.population[0].fitness == ga.fitness_function_impl(ga.population[0])
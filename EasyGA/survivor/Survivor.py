@@ -1,7 +1,10 @@
-import random
-
 # Import all survivor decorators 
 from decorators import *
+from decorators import _is_improvement
+
+# Spatial index used for crowding
+from metrics.neighbors import KD_Tree
+from niching.Niching import gene_points
 
 
 def fill_in_best(ga):
@@ -11,38 +14,68 @@ def fill_in_best(ga):
     ga.population.append_children(ga.population[:needed_amount])
 
 
+def fill_in_best_of_all(ga):
+    """Fills in the next population with the best chromosomes out of the children and the
+    last population. Used by NSGA-II with multiple objectives, where the best chromosomes
+    are those in the first non-dominated fronts, and then the least crowded."""
+
+    # The children need fitness values to be compared
+    ga.set_all_fitness(ga.population.next_population)
+
+    candidates = ga.population.next_population + ga.population.chromosome_list
+    ga.population.next_population = ga.sort_by_best_fitness(candidates, in_place = False)[:len(ga.population)]
+
+
+def deterministic_crowding(ga):
+    """Each child competes with the most similar chromosome of the last population,
+    replacing it if the child is better, which keeps chromosomes in separate niches.
+    The most similar chromosome is found using a k-d tree over the genes, standing in
+    for the most similar parent, since children don't keep track of their parents."""
+
+    # The children need fitness values to be compared
+    ga.set_all_fitness(ga.population.next_population)
+
+    survivors = list(ga.population.chromosome_list)
+    _, nearest = KD_Tree(gene_points(survivors)).query(gene_points(ga.population.next_population), k = 1)
+
+    for child, index in zip(ga.population.next_population, nearest[:, 0].tolist()):
+        if _is_improvement(ga, child.fitness, survivors[index].fitness):
+            survivors[index] = child
+
+    ga.population.next_population = survivors
+
+
 def fill_in_random(ga):
     """Fills in the next population with random chromosomes from the last population"""
 
     needed_amount = len(ga.population) - len(ga.population.next_population)
-    ga.population.append_children(random.sample(ga.population, needed_amount))
+    ga.population.append_children(ga.rng.sample(ga.population, needed_amount))
 
 
 def fill_in_parents_then_random(ga):
     """Fills in the next population with all parents followed by random chromosomes from the last population"""
 
-    # Remove dupes from the mating pool
-    mating_pool = set(ga.population.mating_pool)
+    # Remove dupes from the mating pool, keeping their order
+    mating_pool = list(dict.fromkeys(ga.population.mating_pool))
 
     needed_amount = len(ga.population) - len(ga.population.next_population)
     parent_amount = min(needed_amount, len(mating_pool))
     random_amount = needed_amount - parent_amount
 
-    # Only parents are used.
-    if random_amount == 0:
-        ga.population.append_children(
-            chromosome
-            for i, chromosome
-            in enumerate(mating_pool)
-            if i < parent_amount
-        )
+    ga.population.append_children(mating_pool[:parent_amount])
 
     # Parents need to be removed from the random sample to avoid dupes.
-    else:
-        ga.population.append_children(mating_pool)
-        ga.population.append_children(
-               random.sample(
-                  set(ga.population) - mating_pool,
-                  random_amount
-              )
-        )
+    if random_amount > 0:
+        parents = set(mating_pool)
+        candidates = [
+            chromosome
+            for chromosome
+            in dict.fromkeys(ga.population)
+            if chromosome not in parents
+        ]
+        sample_amount = min(random_amount, len(candidates))
+        ga.population.append_children(ga.rng.sample(candidates, sample_amount))
+
+        # A converged population may not have enough unique chromosomes
+        if random_amount > sample_amount:
+            ga.population.append_children(ga.rng.choices(ga.population, k = random_amount - sample_amount))
@@ -0,0 +1,62 @@
+from EasyGA import GA, Survivor
+from structure import Chromosome, Bit_Chromosome
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_chromosome_hash():
+    """Equal chromosomes should have equal hashes, updated when they change."""
+
+    chromosome = Chromosome([1, 0, 1])
+    assert len({chromosome, Chromosome([1, 0, 1]), Bit_Chromosome([1, 0, 1])}) == 1
+
+    old_hash = hash(chromosome)
+    chromosome[0] = 0
+    assert hash(chromosome) != old_hash
+    assert hash(chromosome) == hash(Chromosome([0, 0, 1]))
+
+
+def test_fill_in_parents_then_random():
+    """The next population should have every unique parent
+    followed by random chromosomes which aren't parents."""
+
+    ga = GA(seed = 5, population_size = 50, save_data = False)
+    ga.gene_impl = lambda: ga.rng.randint(1, 1000)
+    ga.initialize_population()
+    ga.population.mating_pool = [ga.population[0], ga.population[1], ga.population[0]]
+
+    Survivor.fill_in_parents_then_random(ga)
+    next_population = ga.population.next_population
+
+    assert len(next_population) == 50
+    assert next_population[:2] == [ga.population[0], ga.population[1]]
+    assert len(set(next_population)) == 50
+
+
+def test_fill_in_parents_then_random_evolve():
+    """The survivor method should work in a full run."""
+
+    ga = GA(seed = 5, generation_goal = 10, save_data = False)
+    ga.gene_impl = lambda: ga.rng.random()
+    ga.survivor_selection_impl = Survivor.fill_in_parents_then_random
+    ga.evolve()
+
+    assert len(ga.population) == ga.population_size
+
+
+def test_fill_in_parents_then_random_converged():
+    """Duplicates should fill in the next population when there aren't enough unique chromosomes."""
+
+    ga = GA(seed = 5, population_size = 10, chromosome_length = 3, save_data = False)
+    ga.gene_impl = lambda: 0
+    ga.initialize_population()
+    ga.population.mating_pool = [ga.population[0]]
+
+    Survivor.fill_in_parents_then_random(ga)
+    assert len(ga.population.next_population) == 10
+
+    ga = GA(seed = 5, population_size = 10, chromosome_length = 3, generation_goal = 20, save_data = False)
+    ga.gene_impl = lambda: ga.rng.randint(0, 1)
+    ga.survivor_selection_impl = Survivor.fill_in_parents_then_random
+    ga.evolve()
+    assert len(ga.population) == 10
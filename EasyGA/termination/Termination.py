@@ -1,14 +1,23 @@
 # Import all termination decorators 
-from decorators import _add_by_fitness_goal, _add_by_generation_goal, _add_by_tolerance_goal
+from decorators import _add_by_fitness_goal, _add_by_generation_goal, _add_by_tolerance_goal, _add_by_diversity_goal
+from decorators import _add_by_time_goal, _add_by_evaluation_goal, _add_by_stagnation_goal
 
 @_add_by_fitness_goal
 @_add_by_generation_goal
 @_add_by_tolerance_goal
+@_add_by_diversity_goal
+@_add_by_time_goal
+@_add_by_evaluation_goal
+@_add_by_stagnation_goal
 def fitness_generation_tolerance(ga):
     """Terminate GA when any of the
     - fitness,
-    - generation, or
-    - tolerance
+    - generation,
+    - tolerance,
+    - diversity,
+    - time,
+    - evaluation, or
+    - stagnation
     goals are met."""
 
     return True
@@ -0,0 +1,66 @@
+from EasyGA import GA
+
+# USE THIS COMMAND WHEN TESTING -
+    # python3 -m pytest
+
+def test_tolerance_goal():
+    """The ga should stop once the population converges to the tolerance."""
+
+    ga = GA()
+    ga.generation_goal = 1000
+    ga.tolerance_goal = 0.01
+    ga.evolve()
+
+    assert ga.current_generation < 1000
+    assert abs(ga.statistics.best_fitness - ga.statistics.threshold_fitness) <= 0.01 * (1 + abs(ga.statistics.best_fitness))
+
+
+def test_diversity_goal():
+    """The ga should stop once the population diversity falls to the goal."""
+
+    ga = GA()
+    ga.generation_goal = 1000
+    ga.diversity_metric = 'hamming'
+    ga.diversity_goal = 2
+    ga.evolve()
+
+    assert ga.current_generation < 1000
+    assert ga.statistics.pairwise_distance <= 2
+
+
+def test_evaluation_goal():
+    """The ga should stop once the fitness evaluation budget is used up."""
+
+    ga = GA()
+    ga.generation_goal = 1000
+    ga.evaluation_goal = 50
+    ga.evolve()
+
+    assert ga.current_generation < 1000
+    assert 50 <= ga.evaluation_count < 50 + 2*len(ga.population)
+
+
+def test_time_goal():
+    """The ga should stop once the time goal has passed."""
+
+    ga = GA()
+    ga.generation_goal = None
+    ga.time_goal = 0.5
+    ga.evolve()
+
+    assert ga.current_generation > 0
+
+
+def test_stagnation_goal():
+    """The ga should stop once the best fitness stops improving."""
+
+    ga = GA()
+    ga.generation_goal = 1000
+    ga.stagnation_goal = 5
+
+    # The best fitness can never improve
+    ga.fitness_function_impl = lambda ga, chromosome: 0
+    ga.evolve()
+
+    assert ga.current_generation == 6
+    assert ga.statistics.stagnant_generations == 5
@@ -1,4 +1,8 @@
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from EasyGA import GA, Parent, Crossover, Mutation, Survivor, Termination
 
 # USE THIS COMMAND WHEN TESTING -
@@ -215,3 +219,92 @@ def test_termination_impl():
     ga.evolve()
 
     assert (ga.termination_impl == Termination.fitness_and_generation_based) and (ga != None)
+
+
+def test_failed_evaluations():
+    """Failed evaluations should be retried and then penalized, without stopping the run."""
+
+    attempts = {}
+
+    def fitness_function(chromosome):
+        attempts[chromosome[0].value] = attempts.get(chromosome[0].value, 0) + 1
+        if chromosome[0].value < 0:
+            raise ValueError("Negative gene")
+        return chromosome[0].value
+
+    ga = GA(chromosome_length = 1, population_size = 10, save_data = False)
+    ga.fitness_function_impl = fitness_function
+    ga.evaluation_retries = 2
+    ga.penalty_fitness = -100
+    ga.initialize_population()
+    for i, chromosome in enumerate(ga.population):
+        chromosome[0] = ga.make_gene(i - 2)
+
+    ga.set_all_fitness()
+
+    assert [chromosome.fitness for chromosome in ga.population] == [-100, -100] + list(range(8))
+    assert attempts[-1] == 3 and attempts[5] == 1
+    assert ga.statistics.failed_evaluations == 6
+    assert ga.statistics.retried_evaluations == 4
+
+
+def test_evaluation_timeout():
+    """Evaluations running past the timeout should be given the penalty fitness."""
+
+    def fitness_function(chromosome):
+        if chromosome[0].value == 0:
+            time.sleep(1)
+        return 1
+
+    ga = GA(chromosome_length = 1, population_size = 6, save_data = False)
+    ga.fitness_function_impl = fitness_function
+    ga.evaluation_timeout = 0.2
+    ga.penalty_fitness = 0
+    ga.initialize_population()
+    for i, chromosome in enumerate(ga.population):
+        chromosome[0] = ga.make_gene(i)
+
+    with ThreadPoolExecutor(max_workers = 2) as executor:
+        ga.executor = executor
+        start = time.perf_counter()
+        ga.set_all_fitness()
+        assert time.perf_counter() - start < 0.9
+
+    assert [chromosome.fitness for chromosome in ga.population] == [0, 1, 1, 1, 1, 1]
+    assert ga.statistics.timed_out_evaluations == 1
+    assert ga.statistics.snapshot()['failed_evaluations'] == 1
+
+
+def test_evaluation_never_returns():
+    """Fitness functions which never return shouldn't stall the run,
+    even once they occupy every worker of the executor."""
+
+    release = threading.Event()
+
+    def fitness_function(chromosome):
+        if chromosome[0].value == 0:
+            release.wait()
+        return 1
+
+    ga = GA(chromosome_length = 1, population_size = 4, save_data = False)
+    ga.fitness_function_impl = fitness_function
+    ga.evaluation_timeout = 0.2
+    ga.evaluation_retries = 2
+    ga.penalty_fitness = 0
+    ga.initialize_population()
+    for i, chromosome in enumerate(ga.population):
+        chromosome[0] = ga.make_gene(i)
+
+    executor = ThreadPoolExecutor(max_workers = 2)
+    ga.executor = executor
+
+    try:
+        start = time.perf_counter()
+        ga.set_all_fitness()
+        assert time.perf_counter() - start < 2
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert [chromosome.fitness for chromosome in ga.population] == [0, 1, 1, 1]
+    assert ga.statistics.timed_out_evaluations == 3
@@ -27,6 +27,7 @@ setup(
         "Operating System :: OS Independent",
         ],
     install_requires = ["matplotlib ~= 3.3.2",
+                        "numpy >= 1.17",
                         "pyserial ~= 3.4",
                         "pytest>=3.7",
                         "tabulate >=0.8.7"